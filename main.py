@@ -1,42 +1,65 @@
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, JSONResponse
 import os
-import importlib
 import socket
 import time
 from datetime import datetime
-from utils import LOGGER
+from contextlib import asynccontextmanager
+from utils import LOGGER, HTTP_CLIENTS, BLOCKING_EXECUTOR, CPU_EXECUTOR, RESPONSE_CACHE, METRICS, LOOP_WATCHDOG, SHARED_STATE, UPSTREAM_PROBER, BACKGROUND_SERVICES
+from utils.metrics import MetricsMiddleware, metric_lines
+from utils.watchdog import WatchdogMiddleware
+from utils.pages import StaticPage
+from utils.loader import PluginLoader
+
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+WATCHDOG = os.getenv("WATCHDOG", "false").lower() == "true"
+WORKERS = int(os.getenv("WORKERS", 1))
+WORKER_STARTUP_TIMEOUT = int(os.getenv("WORKER_STARTUP_TIMEOUT", 60))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await HTTP_CLIENTS.start()
+    METRICS.start()
+    if WATCHDOG:
+        LOOP_WATCHDOG.start()
+    UPSTREAM_PROBER.start()
+    BACKGROUND_SERVICES.start()
+    app.state.started = True
+    try:
+        yield
+    finally:
+        app.state.started = False
+        await BACKGROUND_SERVICES.stop()
+        await UPSTREAM_PROBER.stop()
+        await LOOP_WATCHDOG.stop()
+        await METRICS.stop()
+        await HTTP_CLIENTS.close()
+        await RESPONSE_CACHE.close()
+        await SHARED_STATE.close()
+        BLOCKING_EXECUTOR.shutdown()
+        CPU_EXECUTOR.shutdown()
 
 app = FastAPI(
     title="A360",
-    description="A Project Made To Centralize Various APIs 📖 No Authorization Needed, All Endpoints Included :"
+    description="A Project Made To Centralize Various APIs 📖 No Authorization Needed, All Endpoints Included :",
+    lifespan=lifespan
 )
 
 start_time = time.time()
+LAZY_PLUGINS = os.getenv("LAZY_PLUGINS", "true" if os.getenv("VERCEL") else "false").lower() == "true"
+plugin_loader = PluginLoader(app)
+app.add_middleware(MetricsMiddleware)
+if WATCHDOG:
+    app.add_middleware(WatchdogMiddleware)
+HTTP_CLIENTS.add_trace_config(METRICS.trace_config())
 
-def load_index_html():
-    try:
-        with open("templates/index.html", "r") as file:
-            return file.read()
-    except FileNotFoundError:
-        LOGGER.error("index.html not found in templates directory")
-        return "<h1>Welcome to AbirAPI</h1><p>Index page not found.</p>"
-
-def load_report_html():
-    try:
-        with open("templates/report.html", "r") as file:
-            return file.read()
-    except FileNotFoundError:
-        LOGGER.error("report.html not found in templates directory")
-        return "<h1>API Report</h1><p>Report page not found.</p>"
-
-def load_health_html():
-    try:
-        with open("templates/health.html", "r") as file:
-            return file.read()
-    except FileNotFoundError:
-        LOGGER.error("health.html not found in templates directory")
-        return "<h1>API Health</h1><p>Health page not found.</p>"
+PAGES = {
+    "index": StaticPage("templates/index.html", "<h1>Welcome to AbirAPI</h1><p>Index page not found.</p>"),
+    "report": StaticPage("templates/report.html", "<h1>API Report</h1><p>Report page not found.</p>"),
+    "health": StaticPage("templates/health.html", "<h1>API Health</h1><p>Health page not found.</p>")
+}
+for page in PAGES.values():
+    page.refresh()
 
 def get_actual_ip():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -66,60 +89,178 @@ def count_plugins():
     return len([f for f in os.listdir(plugins_dir) if f.endswith(".py") and f != "__init__.py"])
 
 def count_endpoints():
-    return len([route for route in app.routes if route.path != "/"])
-
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    return load_index_html()
+    return len([route for route in app.routes if route.path != "/"]) + plugin_loader.pending_route_count()
 
-@app.get("/report", response_class=HTMLResponse)
-async def report():
-    return load_report_html()
-
-@app.get("/health", response_class=HTMLResponse)
-async def health():
-    return load_health_html()
+HEALTH_SNAPSHOT = {}
 
-@app.get("/api/health")
-async def health_api():
-    return {
+def refresh_health_snapshot():
+    HEALTH_SNAPSHOT.clear()
+    HEALTH_SNAPSHOT.update({
         "Api Owner": "@ISmartCoder",
         "Api Developer": "@ISmartCoder",
         "Api Updates": "@TheSmartDev",
         "Api About": "An Asynchronous Multifunctional API Built With Pyrofork Telethon & FastAPI Framework & Python Lang By @ISmartCoder",
         "Api Version": "1.16.1",
-        "Api Health": "Operational",
-        "Api Uptime": get_uptime(),
+        "Api Health": UPSTREAM_PROBER.overall(),
+        "Api Uptime": None,
         "Total Endpoints": count_endpoints(),
         "Total Plugins": count_plugins(),
+        "Upstreams": {name: result["state"] for name, result in UPSTREAM_PROBER.results.items()},
         "Last Checked": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    })
+
+UPSTREAM_PROBER.add_listener(refresh_health_snapshot)
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    return PAGES["index"].response(request)
+
+@app.get("/report", response_class=HTMLResponse)
+async def report(request: Request):
+    return PAGES["report"].response(request)
+
+@app.get("/health", response_class=HTMLResponse)
+async def health(request: Request):
+    return PAGES["health"].response(request)
+
+@app.get("/api/health")
+async def health_api():
+    snapshot = dict(HEALTH_SNAPSHOT)
+    snapshot["Api Uptime"] = get_uptime()
+    return snapshot
+
+@app.get("/api/health/live")
+async def health_live():
+    return {"status": "ok", "uptime_seconds": round(time.time() - start_time, 1)}
+
+@app.get("/api/health/ready")
+async def health_ready(strict: bool = False):
+    probed = UPSTREAM_PROBER.rounds > 0 or UPSTREAM_PROBER.interval <= 0
+    down = [
+        name for name, result in UPSTREAM_PROBER.results.items()
+        if result["state"] == "down" and (strict or result["critical"])
+    ]
+    ready = getattr(app.state, "started", False) and probed and not down
+    return JSONResponse(status_code=200 if ready else 503, content={
+        "ready": ready,
+        "started": getattr(app.state, "started", False),
+        "probed": probed,
+        "plugins_loaded": len(plugin_loader.loaded),
+        "plugins_failed": len(plugin_loader.failed),
+        "lazy_plugins": plugin_loader.lazy,
+        "down": down,
+        "health": UPSTREAM_PROBER.snapshot()
+    })
+
+@app.get("/api/health/upstreams")
+async def health_upstreams():
+    return UPSTREAM_PROBER.snapshot()
+
+@app.get("/api/health/plugins")
+async def health_plugins():
+    return plugin_loader.report()
+
+@app.get("/api/health/executor")
+async def health_executor():
+    snapshot = BLOCKING_EXECUTOR.snapshot()
+    snapshot["cpu"] = CPU_EXECUTOR.snapshot()
+    return snapshot
+
+@app.get("/api/health/cache")
+async def health_cache():
+    return RESPONSE_CACHE.stats()
+
+@app.get("/api/health/pages")
+async def health_pages():
+    return {name: page.stats() for name, page in PAGES.items()}
+
+@app.get("/api/health/state")
+async def health_state():
+    return {
+        "worker_pid": os.getpid(),
+        "workers": WORKERS,
+        "state": SHARED_STATE.stats(),
+        "cache": RESPONSE_CACHE.remote.stats() if RESPONSE_CACHE.remote is not None else None
     }
 
+@app.get("/api/health/stalls")
+async def health_stalls():
+    return LOOP_WATCHDOG.snapshot()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+def collect_cache_metrics():
+    stats = RESPONSE_CACHE.stats()
+    memory = stats["memory"]
+    singleflight = stats["singleflight"]
+    lines = []
+    lines += metric_lines("a360_cache_requests_total", "Response cache lookups by result", "counter", [
+        ({"result": "hit"}, memory["hits"]),
+        ({"result": "miss"}, memory["misses"])
+    ])
+    lines += metric_lines("a360_cache_hit_ratio", "Response cache hit ratio since start", "gauge", [({}, memory["hit_ratio"])])
+    lines += metric_lines("a360_cache_entries", "Entries held in the in-memory response cache", "gauge", [({}, memory["entries"])])
+    lines += metric_lines("a360_cache_bytes", "Bytes held in the in-memory response cache", "gauge", [({}, memory["bytes"])])
+    lines += metric_lines("a360_cache_evictions_total", "Response cache evictions and expirations", "counter", [
+        ({"reason": "size"}, memory["evictions"]),
+        ({"reason": "ttl"}, memory["expirations"])
+    ])
+    lines += metric_lines("a360_singleflight_requests_total", "Single-flight calls by role", "counter", [
+        ({"role": "leader"}, singleflight["leaders"]),
+        ({"role": "joined"}, singleflight["joined"])
+    ])
+    return lines
+
+def collect_executor_metrics():
+    snapshot = BLOCKING_EXECUTOR.snapshot()
+    plugins = snapshot["plugins"].items()
+    lines = []
+    lines += metric_lines("a360_executor_queued", "Blocking calls waiting for a worker slot", "gauge", [({"plugin": name}, stats["queued"]) for name, stats in plugins])
+    lines += metric_lines("a360_executor_running", "Blocking calls currently running", "gauge", [({"plugin": name}, stats["running"]) for name, stats in plugins])
+    lines += metric_lines("a360_executor_calls_total", "Blocking calls finished by outcome", "counter",
+        [({"plugin": name, "outcome": "completed"}, stats["completed"]) for name, stats in plugins] +
+        [({"plugin": name, "outcome": "failed"}, stats["failed"]) for name, stats in plugins])
+    cpu_plugins = CPU_EXECUTOR.snapshot()["plugins"].items()
+    lines += metric_lines("a360_cpu_executor_queued", "CPU pool calls waiting for a worker slot", "gauge", [({"plugin": name}, stats["queued"]) for name, stats in cpu_plugins])
+    lines += metric_lines("a360_cpu_executor_running", "CPU pool calls currently running", "gauge", [({"plugin": name}, stats["running"]) for name, stats in cpu_plugins])
+    return lines
+
+def collect_watchdog_metrics():
+    return metric_lines("a360_event_loop_stalls_total", "Event loop stalls caught by the watchdog", "counter", [({}, LOOP_WATCHDOG.total_stalls)])
+
+METRICS.add_collector(collect_cache_metrics)
+METRICS.add_collector(collect_executor_metrics)
+METRICS.add_collector(collect_watchdog_metrics)
+
 def load_plugins():
-    plugins_dir = "plugins"
-    for filename in os.listdir(plugins_dir):
-        if filename.endswith(".py") and filename != "__init__.py":
-            module_name = filename[:-3]
-            try:
-                module = importlib.import_module(f"plugins.{module_name}")
-                if hasattr(module, "router"):
-                    app.include_router(module.router)
-                    LOGGER.info(f"Successfully loaded plugin: {module_name}")
-                else:
-                    LOGGER.warning(f"Plugin {module_name} does not have a router")
-            except Exception as e:
-                LOGGER.error(f"Failed to load plugin {module_name}: {str(e)}")
-
-load_plugins()
+    plugin_loader.discover()
+    if LAZY_PLUGINS:
+        plugin_loader.enable_lazy()
+    else:
+        plugin_loader.load_all()
+    refresh_health_snapshot()
+
+if __name__ not in ("__main__", "__mp_main__"):
+    load_plugins()
 
 if __name__ == "__main__":
     import uvicorn
     host = "0.0.0.0"
     port = int(os.getenv("PORT", 4434))
+    if WORKERS > 1:
+        os.environ.setdefault("STATE_BACKEND", "sqlite")
+        os.environ.setdefault("CACHE_BACKEND", "shared")
+        if RELOAD:
+            LOGGER.warning("RELOAD is enabled, uvicorn will ignore WORKERS and run a single process")
+        LOGGER.info(f"Starting {WORKERS} workers with {os.environ['STATE_BACKEND']} shared state")
     LOGGER.info(f"API Running At {get_server_address()}")
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=os.getenv("RELOAD", "false").lower() == "true"
+        reload=RELOAD,
+        workers=WORKERS,
+        timeout_worker_healthcheck=WORKER_STARTUP_TIMEOUT
     )
\ No newline at end of file
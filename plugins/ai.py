@@ -6,7 +6,9 @@ import re
 import uuid
 import time
 import json
+import asyncio
 from datetime import datetime
+from utils import run_blocking
 
 router = APIRouter(prefix="/ai")
 
@@ -322,7 +324,7 @@ async def gem(prompt: str = ""):
         })
     
     start_time = time.time()
-    data = scrape_fresh_session_gemini()
+    data = await run_blocking("ai", scrape_fresh_session_gemini)
     
     if not data:
         return JSONResponse(status_code=500, content={
@@ -344,7 +346,7 @@ async def gem(prompt: str = ""):
     }
     
     try:
-        resp = data["session"].post(url, data=payload, headers=headers, timeout=60)
+        resp = await run_blocking("ai", data["session"].post, url, data=payload, headers=headers, timeout=60)
         if resp.status_code != 200:
             return JSONResponse(status_code=500, content={
                 "success": False,
@@ -393,7 +395,7 @@ async def pplxty(prompt: str = "", mode: str = "concise", model: str = "turbo",
             "api_channel": "@abirxdhackz"
         })
     
-    data = scrape_fresh_session_pplxty()
+    data = await run_blocking("ai", scrape_fresh_session_pplxty)
     if not data:
         return JSONResponse(status_code=500, content={
             "status": "error",
@@ -480,8 +482,8 @@ async def pplxty(prompt: str = "", mode: str = "concise", model: str = "turbo",
         headers["x-csrf-token"] = data["csrf_token"]
     
     try:
-        time.sleep(0.5)
-        resp = data["session"].post(data["api_url"], json=payload, headers=headers, cookies=all_cookies, timeout=120)
+        await asyncio.sleep(0.5)
+        resp = await run_blocking("ai", data["session"].post, data["api_url"], json=payload, headers=headers, cookies=all_cookies, timeout=120)
         
         if resp.status_code != 200:
             return JSONResponse(status_code=500, content={
@@ -1,50 +1,368 @@
 #Copyright @ISmartCoder
 #Updates Channel @TheSmartDev 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-import aiohttp
-from utils import LOGGER
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from typing import List
+import asyncio
+import json
+import os
+import time
+from array import array
+from itertools import islice
+from utils import LOGGER, SINGLE_FLIGHT, BACKGROUND_SERVICES, get_session
 
 router = APIRouter(prefix="/binance")
 BASE_URL_ALL = "https://api.binance.com/api/v3/ticker/24hr"
-BASE_URL_SYMBOL = "https://api.binance.com/api/v3/ticker/24hr?symbol={token}USDT"
-BASE_URL_PRICE = "https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
+EXCHANGE_INFO_URL = "https://api.binance.com/api/v3/exchangeInfo"
+SNAPSHOT_INTERVAL = float(os.getenv("BINANCE_SNAPSHOT_INTERVAL", 5))
+EXCHANGE_INFO_INTERVAL = float(os.getenv("BINANCE_EXCHANGE_INFO_INTERVAL", 3600))
+SNAPSHOT_MAX_AGE = float(os.getenv("BINANCE_SNAPSHOT_MAX_AGE", 30))
+QUOTE_ASSETS = sorted([
+    "USDT", "FDUSD", "USDC", "TUSD", "BUSD", "DAI", "BTC", "ETH", "BNB", "XRP", "TRX", "DOGE",
+    "EUR", "TRY", "BRL", "ARS", "JPY", "MXN", "PLN", "RON", "UAH", "ZAR", "COP", "IDR", "CZK"
+], key=len, reverse=True)
+CONVERSION_HUBS = ("USDT", "BTC", "BNB")
+MAX_BATCH_SYMBOLS = 500
+COMPACT_FIELDS = ["token", "symbol", "price", "price_change_percent", "quote_volume"]
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
 async def fetch_crypto_data():
     try:
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.get(BASE_URL_ALL, timeout=10) as response:
-                response.raise_for_status()
-                LOGGER.info("Successfully fetched crypto data from Binance API")
-                return await response.json()
+        session = get_session("binance")
+        async with session.get(BASE_URL_ALL, headers=HEADERS) as response:
+            response.raise_for_status()
+            LOGGER.info("Successfully fetched crypto data from Binance API")
+            return await response.json()
     except Exception as e:
         LOGGER.error(f"Failed to fetch crypto data: {str(e)}")
         raise
 
-def get_top_gainers(data, top_n=100):
-    return sorted(data, key=lambda x: float(x['priceChangePercent']), reverse=True)[:top_n]
+async def fetch_exchange_info():
+    try:
+        session = get_session("binance")
+        async with session.get(EXCHANGE_INFO_URL, headers=HEADERS) as response:
+            response.raise_for_status()
+            LOGGER.info("Successfully fetched exchange info from Binance API")
+            return await response.json()
+    except Exception as e:
+        LOGGER.error(f"Failed to fetch exchange info: {str(e)}")
+        raise
+
+class PriceBatchRequest(BaseModel):
+    tokens: List[str]
+    quote: str = "USDT"
+    compact: bool = False
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def split_symbol(symbol):
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    return symbol, ""
+
+def trading_pairs(exchange_info):
+    return {
+        item["symbol"]: (item["baseAsset"], item["quoteAsset"])
+        for item in exchange_info.get("symbols", [])
+        if item.get("status") == "TRADING"
+    }
+
+def guessed_pairs(symbols):
+    pairs = {}
+    for symbol in symbols:
+        base, quote = split_symbol(symbol)
+        if quote:
+            pairs[symbol] = (base, quote)
+    return pairs
+
+def build_graph(pairs, prices):
+    graph = {}
+    for symbol, (base, quote) in pairs.items():
+        if symbol in prices:
+            graph.setdefault(base, {})[quote] = (symbol, False)
+            graph.setdefault(quote, {})[base] = (symbol, True)
+    return graph
+
+class MarketSnapshot:
+    def __init__(self, interval=SNAPSHOT_INTERVAL, max_age=SNAPSHOT_MAX_AGE):
+        self.interval = interval
+        self.max_age = max_age
+        self.tickers = []
+        self.by_symbol = {}
+        self.index = {}
+        self.prices = {}
+        self.data_json = "[]"
+        self.change_pct = array("d")
+        self.quote_volume = array("d")
+        self.rankings = {"": []}
+        self.pairs = {}
+        self.pairs_updated = None
+        self.graph = {}
+        self.routes = {}
+        self.route_hits = 0
+        self.route_misses = 0
+        self.updated = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error = None
+        self._task = None
+
+    def store(self, tickers):
+        prices = {}
+        change_pct = array("d")
+        quote_volume = array("d")
+        quotes = []
+        for ticker in tickers:
+            price = to_float(ticker.get("lastPrice"))
+            if price > 0:
+                prices[ticker["symbol"]] = price
+            change_pct.append(to_float(ticker.get("priceChangePercent")))
+            quote_volume.append(to_float(ticker.get("quoteVolume")))
+            pair = self.pairs.get(ticker["symbol"])
+            quotes.append(pair[1] if pair else split_symbol(ticker["symbol"])[1])
+        ranking = sorted(range(len(tickers)), key=change_pct.__getitem__)
+        rankings = {"": ranking}
+        for index in ranking:
+            if quotes[index]:
+                rankings.setdefault(quotes[index], []).append(index)
+        self.tickers = tickers
+        self.by_symbol = {ticker["symbol"]: ticker for ticker in tickers}
+        self.index = {ticker["symbol"]: index for index, ticker in enumerate(tickers)}
+        if prices.keys() != self.prices.keys():
+            self.graph = build_graph(self.pairs or guessed_pairs(prices), prices)
+            self.routes = {}
+        self.prices = prices
+        self.change_pct = change_pct
+        self.quote_volume = quote_volume
+        self.rankings = rankings
+        self.data_json = json.dumps(tickers, ensure_ascii=False, separators=(",", ":"))
+        self.updated = time.monotonic()
+        self.refreshes += 1
+        return self
+
+    def store_pairs(self, exchange_info):
+        self.pairs = trading_pairs(exchange_info)
+        self.pairs_updated = time.monotonic()
+        self.graph = build_graph(self.pairs or guessed_pairs(self.prices), self.prices)
+        self.routes = {}
+        return self
+
+    async def _refresh(self):
+        if self.pairs_updated is not None and time.monotonic() - self.pairs_updated < EXCHANGE_INFO_INTERVAL:
+            return self.store(await fetch_crypto_data())
+        tickers, exchange_info = await asyncio.gather(fetch_crypto_data(), fetch_exchange_info(), return_exceptions=True)
+        if isinstance(tickers, BaseException):
+            raise tickers
+        if isinstance(exchange_info, BaseException):
+            self.last_error = str(exchange_info)
+        else:
+            self.store_pairs(exchange_info)
+        return self.store(tickers)
+
+    def _find_routes(self, base, target):
+        graph = self.graph
+        edges = graph.get(base, {})
+        hubs = [hub for hub in CONVERSION_HUBS if hub not in (base, target)]
+        paths = []
+        if target in edges:
+            paths.append([base, target])
+        for hub in hubs:
+            if hub in edges and target in graph.get(hub, {}):
+                paths.append([base, hub, target])
+        for first in hubs:
+            for second in hubs:
+                if first != second and first in edges and second in graph.get(first, {}) and target in graph.get(second, {}):
+                    paths.append([base, first, second, target])
+        return paths
+
+    def route(self, base, target):
+        key = (base, target)
+        if key in self.routes:
+            self.route_hits += 1
+        else:
+            self.route_misses += 1
+            self.routes[key] = self._find_routes(base, target)
+        return self.routes[key]
+
+    def _path_rate(self, path):
+        rate = 1.0
+        legs = []
+        for source, destination in zip(path, path[1:]):
+            symbol, inverted = self.graph[source][destination]
+            price = self.prices[symbol]
+            leg_rate = 1 / price if inverted else price
+            rate *= leg_rate
+            legs.append({"symbol": symbol, "from": source, "to": destination, "price": price, "inverted": inverted, "rate": leg_rate})
+        return rate, legs
+
+    def _liquidity(self, path):
+        return min(
+            to_float(self.by_symbol[self.graph[source][destination][0]].get("count"))
+            for source, destination in zip(path, path[1:])
+        )
+
+    def convert(self, base, target):
+        if base == target:
+            return 1.0, []
+        paths = self.route(base, target)
+        if not paths:
+            return None, None
+        hops = len(paths[0])
+        return self._path_rate(max((path for path in paths if len(path) == hops), key=self._liquidity))
+
+    def usdt_price(self, asset):
+        return self.prices.get(asset + "USDT", 0.0)
+
+    def top(self, amount, gainers=True, quote="", min_volume=0):
+        ranking = self.rankings.get(quote, [])
+        ordered = reversed(ranking) if gainers else iter(ranking)
+        if min_volume > 0:
+            quote_volume = self.quote_volume
+            ordered = (index for index in ordered if quote_volume[index] >= min_volume)
+        return [self.tickers[index] for index in islice(ordered, amount)]
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+            LOGGER.info(f"Binance market snapshot started with {self.interval}s interval")
 
-def get_top_losers(data, top_n=100):
-    return sorted(data, key=lambda x: float(x['priceChangePercent']))[:top_n]
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def age(self):
+        return time.monotonic() - self.updated if self.updated is not None else None
+
+    def age_ms(self):
+        return round(self.age() * 1000)
+
+    async def get(self):
+        if self.updated is None or self.age() > self.max_age:
+            try:
+                await SINGLE_FLIGHT.do("binance-snapshot", self._refresh)
+            except Exception as e:
+                if self.updated is None:
+                    raise
+                LOGGER.warning(f"Serving stale Binance snapshot after refresh failed: {str(e)}")
+        return self
+
+    async def _run(self):
+        while True:
+            try:
+                await SINGLE_FLIGHT.do("binance-snapshot", self._refresh)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    def stats(self):
+        return {
+            "symbols": len(self.by_symbol),
+            "priced_symbols": len(self.prices),
+            "quote_assets": sorted(quote for quote in self.rankings if quote),
+            "tradable_pairs": len(self.pairs),
+            "pairs_age_seconds": round(time.monotonic() - self.pairs_updated) if self.pairs_updated is not None else None,
+            "graph_assets": len(self.graph),
+            "cached_routes": len(self.routes),
+            "route_hits": self.route_hits,
+            "route_misses": self.route_misses,
+            "age_ms": self.age_ms() if self.updated is not None else None,
+            "interval_seconds": self.interval,
+            "max_age_seconds": self.max_age,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
+
+MARKET = MarketSnapshot()
+BACKGROUND_SERVICES.register("binance_snapshot", MARKET)
+
+def raw_data_response(data_json, **fields):
+    tail = json.dumps(
+        {**fields, "api_owner": "@ISmartCoder", "api_updates": "t.me/abirxdhackz"},
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return Response(content='{"success":true,"data":' + data_json + "," + tail[1:], media_type="application/json")
+
+def validate_ranking_filters(amount, quote, min_volume):
+    if amount <= 0:
+        return "Amount must be greater than 0"
+    if amount > 1000:
+        return "Amount must not exceed 1000"
+    if quote and quote not in QUOTE_ASSETS:
+        return f"Unsupported quote asset. Supported: {', '.join(sorted(QUOTE_ASSETS))}"
+    if min_volume < 0:
+        return "min_volume must not be negative"
+    return None
 
 @router.get("/24h")
 async def get_24h_ticker():
     try:
-        data = await fetch_crypto_data()
+        market = await MARKET.get()
+        return raw_data_response(market.data_json, count=len(market.tickers), data_age_ms=market.age_ms())
+    except Exception as e:
+        LOGGER.error(f"Failed to fetch 24h ticker data: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": f"Failed to fetch data: {str(e)}",
+                "api_owner": "@ISmartCoder",
+                "api_updates": "t.me/abirxdhackz"
+            }
+        )
+
+@router.get("/price")
+async def get_price(token: str = ""):
+    if not token:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": "Missing 'token' parameter",
+                "api_owner": "@ISmartCoder",
+                "api_updates": "t.me/abirxdhackz"
+            }
+        )
+    try:
+        market = await MARKET.get()
+        data = market.by_symbol.get(token.strip().upper() + "USDT")
+        if data is None:
+            LOGGER.error(f"Invalid token {token}: Invalid symbol.")
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "success": False,
+                    "error": "Invalid token: Invalid symbol.",
+                    "api_owner": "@ISmartCoder",
+                    "api_updates": "t.me/abirxdhackz"
+                }
+            )
         return JSONResponse(
             content={
                 "success": True,
                 "data": data,
-                "count": len(data) if isinstance(data, list) else 1,
+                "data_age_ms": market.age_ms(),
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
         )
     except Exception as e:
-        LOGGER.error(f"Failed to fetch 24h ticker data: {str(e)}")
+        LOGGER.error(f"Failed to fetch price for token {token}: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={
@@ -55,46 +373,66 @@ async def get_24h_ticker():
             }
         )
 
-@router.get("/price")
-async def get_price(token: str = ""):
-    if not token:
+def price_batch(tokens, quote, compact, market):
+    found = []
+    errors = []
+    seen = set()
+    for token in tokens:
+        token = token.strip().upper()
+        if not token or token in seen:
+            continue
+        seen.add(token)
+        symbol = token + quote
+        ticker = market.by_symbol.get(symbol)
+        if ticker is None:
+            errors.append({"token": token, "symbol": symbol, "error": "Invalid symbol"})
+        elif compact:
+            index = market.index[symbol]
+            found.append([token, symbol, market.prices.get(symbol, 0.0), market.change_pct[index], market.quote_volume[index]])
+        else:
+            found.append({"token": token, **ticker})
+    return found, errors
+
+async def batch_prices_response(tokens, quote, compact):
+    quote = quote.strip().upper()
+    tokens = [token for token in tokens if token.strip()]
+    if not tokens:
+        error = "Missing 'tokens' parameter"
+    elif len(tokens) > MAX_BATCH_SYMBOLS:
+        error = f"Too many tokens, at most {MAX_BATCH_SYMBOLS} per request"
+    elif quote not in QUOTE_ASSETS:
+        error = f"Unsupported quote asset. Supported: {', '.join(sorted(QUOTE_ASSETS))}"
+    else:
+        error = None
+    if error:
         return JSONResponse(
             status_code=400,
             content={
                 "success": False,
-                "error": "Missing 'token' parameter",
+                "error": error,
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
         )
     try:
-        url = BASE_URL_SYMBOL.format(token=token.upper())
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status != 200:
-                    error = await response.json()
-                    error_message = error.get("msg", "Unknown error")
-                    LOGGER.error(f"Invalid token {token}: {error_message}")
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "success": False,
-                            "error": f"Invalid token: {error_message}",
-                            "api_owner": "@ISmartCoder",
-                            "api_updates": "t.me/abirxdhackz"
-                        }
-                    )
-                data = await response.json()
-                return JSONResponse(
-                    content={
-                        "success": True,
-                        "data": data,
-                        "api_owner": "@ISmartCoder",
-                        "api_updates": "t.me/abirxdhackz"
-                    }
-                )
+        market = await MARKET.get()
+        found, errors = price_batch(tokens, quote, compact, market)
+        content = {
+            "success": bool(found),
+            "data": found,
+            "errors": errors,
+            "count": len(found),
+            "failed": len(errors),
+            "quote": quote,
+            "data_age_ms": market.age_ms(),
+            "api_owner": "@ISmartCoder",
+            "api_updates": "t.me/abirxdhackz"
+        }
+        if compact:
+            content["fields"] = COMPACT_FIELDS
+        return JSONResponse(content=content)
     except Exception as e:
-        LOGGER.error(f"Failed to fetch price for token {token}: {str(e)}")
+        LOGGER.error(f"Failed to fetch batch prices: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={
@@ -105,18 +443,13 @@ async def get_price(token: str = ""):
             }
         )
 
-async def get_spot_price(symbol: str) -> float | None:
-    async with aiohttp.ClientSession(headers=HEADERS) as session:
-        try:
-            async with session.get(BASE_URL_PRICE.format(symbol=symbol.upper()), timeout=10) as response:
-                if response.status != 200:
-                    LOGGER.error(f"API request failed with status {response.status} for symbol {symbol}")
-                    return None
-                data = await response.json()
-                return float(data.get("price")) if "price" in data else None
-        except Exception as e:
-            LOGGER.error(f"Failed to fetch spot price for {symbol}: {str(e)}")
-            return None
+@router.get("/prices")
+async def get_prices(tokens: str = "", quote: str = "USDT", compact: bool = False):
+    return await batch_prices_response(tokens.split(","), quote, compact)
+
+@router.post("/prices")
+async def post_prices(request: PriceBatchRequest):
+    return await batch_prices_response(request.tokens, request.quote, request.compact)
 
 @router.get("/cx")
 async def convert_currency(base: str = "", target: str = "", amount: float = 1.0):
@@ -141,44 +474,41 @@ async def convert_currency(base: str = "", target: str = "", amount: float = 1.0
             }
         )
     try:
-        direct_symbol = base.upper() + target.upper()
-        inverse_symbol = target.upper() + base.upper()
-        price = await get_spot_price(direct_symbol)
-        inverted = False
-        if price is None:
-            price = await get_spot_price(inverse_symbol)
-            if price is None:
-                LOGGER.error(f"No valid trading pair found for {base} to {target}")
-                return JSONResponse(
-                    status_code=404,
-                    content={
-                        "success": False,
-                        "error": "Invalid token pair: not found on Binance",
-                        "api_owner": "@ISmartCoder",
-                        "api_updates": "t.me/abirxdhackz"
-                    }
-                )
-            inverted = True
-        base_usdt_price = await get_spot_price(base.upper() + "USDT") or 0.0
-        target_usdt_price = await get_spot_price(target.upper() + "USDT") or 0.0
-        if inverted:
-            converted_amount = amount / price
-        else:
-            converted_amount = amount * price
-        total_in_usdt = amount * base_usdt_price
+        market = await MARKET.get()
+        base = base.strip().upper()
+        target = target.strip().upper()
+        rate, legs = market.convert(base, target)
+        if rate is None:
+            LOGGER.error(f"No valid conversion route found for {base} to {target}")
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "success": False,
+                    "error": "Invalid token pair: no direct or multi-hop route found on Binance",
+                    "api_owner": "@ISmartCoder",
+                    "api_updates": "t.me/abirxdhackz"
+                }
+            )
+        base_usdt_price = market.usdt_price(base)
+        target_usdt_price = market.usdt_price(target)
         data = {
-            "base_coin": base.upper(),
-            "target_coin": target.upper(),
+            "base_coin": base,
+            "target_coin": target,
             "amount": amount,
-            "converted_amount": converted_amount,
-            "total_in_usdt": total_in_usdt,
+            "converted_amount": amount * rate,
+            "rate": rate,
+            "total_in_usdt": amount * base_usdt_price,
             "base_usdt_price": base_usdt_price,
-            "target_usdt_price": target_usdt_price
+            "target_usdt_price": target_usdt_price,
+            "route": [base] + [leg["to"] for leg in legs],
+            "hops": len(legs),
+            "legs": legs
         }
         return JSONResponse(
             content={
                 "success": True,
                 "data": data,
+                "data_age_ms": market.age_ms(),
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
@@ -196,35 +526,30 @@ async def convert_currency(base: str = "", target: str = "", amount: float = 1.0
         )
 
 @router.get("/gainers")
-async def get_top_gainers_endpoint(amount: int = 100):
-    if amount <= 0:
+async def get_top_gainers_endpoint(amount: int = 100, quote: str = "", min_volume: float = 0):
+    quote = quote.strip().upper()
+    error = validate_ranking_filters(amount, quote, min_volume)
+    if error:
         return JSONResponse(
             status_code=400,
             content={
                 "success": False,
-                "error": "Amount must be greater than 0",
-                "api_owner": "@ISmartCoder",
-                "api_updates": "t.me/abirxdhackz"
-            }
-        )
-    if amount > 1000:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "success": False,
-                "error": "Amount must not exceed 1000",
+                "error": error,
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
         )
     try:
-        data = await fetch_crypto_data()
-        top_gainers = get_top_gainers(data, top_n=amount)
+        market = await MARKET.get()
+        top_gainers = market.top(amount, gainers=True, quote=quote, min_volume=min_volume)
         return JSONResponse(
             content={
                 "success": True,
                 "data": top_gainers,
                 "count": len(top_gainers),
+                "quote": quote or None,
+                "min_volume": min_volume,
+                "data_age_ms": market.age_ms(),
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
@@ -242,35 +567,30 @@ async def get_top_gainers_endpoint(amount: int = 100):
         )
 
 @router.get("/losers")
-async def get_top_losers_endpoint(amount: int = 100):
-    if amount <= 0:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "success": False,
-                "error": "Amount must be greater than 0",
-                "api_owner": "@ISmartCoder",
-                "api_updates": "t.me/abirxdhackz"
-            }
-        )
-    if amount > 1000:
+async def get_top_losers_endpoint(amount: int = 100, quote: str = "", min_volume: float = 0):
+    quote = quote.strip().upper()
+    error = validate_ranking_filters(amount, quote, min_volume)
+    if error:
         return JSONResponse(
             status_code=400,
             content={
                 "success": False,
-                "error": "Amount must not exceed 1000",
+                "error": error,
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
         )
     try:
-        data = await fetch_crypto_data()
-        top_losers = get_top_losers(data, top_n=amount)
+        market = await MARKET.get()
+        top_losers = market.top(amount, gainers=False, quote=quote, min_volume=min_volume)
         return JSONResponse(
             content={
                 "success": True,
                 "data": top_losers,
                 "count": len(top_losers),
+                "quote": quote or None,
+                "min_volume": min_volume,
+                "data_age_ms": market.age_ms(),
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
@@ -285,4 +605,15 @@ async def get_top_losers_endpoint(amount: int = 100):
                 "api_owner": "@ISmartCoder",
                 "api_updates": "t.me/abirxdhackz"
             }
-        )
\ No newline at end of file
+        )
+
+@router.get("/snapshot")
+async def get_market_snapshot():
+    return JSONResponse(
+        content={
+            "success": True,
+            "data": MARKET.stats(),
+            "api_owner": "@ISmartCoder",
+            "api_updates": "t.me/abirxdhackz"
+        }
+    )
@@ -3,11 +3,13 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import requests
-from utils import LOGGER
+from utils import LOGGER, run_blocking, cached
 
 router = APIRouter(prefix="/country")
+CACHE_TTL = 3600
 
 @router.get("")
+@cached(CACHE_TTL, ignore_case=("name",))
 async def get_country_info(name: str = ""):
     if not name:
         return JSONResponse(
@@ -20,7 +22,7 @@ async def get_country_info(name: str = ""):
         )
     
     try:
-        response = requests.get(f"https://restcountries.com/v3.1/name/{name}")
+        response = await run_blocking("country", requests.get, f"https://restcountries.com/v3.1/name/{name}", timeout=10)
         if response.status_code != 200:
             LOGGER.error(f"REST Countries API returned status {response.status_code} for country {name}")
             return JSONResponse(
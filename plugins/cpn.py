@@ -9,7 +9,7 @@ import re
 import time
 import json
 from collections import OrderedDict
-from utils import LOGGER
+from utils import LOGGER, run_blocking
 
 router = APIRouter(prefix="/cpn")
 
@@ -114,7 +114,7 @@ async def get_coupons(site: str = ""):
             corrected_url = 'https://dealspotr.com/promo-codes/hostinger.com-website-builder'
             store_name = 'hostinger'
         else:
-            store_url, store_name = search_store_url(site)
+            store_url, store_name = await run_blocking("cpn", search_store_url, site)
             if not store_url or not store_name:
                 return JSONResponse(
                     status_code=404,
@@ -130,13 +130,13 @@ async def get_coupons(site: str = ""):
         if re.match(r'hostinger(?:\.com)?$', store_name):
             corrected_url = 'https://dealspotr.com/promo-codes/hostinger.com-website-builder'
             store_name = 'hostinger'
-    integer = extract_integer_from_html(corrected_url) if not re.search(r'hostinger(?:\.com(?:-website-builder)?)?$', corrected_url) else None
+    integer = await run_blocking("cpn", extract_integer_from_html, corrected_url) if not re.search(r'hostinger(?:\.com(?:-website-builder)?)?$', corrected_url) else None
     if not integer and not re.search(r'hostinger(?:\.com(?:-website-builder)?)?$', corrected_url):
         return JSONResponse(
             status_code=404,
             content={'error': 'Sorry Bro Invalid Site URL Provided ❌'}
         )
-    coupons = scrape_coupon_codes(corrected_url, integer)
+    coupons = await run_blocking("cpn", scrape_coupon_codes, corrected_url, integer)
     if not coupons:
         return JSONResponse(
             status_code=404,
@@ -5,9 +5,10 @@ from bs4 import BeautifulSoup
 from collections import OrderedDict
 import time
 
-from utils import LOGGER
+from utils import LOGGER, cached
 
 router = APIRouter(prefix="/dmn")
+CACHE_TTL = 1800
 
 class WhoisChecker:
     def __init__(self):
@@ -132,6 +133,7 @@ class WhoisChecker:
 checker = WhoisChecker()
 
 @router.get("")
+@cached(CACHE_TTL, ignore_case=("domain",))
 async def whois_domain(domain: str = Query(..., description="Domain name to lookup")):
     start_time = time.time()
     LOGGER.info("=" * 60)
@@ -162,7 +164,7 @@ async def whois_domain(domain: str = Query(..., description="Domain name to look
         LOGGER.info(f"Domain availability: {result.get('available', 'unknown')}")
         LOGGER.info("=" * 60)
         
-        return JSONResponse(content=dict(response))
+        return JSONResponse(status_code=502 if "error" in result else 200, content=dict(response))
         
     except Exception as e:
         time_taken = f"{time.time() - start_time:.2f}s"
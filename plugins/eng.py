@@ -5,12 +5,14 @@ from fastapi.responses import JSONResponse
 import requests
 import re
 import json
-from utils import LOGGER
+from utils import LOGGER, run_blocking, cached
 from config import GEMINI_API_KEY
 
 router = APIRouter(prefix="/eng")
 GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
 DICTIONARY_API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en/"
+GEMINI_CACHE_TTL = 3600
+DICTIONARY_CACHE_TTL = 86400
 
 def infer_syllables(phonetic):
     if not phonetic or phonetic == "/unknown/":
@@ -128,7 +130,7 @@ async def check_gemini_api(content, system_instruction, max_output_tokens):
             }
         }
         headers = {"Content-Type": "application/json"}
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
+        response = await run_blocking("eng", requests.post, GEMINI_API_URL, json=payload, headers=headers, timeout=30)
         if response.status_code != 200:
             LOGGER.error(f"Gemini API returned status {response.status_code} for content: {content}")
             return f"API Error {response.status_code}: {response.text}"
@@ -142,6 +144,7 @@ async def check_gemini_api(content, system_instruction, max_output_tokens):
         return f"API Error: {str(e)}"
 
 @router.get("/gmr")
+@cached(GEMINI_CACHE_TTL)
 async def grammar_check(content: str = ""):
     if not content:
         return JSONResponse(
@@ -172,6 +175,7 @@ async def grammar_check(content: str = ""):
     )
 
 @router.get("/spl")
+@cached(GEMINI_CACHE_TTL)
 async def spell_check(word: str = ""):
     if not word:
         return JSONResponse(
@@ -211,6 +215,7 @@ async def spell_check(word: str = ""):
     )
 
 @router.get("/prn")
+@cached(DICTIONARY_CACHE_TTL)
 async def pronunciation(word: str = ""):
     if not word or not re.match(r"^[a-zA-Z0-9\s'\-]+$", word):
         return JSONResponse(
@@ -221,7 +226,7 @@ async def pronunciation(word: str = ""):
                 "api_updates": "t.me/abirxdhackz"
             }
         )
-    dictionary_data = fetch_dictionary_data(word)
+    dictionary_data = await run_blocking("eng", fetch_dictionary_data, word)
     if dictionary_data is None:
         return JSONResponse(
             status_code=404,
@@ -248,6 +253,7 @@ async def pronunciation(word: str = ""):
     )
 
 @router.get("/syn")
+@cached(DICTIONARY_CACHE_TTL)
 async def synonyms(word: str = ""):
     if not word:
         return JSONResponse(
@@ -259,7 +265,7 @@ async def synonyms(word: str = ""):
             }
         )
     try:
-        response = requests.get(f"https://api.datamuse.com/words?rel_syn={word}", timeout=10)
+        response = await run_blocking("eng", requests.get, f"https://api.datamuse.com/words?rel_syn={word}", timeout=10)
         if response.status_code != 200:
             LOGGER.error(f"Datamuse API returned status {response.status_code} for synonyms of {word}")
             return JSONResponse(
@@ -301,6 +307,7 @@ async def synonyms(word: str = ""):
         )
 
 @router.get("/ant")
+@cached(DICTIONARY_CACHE_TTL)
 async def antonyms(word: str = ""):
     if not word:
         return JSONResponse(
@@ -312,7 +319,7 @@ async def antonyms(word: str = ""):
             }
         )
     try:
-        response = requests.get(f"https://api.datamuse.com/words?rel_ant={word}", timeout=10)
+        response = await run_blocking("eng", requests.get, f"https://api.datamuse.com/words?rel_ant={word}", timeout=10)
         if response.status_code != 200:
             LOGGER.error(f"Datamuse API returned status {response.status_code} for antonyms of {word}")
             return JSONResponse(
@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 import requests
 from bs4 import BeautifulSoup
 import re
+from utils import run_blocking
 
 router = APIRouter(prefix="/fb", tags=["Facebook Downloader"])
 
@@ -53,7 +54,9 @@ async def fb_downloader(url: str = ""):
             "URLz": url.strip()
         }
 
-        resp = requests.post(
+        resp = await run_blocking(
+            "fb",
+            requests.post,
             "https://fdown.net/download.php",
             data=payload,
             headers=headers,
@@ -71,7 +74,7 @@ async def fb_downloader(url: str = ""):
             )
 
         html = resp.text
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = await run_blocking("fb", BeautifulSoup, html, 'html.parser')
 
         title = "Facebook Video"
         title_elem = soup.find('div', class_='lib-row lib-header')
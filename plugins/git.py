@@ -3,11 +3,13 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import requests
-from utils import LOGGER
+from utils import LOGGER, run_blocking, cached
 
 router = APIRouter(prefix="/git")
+CACHE_TTL = 300
 
 @router.get("/user")
+@cached(CACHE_TTL, ignore_case=("username",))
 async def get_user_repos(username: str = ""):
     if not username:
         return JSONResponse(
@@ -20,7 +22,7 @@ async def get_user_repos(username: str = ""):
         )
     
     try:
-        response = requests.get(f"https://api.github.com/users/{username}/repos")
+        response = await run_blocking("git", requests.get, f"https://api.github.com/users/{username}/repos", timeout=10)
         if response.status_code != 200:
             LOGGER.error(f"GitHub API returned status {response.status_code} for user {username}")
             return JSONResponse(
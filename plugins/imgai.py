@@ -3,9 +3,8 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import aiohttp
 from config import IMGAI_API_KEY
-from utils import LOGGER
+from utils import LOGGER, get_session
 
 router = APIRouter(prefix="/imgai")
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
@@ -36,16 +35,16 @@ async def analyze_image(image_base64: str, mime_type: str, prompt: str):
     }
     headers = {"Content-Type": "application/json"}
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers, timeout=30) as response:
-                if response.status != 200:
-                    error = await response.json()
-                    error_message = error.get("error", {}).get("message", "Unknown error")
-                    LOGGER.error(f"Gemini API request failed: {response.status} - {error_message}")
-                    return None, error_message, response.status
-                result = await response.json()
-                analysis = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "No analysis available for this image")
-                return analysis, None, 200
+        session = get_session("imgai")
+        async with session.post(url, json=payload, headers=headers, timeout=30) as response:
+            if response.status != 200:
+                error = await response.json()
+                error_message = error.get("error", {}).get("message", "Unknown error")
+                LOGGER.error(f"Gemini API request failed: {response.status} - {error_message}")
+                return None, error_message, response.status
+            result = await response.json()
+            analysis = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "No analysis available for this image")
+            return analysis, None, 200
     except Exception as e:
         LOGGER.error(f"Error analyzing image: {str(e)}")
         return None, str(e), 500
@@ -4,7 +4,7 @@ from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import aiohttp
 import asyncio
-from utils import LOGGER
+from utils import LOGGER, get_session
 
 router = APIRouter(prefix="/net")
 IPINFO_URL = "https://ipinfo.io/{ip}/json?token=69ee063dfc785d"
@@ -16,20 +16,20 @@ GEOLOCATION_TIMEOUT = 3
 
 async def get_ip_info(ip: str):
     try:
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.get(IPINFO_URL.format(ip=ip), timeout=GEOLOCATION_TIMEOUT) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return {
-                    "ip": data.get("ip", "Unknown"),
-                    "asn": data.get("org", "Unknown"),
-                    "isp": data.get("org", "Unknown"),
-                    "country": data.get("country", "Unknown"),
-                    "city": data.get("city", "Unknown"),
-                    "timezone": data.get("timezone", "Unknown"),
-                    "fraud_score": 0,
-                    "risk_level": "low"
-                }
+        session = get_session("net")
+        async with session.get(IPINFO_URL.format(ip=ip), headers=HEADERS, timeout=GEOLOCATION_TIMEOUT) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return {
+                "ip": data.get("ip", "Unknown"),
+                "asn": data.get("org", "Unknown"),
+                "isp": data.get("org", "Unknown"),
+                "country": data.get("country", "Unknown"),
+                "city": data.get("city", "Unknown"),
+                "timezone": data.get("timezone", "Unknown"),
+                "fraud_score": 0,
+                "risk_level": "low"
+            }
     except aiohttp.ClientError as e:
         LOGGER.error(f"Failed to fetch IP info for {ip}: {str(e)}")
         return None
@@ -64,36 +64,38 @@ async def check_proxy(proxy: str, proxy_type: str = 'http', auth: dict = None):
     ip = proxy.split(':')[0]
     try:
         proxy_url = f"{proxy_type}://{auth['username']}:{auth['password']}@{proxy}" if auth else f"{proxy_type}://{proxy}"
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.get(
-                HTTPBIN_IP_URL,
-                proxy=proxy_url,
-                timeout=PROXY_TIMEOUT
-            ) as response:
-                if response.status == 200:
-                    result.update({
-                        'status': 'Live',
-                        'ip': ip
-                    })
-                    result['anonymity'] = await check_anonymity(session, proxy_url)
-            async with session.get(
-                IPINFO_URL.format(ip=ip),
-                timeout=GEOLOCATION_TIMEOUT
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result['location'] = f"{data.get('region', 'Unknown')} ({data.get('country', 'Unknown')})"
-                else:
-                    result['location'] = f"HTTP {response.status}"
+        session = get_session("net")
+        async with session.get(
+            HTTPBIN_IP_URL,
+            proxy=proxy_url,
+            timeout=PROXY_TIMEOUT,
+            headers=HEADERS
+        ) as response:
+            if response.status == 200:
+                result.update({
+                    'status': 'Live',
+                    'ip': ip
+                })
+                result['anonymity'] = await check_anonymity(session, proxy_url)
+        async with session.get(
+            IPINFO_URL.format(ip=ip),
+            timeout=GEOLOCATION_TIMEOUT,
+            headers=HEADERS
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                result['location'] = f"{data.get('region', 'Unknown')} ({data.get('country', 'Unknown')})"
+            else:
+                result['location'] = f"HTTP {response.status}"
     except Exception as e:
         LOGGER.error(f"Error checking proxy {proxy}: {str(e)}")
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.get(IPINFO_URL.format(ip=ip), timeout=GEOLOCATION_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result['location'] = f"{data.get('region', 'Unknown')} ({data.get('country', 'Unknown')})"
-                else:
-                    result['location'] = f"HTTP {response.status}"
+        session = get_session("net")
+        async with session.get(IPINFO_URL.format(ip=ip), headers=HEADERS, timeout=GEOLOCATION_TIMEOUT) as response:
+            if response.status == 200:
+                data = await response.json()
+                result['location'] = f"{data.get('region', 'Unknown')} ({data.get('country', 'Unknown')})"
+            else:
+                result['location'] = f"HTTP {response.status}"
     return result
 
 @router.get("/chk")
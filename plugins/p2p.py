@@ -1,14 +1,16 @@
 #Copyright @ISmartCoder
 #Updates Channel @TheSmartDev 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-import aiohttp
+from fastapi.responses import JSONResponse, StreamingResponse
 import asyncio
+import json
+from array import array
 from datetime import datetime
+from math import ceil, fsum
+from operator import mul
+import os
 import time
-from functools import wraps
-import threading
-from utils import LOGGER
+from utils import LOGGER, SINGLE_FLIGHT, BACKGROUND_SERVICES, get_session
 
 router = APIRouter(prefix="/p2p")
 BINANCE_API_URL = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
@@ -18,9 +20,18 @@ HEADERS = {
     "lang": "en",
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
-cache = {}
-cache_lock = threading.Lock()
-CACHE_DURATION = 30
+ROWS_PER_PAGE = 20
+MAX_PAGES = 50
+PAGE_CONCURRENCY = int(os.getenv("P2P_PAGE_CONCURRENCY", 10))
+BOOK_REFRESH_INTERVAL = float(os.getenv("P2P_REFRESH_INTERVAL", 10))
+BOOK_MAX_AGE = float(os.getenv("P2P_BOOK_MAX_AGE", 30))
+BOOK_MAX_HOT = int(os.getenv("P2P_MAX_HOT_BOOKS", 20))
+BOOK_IDLE_TTL = float(os.getenv("P2P_BOOK_IDLE_TTL", 600))
+BOOK_MIN_DEMAND = float(os.getenv("P2P_REFRESH_MIN_DEMAND", 2))
+BOOK_FULL_DEMAND = float(os.getenv("P2P_REFRESH_FULL_DEMAND", 8))
+DEMAND_HALF_LIFE = 120
+STREAM_CHUNK_ROWS = 100
+MAX_SPREAD_MARKETS = 20
 PAYMENT_METHODS = {
     "BHD": {
         "BANK": "BANK",
@@ -245,35 +256,7 @@ PAYMENT_METHODS = {
 }
 CRYPTO_ASSETS = ["USDT", "BTC", "ETH", "BNB", "BUSD", "ADA", "DOT", "MATIC", "SHIB", "DOGE"]
 
-def get_cache_key(params):
-    return f"{params.get('asset', 'USDT')}_{params.get('pay_type', 'BDT')}_{params.get('trade_type', 'SELL')}_{params.get('pay_method', 'ALL')}_{params.get('limit', '100')}"
-
-def cache_response(duration=CACHE_DURATION):
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            cache_key = get_cache_key(kwargs)
-            current_time = time.time()
-            with cache_lock:
-                if cache_key in cache:
-                    cached_data, timestamp = cache[cache_key]
-                    if current_time - timestamp < duration:
-                        LOGGER.info(f"Cache hit for {cache_key}")
-                        return cached_data
-                keys_to_remove = [
-                    key for key, (_, timestamp) in cache.items()
-                    if current_time - timestamp > duration
-                ]
-                for key in keys_to_remove:
-                    del cache[key]
-            result = await func(*args, **kwargs)
-            with cache_lock:
-                cache[cache_key] = (result, current_time)
-            return result
-        return wrapper
-    return decorator
-
-async def fetch_page_async(session, asset, fiat, trade_type, pay_method, page, rows=20):
+async def fetch_page_async(session, asset, fiat, trade_type, pay_method, page, rows=ROWS_PER_PAGE):
     payload = {
         "asset": asset,
         "fiat": fiat,
@@ -285,97 +268,427 @@ async def fetch_page_async(session, asset, fiat, trade_type, pay_method, page, r
         "merchantCheck": False
     }
     try:
-        async with session.post(BINANCE_API_URL, headers=HEADERS, json=payload, timeout=15) as response:
+        async with session.post(BINANCE_API_URL, headers=HEADERS, json=payload) as response:
             if response.status != 200:
                 LOGGER.error(f"Error fetching page {page}: {response.status}")
-                return []
+                return None
             data = await response.json()
-            return data.get('data', [])
+            return data.get('data') or []
     except asyncio.TimeoutError:
         LOGGER.error(f"Timeout fetching page {page}")
-        return []
+        return None
     except Exception as e:
         LOGGER.error(f"Exception fetching page {page}: {e}")
-        return []
-
-async def fetch_all_sellers_async(asset, fiat, trade_type, pay_method, max_results=1000):
-    connector = aiohttp.TCPConnector(
-        limit=30,
-        limit_per_host=15,
-        ttl_dns_cache=300,
-        use_dns_cache=True
-    )
-    timeout = aiohttp.ClientTimeout(total=45)
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-        pages_needed = min((max_results // 20) + 1, 50)
-        LOGGER.info(f"Fetching {pages_needed} pages concurrently...")
+        return None
+
+def book_key(asset, fiat, trade_type, pay_method=None):
+    return (asset.strip().upper(), fiat.strip().upper(), trade_type.strip().upper(), pay_method or "ALL")
+
+def pages_for_limit(limit):
+    return max(min(-(-limit // ROWS_PER_PAGE), MAX_PAGES), 1)
+
+async def iter_seller_pages(asset, fiat, trade_type, pay_method, max_results=1000, failures=None):
+    session = get_session("p2p")
+    pages_needed = pages_for_limit(max_results)
+    LOGGER.info(f"Fetching up to {pages_needed} pages for {asset}/{fiat} {trade_type}...")
+    remaining = max_results
+    page = 1
+    while page <= pages_needed and remaining > 0:
         tasks = [
-            fetch_page_async(session, asset, fiat, trade_type, pay_method, page)
-            for page in range(1, pages_needed + 1)
+            asyncio.ensure_future(fetch_page_async(session, asset, fiat, trade_type, pay_method, p))
+            for p in range(page, min(page + PAGE_CONCURRENCY, pages_needed + 1))
         ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        all_sellers = []
-        for result in results:
-            if isinstance(result, list):
-                all_sellers.extend(result)
-            elif isinstance(result, Exception):
-                LOGGER.error(f"Task failed: {result}")
-        LOGGER.info(f"Fetched {len(all_sellers)} total sellers")
-        return all_sellers[:max_results]
-
-def process_sellers_data(sellers, filters=None):
-    processed = []
-    filters = filters or {}
-    for ad in sellers:
+        exhausted = False
         try:
-            adv = ad.get('adv', {})
-            advertiser = ad.get('advertiser', {})
-            if not adv or not advertiser:
-                continue
-            payment_methods = []
-            for method in adv.get('tradeMethods', []):
-                method_name = method.get('tradeMethodName', '')
-                payment_methods.append(method_name)
-            if filters.get('min_completion_rate'):
-                completion_rate = advertiser.get('monthFinishRate', 0) * 100
-                if completion_rate < filters['min_completion_rate']:
+            for offset, task in enumerate(tasks):
+                result = await task
+                if result is None:
+                    if failures is not None:
+                        failures.append(page + offset)
                     continue
-            if filters.get('min_orders'):
-                if advertiser.get('monthOrderCount', 0) < filters['min_orders']:
+                if result[:remaining]:
+                    yield result[:remaining]
+                remaining -= len(result)
+                if len(result) < ROWS_PER_PAGE or remaining <= 0:
+                    exhausted = True
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        if exhausted:
+            break
+        page += len(tasks)
+
+async def fetch_all_sellers_async(asset, fiat, trade_type, pay_method, max_results=1000, failures=None):
+    all_sellers = []
+    async for sellers in iter_seller_pages(asset, fiat, trade_type, pay_method, max_results, failures):
+        all_sellers.extend(sellers)
+    LOGGER.info(f"Fetched {len(all_sellers)} total sellers")
+    return all_sellers
+
+class OrderBookRefresher:
+    def __init__(self, interval=BOOK_REFRESH_INTERVAL, max_age=BOOK_MAX_AGE, max_books=BOOK_MAX_HOT, idle_ttl=BOOK_IDLE_TTL,
+                 min_demand=BOOK_MIN_DEMAND, full_demand=BOOK_FULL_DEMAND):
+        self.interval = interval
+        self.max_age = max_age
+        self.max_books = max_books
+        self.idle_ttl = idle_ttl
+        self.min_demand = min_demand
+        self.full_demand = full_demand
+        self.books = {}
+        self.demand = {}
+        self.refreshes = 0
+        self.warm_hits = 0
+        self.cold_fetches = 0
+        self._task = None
+
+    def _decay(self, entry, now):
+        return 0.5 ** ((now - entry["seen"]) / DEMAND_HALF_LIFE)
+
+    def _score(self, entry, now):
+        return entry["score"] * self._decay(entry, now)
+
+    def _touch(self, key, pages):
+        now = time.monotonic()
+        entry = self.demand.get(key)
+        if entry is None:
+            entry = self.demand[key] = {"score": 0.0, "seen": now, "pages": pages}
+        decay = self._decay(entry, now)
+        entry["score"] = entry["score"] * decay + 1
+        entry["pages"] = max(entry["pages"] * decay, pages)
+        entry["seen"] = now
+
+    def _plan(self, entry, now):
+        decay = self._decay(entry, now)
+        score = entry["score"] * decay
+        if score < self.min_demand:
+            return None
+        ratio = min(score / self.full_demand, 1.0)
+        return max(1, ceil(entry["pages"] * decay * ratio)), self.interval / ratio
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+            LOGGER.info(f"P2P order book refresher started with {self.interval}s interval")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _fresh_and_deeper(self, book, pages):
+        return book is not None and book["pages"] > pages and time.monotonic() - book["updated"] <= self.max_age
+
+    def store(self, key, raw, pages, failed=False):
+        self.refreshes += 1
+        book = self.books.get(key)
+        if self._fresh_and_deeper(book, pages):
+            return book
+        if raw or book is None:
+            self.books[key] = {
+                "sellers": SellerBook.from_ads(raw),
+                "pages": pages,
+                "complete": not failed and len(raw) < pages * ROWS_PER_PAGE,
+                "updated": time.monotonic()
+            }
+        return self.books[key]
+
+    async def _refresh(self, key, pages):
+        failures = []
+        raw = await fetch_all_sellers_async(*key, pages * ROWS_PER_PAGE, failures)
+        return self.store(key, raw, pages, bool(failures))
+
+    def peek(self, asset, fiat, trade_type, pay_method, limit):
+        key = book_key(asset, fiat, trade_type, pay_method)
+        pages = pages_for_limit(limit)
+        self._touch(key, pages)
+        book = self.books.get(key)
+        if book is not None and time.monotonic() - book["updated"] <= self.max_age and (book["complete"] or book["pages"] >= pages):
+            self.warm_hits += 1
+            return key, pages, book
+        self.cold_fetches += 1
+        return key, pages, None
+
+    async def get(self, asset, fiat, trade_type, pay_method, limit):
+        key, pages, book = self.peek(asset, fiat, trade_type, pay_method, limit)
+        if book is None:
+            _, book = await SINGLE_FLIGHT.do(f"p2p-book:{':'.join(key)}:{pages}", lambda: self._refresh(key, pages))
+        return book["sellers"], time.monotonic() - book["updated"]
+
+    async def refresh_hot(self):
+        now = time.monotonic()
+        for key in [k for k, entry in self.demand.items() if now - entry["seen"] > self.idle_ttl]:
+            self.demand.pop(key, None)
+            self.books.pop(key, None)
+        hot = sorted(self.demand.items(), key=lambda item: -self._score(item[1], now))[:self.max_books]
+        for key, entry in hot:
+            plan = self._plan(entry, now)
+            if plan is None:
+                break
+            pages, interval = plan
+            book = self.books.get(key)
+            if self._fresh_and_deeper(book, pages):
+                continue
+            if book is None or time.monotonic() - book["updated"] >= interval:
+                await SINGLE_FLIGHT.do(
+                    f"p2p-book:{':'.join(key)}:{pages}",
+                    lambda key=key, pages=pages: self._refresh(key, pages)
+                )
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_hot()
+            except Exception as e:
+                LOGGER.error(f"P2P order book refresh failed: {e}")
+
+    def stats(self):
+        now = time.monotonic()
+        plans = {key: self._plan(entry, now) for key, entry in self.demand.items()}
+        return {
+            "books": [
+                {
+                    "asset": key[0],
+                    "fiat": key[1],
+                    "trade_type": key[2],
+                    "pay_method": key[3],
+                    "sellers": len(book["sellers"]),
+                    "pages": book["pages"],
+                    "complete": book["complete"],
+                    "age_seconds": round(now - book["updated"], 2),
+                    "demand": round(self._score(self.demand[key], now), 3) if key in self.demand else 0,
+                    "refresh_pages": plans[key][0] if plans.get(key) else 0,
+                    "refresh_interval_seconds": round(plans[key][1], 2) if plans.get(key) else None
+                }
+                for key, book in self.books.items()
+            ],
+            "refreshes": self.refreshes,
+            "warm_hits": self.warm_hits,
+            "cold_fetches": self.cold_fetches
+        }
+
+ORDER_BOOKS = OrderBookRefresher()
+BACKGROUND_SERVICES.register("p2p_order_books", ORDER_BOOKS)
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class SellerBook:
+    SORT_COLUMNS = {
+        'price': 'price',
+        'completion_rate': 'completion_rate',
+        'available_amount': 'available_amount',
+        'monthly_orders': 'monthly_orders'
+    }
+
+    def __init__(self):
+        self.price = array('d')
+        self.available_amount = array('d')
+        self.min_order_amount = array('d')
+        self.max_order_amount = array('d')
+        self.completion_rate = array('d')
+        self.monthly_orders = array('q')
+        self.merchant = bytearray()
+        self.ids = []
+        self.names = []
+        self.fiat_units = []
+        self.payment_methods = []
+        self.user_types = []
+
+    def __len__(self):
+        return len(self.price)
+
+    @classmethod
+    def from_ads(cls, ads):
+        book = cls()
+        for ad in ads:
+            try:
+                adv = ad.get('adv', {})
+                advertiser = ad.get('advertiser', {})
+                if not adv or not advertiser:
                     continue
-            if filters.get('online_only') and advertiser.get('userType') != 'merchant':
+                row = (
+                    float(adv.get('price', 0)),
+                    float(adv.get('surplusAmount', 0)),
+                    float(adv.get('minSingleTransAmount', 0)),
+                    float(adv.get('maxSingleTransAmount', 0)),
+                    round(advertiser.get('monthFinishRate', 0) * 100, 2),
+                    int(advertiser.get('monthOrderCount', 0))
+                )
+            except Exception as e:
+                LOGGER.error(f"Error processing seller: {e}")
                 continue
-            processed_seller = {
-                "id": adv.get('advNo', ''),
-                "seller_name": advertiser.get("nickName", "Unknown"),
-                "price": float(adv.get('price', 0)),
-                "fiat_unit": adv.get('fiatUnit', ''),
-                "available_amount": float(adv.get('surplusAmount', 0)),
-                "min_order_amount": float(adv.get('minSingleTransAmount', 0)),
-                "max_order_amount": float(adv.get('maxSingleTransAmount', 0)),
-                "completion_rate": round(advertiser.get('monthFinishRate', 0) * 100, 2),
-                "monthly_orders": advertiser.get('monthOrderCount', 0),
-                "payment_methods": payment_methods,
-                "user_type": advertiser.get('userType', 'user'),
-                "online_status": "online" if advertiser.get('userType') == 'merchant' else "offline"
+            book.price.append(row[0])
+            book.available_amount.append(row[1])
+            book.min_order_amount.append(row[2])
+            book.max_order_amount.append(row[3])
+            book.completion_rate.append(row[4])
+            book.monthly_orders.append(row[5])
+            user_type = advertiser.get('userType', 'user')
+            book.merchant.append(user_type == 'merchant')
+            book.ids.append(adv.get('advNo', ''))
+            book.names.append(advertiser.get("nickName", "Unknown"))
+            book.fiat_units.append(adv.get('fiatUnit', ''))
+            book.payment_methods.append([m.get('tradeMethodName', '') for m in adv.get('tradeMethods', [])])
+            book.user_types.append(user_type)
+        return book
+
+    def select(self, filters=None, sort_by="price", reverse=False, limit=None):
+        filters = filters or {}
+        candidates = range(min(len(self), limit) if limit is not None else len(self))
+        min_completion_rate = filters.get('min_completion_rate')
+        min_orders = filters.get('min_orders')
+        if min_completion_rate:
+            rates = self.completion_rate
+            candidates = [i for i in candidates if rates[i] >= min_completion_rate]
+        if min_orders:
+            orders = self.monthly_orders
+            candidates = [i for i in candidates if orders[i] >= min_orders]
+        if filters.get('online_only'):
+            merchant = self.merchant
+            candidates = [i for i in candidates if merchant[i]]
+        column = self.SORT_COLUMNS.get(sort_by)
+        if column is None:
+            return list(candidates)
+        return sorted(candidates, key=getattr(self, column).__getitem__, reverse=reverse)
+
+    def rows(self, indices):
+        return [
+            {
+                "id": self.ids[i],
+                "seller_name": self.names[i],
+                "price": self.price[i],
+                "fiat_unit": self.fiat_units[i],
+                "available_amount": self.available_amount[i],
+                "min_order_amount": self.min_order_amount[i],
+                "max_order_amount": self.max_order_amount[i],
+                "completion_rate": self.completion_rate[i],
+                "monthly_orders": self.monthly_orders[i],
+                "payment_methods": self.payment_methods[i],
+                "user_type": self.user_types[i],
+                "online_status": "online" if self.merchant[i] else "offline"
+            }
+            for i in indices
+        ]
+
+    def depth(self, limit=None, best_is_min=True, band_pct=1.0):
+        count = min(len(self), limit) if limit is not None else len(self)
+        if not count:
+            return {"best_price": None, "sellers": 0, "total_available": 0, "depth_in_band": 0, "sellers_in_band": 0}
+        prices = self.price[:count]
+        amounts = self.available_amount[:count]
+        best = min(prices) if best_is_min else max(prices)
+        bound = best * (1 + band_pct / 100) if best_is_min else best * (1 - band_pct / 100)
+        in_band = [
+            amount for price, amount in zip(prices, amounts)
+            if (price <= bound if best_is_min else price >= bound)
+        ]
+        return {
+            "best_price": best,
+            "sellers": count,
+            "total_available": fsum(amounts),
+            "depth_in_band": fsum(in_band),
+            "sellers_in_band": len(in_band)
+        }
+
+    def stats(self, indices):
+        if not indices:
+            return {"avg_price": 0, "min_price": 0, "max_price": 0, "total_available": 0}
+        prices = sorted(map(self.price.__getitem__, indices))
+        amounts = list(map(self.available_amount.__getitem__, indices))
+        total_available = fsum(amounts)
+        notional = fsum(map(mul, map(self.price.__getitem__, indices), amounts))
+        return {
+            "avg_price": round(fsum(prices) / len(prices), 2),
+            "min_price": prices[0],
+            "max_price": prices[-1],
+            "total_available": total_available,
+            "median_price": round(percentile(prices, 50), 4),
+            "p10_price": round(percentile(prices, 10), 4),
+            "p25_price": round(percentile(prices, 25), 4),
+            "p75_price": round(percentile(prices, 75), 4),
+            "p90_price": round(percentile(prices, 90), 4),
+            "vwap": round(notional / total_available, 4) if total_available else 0,
+            "spread": round(prices[-1] - prices[0], 4)
+        }
+
+def validate_market(asset, pay_type, pay_method="ALL", trade_type="BUY"):
+    if asset not in CRYPTO_ASSETS:
+        return f"Unsupported asset. Supported: {', '.join(CRYPTO_ASSETS)}"
+    if trade_type not in ['BUY', 'SELL']:
+        return "trade_type must be BUY or SELL"
+    if pay_type not in PAYMENT_METHODS:
+        return f"Unsupported pay_type. Supported: {', '.join(PAYMENT_METHODS.keys())}"
+    if pay_method != 'ALL' and pay_method not in PAYMENT_METHODS[pay_type]:
+        return f"Invalid pay_method for {pay_type}. Supported: {', '.join(PAYMENT_METHODS[pay_type].keys())}"
+    return None
+
+def ndjson_lines(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+async def stream_sellers(key, pages, book, limit, filters, sort_by, reverse, parameters, start_time):
+    try:
+        if book is not None:
+            sellers = book["sellers"]
+            selected = sellers.select(filters, sort_by, reverse, limit)
+            for start in range(0, len(selected), STREAM_CHUNK_ROWS):
+                yield ndjson_lines(sellers.rows(selected[start:start + STREAM_CHUNK_ROWS]))
+            data_age = time.monotonic() - book["updated"]
+        else:
+            raw = []
+            failures = []
+            async for ads in iter_seller_pages(*key, pages * ROWS_PER_PAGE, failures):
+                shown = ads[:max(limit - len(raw), 0)]
+                raw.extend(ads)
+                if not shown:
+                    continue
+                page_book = SellerBook.from_ads(shown)
+                rows = page_book.rows(page_book.select(filters, None))
+                if rows:
+                    yield ndjson_lines(rows)
+            sellers = ORDER_BOOKS.store(key, raw, pages, bool(failures))["sellers"]
+            selected = sellers.select(filters, None, False, limit)
+            data_age = 0
+        yield json.dumps({
+            "summary": {
+                "success": bool(selected),
+                "count": len(selected),
+                "total_found": len(selected),
+                "sorted": book is not None and sort_by in SellerBook.SORT_COLUMNS,
+                "statistics": sellers.stats(selected),
+                "time_taken": round(time.time() - start_time, 3),
+                "trade_type": parameters["trade_type"],
+                "parameters": parameters,
+                "timestamp": datetime.now().isoformat(),
+                "data_age_ms": round(data_age * 1000),
+                "api_owner": "@ISmartCoder",
+                "api_updates": "t.me/abirxdhackz"
             }
-            processed.append(processed_seller)
-        except Exception as e:
-            LOGGER.error(f"Error processing seller: {e}")
-            continue
-    return processed
+        }) + "\n"
+    except Exception as e:
+        LOGGER.error(f"Error streaming P2P data: {e}")
+        yield json.dumps({"summary": {"success": False, "error": "Internal server error"}}) + "\n"
 
 @router.get("")
-@cache_response(30)
-async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: str = "ALL", trade_type: str = "SELL", limit: int = 100, sort_by: str = "price", order: str = "asc", min_completion_rate: float = None, min_orders: int = None, online_only: bool = False):
+async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: str = "ALL", trade_type: str = "SELL", limit: int = 100, sort_by: str = "price", order: str = "asc", min_completion_rate: float = None, min_orders: int = None, online_only: bool = False, stream: bool = False):
     start_time = time.time()
     try:
-        asset = asset.upper()
-        pay_type = pay_type.upper()
-        pay_method = pay_method.upper()
-        trade_type = trade_type.upper()
-        sort_by = sort_by.lower()
-        order = order.lower()
+        asset = asset.strip().upper()
+        pay_type = pay_type.strip().upper()
+        pay_method = pay_method.strip().upper()
+        trade_type = trade_type.strip().upper()
+        sort_by = sort_by.strip().lower()
+        order = order.strip().lower()
         if limit > 1000:
             return JSONResponse(
                 status_code=400,
@@ -386,38 +699,12 @@ async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: s
                 }
             )
         limit = min(limit, 1000)
-        if asset not in CRYPTO_ASSETS:
+        error = validate_market(asset, pay_type, pay_method, trade_type)
+        if error:
             return JSONResponse(
                 status_code=400,
                 content={
-                    "error": f"Unsupported asset. Supported: {', '.join(CRYPTO_ASSETS)}",
-                    "api_owner": "@ISmartCoder",
-                    "api_updates": "t.me/abirxdhackz"
-                }
-            )
-        if trade_type not in ['BUY', 'SELL']:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": "trade_type must be BUY or SELL",
-                    "api_owner": "@ISmartCoder",
-                    "api_updates": "t.me/abirxdhackz"
-                }
-            )
-        if pay_type not in PAYMENT_METHODS:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": f"Unsupported pay_type. Supported: {', '.join(PAYMENT_METHODS.keys())}",
-                    "api_owner": "@ISmartCoder",
-                    "api_updates": "t.me/abirxdhackz"
-                }
-            )
-        if pay_method != 'ALL' and pay_method not in PAYMENT_METHODS[pay_type]:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": f"Invalid pay_method for {pay_type}. Supported: {', '.join(PAYMENT_METHODS[pay_type].keys())}",
+                    "error": error,
                     "api_owner": "@ISmartCoder",
                     "api_updates": "t.me/abirxdhackz"
                 }
@@ -431,7 +718,23 @@ async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: s
         if online_only:
             filters['online_only'] = True
         LOGGER.info(f"Fetching P2P data: {asset}/{pay_type} - {trade_type} - {pay_method}")
-        sellers = await fetch_all_sellers_async(asset, pay_type, trade_type, api_pay_method, limit)
+        if stream:
+            key, pages, book = ORDER_BOOKS.peek(asset, pay_type, trade_type, api_pay_method, limit)
+            parameters = {
+                "asset": asset,
+                "pay_type": pay_type,
+                "pay_method": pay_method,
+                "trade_type": trade_type,
+                "limit": limit,
+                "sort_by": sort_by,
+                "order": order,
+                "filters_applied": filters
+            }
+            return StreamingResponse(
+                stream_sellers(key, pages, book, limit, filters, sort_by, order == 'desc', parameters, start_time),
+                media_type="application/x-ndjson"
+            )
+        sellers, data_age = await ORDER_BOOKS.get(asset, pay_type, trade_type, api_pay_method, limit)
         if not sellers:
             return JSONResponse(
                 content={
@@ -451,33 +754,20 @@ async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: s
                         "trade_type": trade_type
                     },
                     "timestamp": datetime.now().isoformat(),
+                    "data_age_ms": round(data_age * 1000),
                     "cache_status": "served"
                 }
             )
-        processed_sellers = process_sellers_data(sellers, filters)
-        reverse = order == 'desc'
-        sort_keys = {
-            'price': lambda x: x['price'],
-            'completion_rate': lambda x: x['completion_rate'],
-            'available_amount': lambda x: x['available_amount'],
-            'monthly_orders': lambda x: x['monthly_orders']
-        }
-        if sort_by in sort_keys:
-            processed_sellers.sort(key=sort_keys[sort_by], reverse=reverse)
-        limited_sellers = processed_sellers[:limit]
-        stats = {
-            "avg_price": round(sum(s['price'] for s in limited_sellers) / len(limited_sellers), 2) if limited_sellers else 0,
-            "min_price": min(s['price'] for s in limited_sellers) if limited_sellers else 0,
-            "max_price": max(s['price'] for s in limited_sellers) if limited_sellers else 0,
-            "total_available": sum(s['available_amount'] for s in limited_sellers)
-        }
+        selected = sellers.select(filters, sort_by, order == 'desc', limit)
+        limited_sellers = sellers.rows(selected)
+        stats = sellers.stats(selected)
         return JSONResponse(
             content={
                 "success": True,
                 "data": limited_sellers,
                 "count": len(limited_sellers),
-                "total_found": len(processed_sellers),
-                "total_sellers": len(processed_sellers),
+                "total_found": len(selected),
+                "total_sellers": len(selected),
                 "time_taken": round(time.time() - start_time, 3),
                 "trade_type": trade_type,
                 "api_owner": "@ISmartCoder",
@@ -494,6 +784,7 @@ async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: s
                     "filters_applied": filters
                 },
                 "timestamp": datetime.now().isoformat(),
+                "data_age_ms": round(data_age * 1000),
                 "cache_status": "served"
             }
         )
@@ -518,6 +809,103 @@ async def get_p2p_data(asset: str = "USDT", pay_type: str = "BDT", pay_method: s
             }
         )
 
+async def market_spread(asset, fiat, pay_method, limit, band_pct):
+    api_pay_method = PAYMENT_METHODS[fiat].get(pay_method) if pay_method != 'ALL' else None
+    (asks, ask_age), (bids, bid_age) = await asyncio.gather(
+        ORDER_BOOKS.get(asset, fiat, "BUY", api_pay_method, limit),
+        ORDER_BOOKS.get(asset, fiat, "SELL", api_pay_method, limit)
+    )
+    ask = asks.depth(limit, True, band_pct)
+    bid = bids.depth(limit, False, band_pct)
+    result = {
+        "asset": asset,
+        "fiat": fiat,
+        "pay_method": pay_method,
+        "best_ask": ask["best_price"],
+        "best_bid": bid["best_price"],
+        "spread": None,
+        "spread_pct": None,
+        "mid_price": None,
+        "ask_depth": ask,
+        "bid_depth": bid,
+        "data_age_ms": round(max(ask_age, bid_age) * 1000)
+    }
+    if ask["best_price"] is not None and bid["best_price"] is not None:
+        mid = (ask["best_price"] + bid["best_price"]) / 2
+        result["spread"] = round(ask["best_price"] - bid["best_price"], 6)
+        result["spread_pct"] = round(result["spread"] / mid * 100, 4) if mid else None
+        result["mid_price"] = round(mid, 6)
+    return result
+
+@router.get("/spread")
+async def get_p2p_spread(assets: str = "USDT", fiats: str = "BDT", pay_method: str = "ALL", limit: int = 100, band_pct: float = 1.0):
+    start_time = time.time()
+    asset_list = list(dict.fromkeys(a.strip().upper() for a in assets.split(",") if a.strip()))
+    fiat_list = list(dict.fromkeys(f.strip().upper() for f in fiats.split(",") if f.strip()))
+    pay_method = pay_method.strip().upper()
+    error = None
+    if not asset_list or not fiat_list:
+        error = "assets and fiats must each list at least one value"
+    elif len(asset_list) * len(fiat_list) > MAX_SPREAD_MARKETS:
+        error = f"Too many markets requested. Maximum is {MAX_SPREAD_MARKETS} asset/fiat pairs."
+    elif not 1 <= limit <= 1000:
+        error = "limit must be between 1 and 1000"
+    else:
+        for asset in asset_list:
+            for fiat in fiat_list:
+                error = error or validate_market(asset, fiat, pay_method)
+    if error:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": error,
+                "api_owner": "@ISmartCoder",
+                "api_updates": "t.me/abirxdhackz"
+            }
+        )
+    markets = [(asset, fiat) for asset in asset_list for fiat in fiat_list]
+    results = await asyncio.gather(
+        *(market_spread(asset, fiat, pay_method, limit, band_pct) for asset, fiat in markets),
+        return_exceptions=True
+    )
+    data = []
+    for (asset, fiat), result in zip(markets, results):
+        if isinstance(result, Exception):
+            LOGGER.error(f"Error computing spread for {asset}/{fiat}: {result}")
+            data.append({"asset": asset, "fiat": fiat, "error": "Failed to fetch order books"})
+        else:
+            data.append(result)
+    return JSONResponse(
+        content={
+            "success": any("error" not in d for d in data),
+            "data": data,
+            "count": len(data),
+            "time_taken": round(time.time() - start_time, 3),
+            "parameters": {
+                "assets": asset_list,
+                "fiats": fiat_list,
+                "pay_method": pay_method,
+                "limit": limit,
+                "band_pct": band_pct
+            },
+            "timestamp": datetime.now().isoformat(),
+            "api_owner": "@ISmartCoder",
+            "api_updates": "t.me/abirxdhackz"
+        }
+    )
+
+@router.get("/books")
+async def get_order_books():
+    return JSONResponse(
+        content={
+            "success": True,
+            "data": ORDER_BOOKS.stats(),
+            "timestamp": datetime.now().isoformat(),
+            "api_owner": "@ISmartCoder",
+            "api_updates": "t.me/abirxdhackz"
+        }
+    )
+
 @router.get("/methods")
 async def get_payment_methods():
     return JSONResponse(
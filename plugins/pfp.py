@@ -6,7 +6,7 @@ import re
 import time
 from datetime import datetime
 from urllib.parse import urlparse
-from utils import LOGGER
+from utils import LOGGER, run_blocking
 
 router = APIRouter(prefix="/pfp")
 
@@ -353,7 +353,7 @@ async def get_all_images(url: str = None):
     
     try:
         scraper = FacebookProfileScraper()
-        result = scraper.scrape_profile(profile_url)
+        result = await run_blocking("pfp", scraper.scrape_profile, profile_url)
         
         if result:
             response_data = {
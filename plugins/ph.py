@@ -8,7 +8,7 @@ from io import BytesIO
 import random
 import base64  
 from pydantic import BaseModel
-from utils import LOGGER
+from utils import LOGGER, get_session
 
 router = APIRouter(prefix="/ph")
 UPSCALE_API_URL = "https://api.upscalepics.com/upscale-to-size"
@@ -35,19 +35,19 @@ async def upscale_image(image_base64: str, width: int, height: int):
             "Referer": "https://upscalepics.com/",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(UPSCALE_API_URL, data=form_data, headers=headers) as response:
-                if response.status == 200:
-                    json_response = await response.json()
-                    image_url = json_response.get("bgRemoved", "").strip()
-                    if image_url and image_url.startswith("http"):
-                        async with session.get(image_url) as img_response:
-                            if img_response.status == 200:
-                                img_bytes = await img_response.read()
-                                return base64.b64encode(img_bytes).decode("utf-8"), None
-                    return None, "No valid image URL returned"
-                else:
-                    return None, f"API request failed with status {response.status}"
+        session = get_session("imgai")
+        async with session.post(UPSCALE_API_URL, data=form_data, headers=headers) as response:
+            if response.status == 200:
+                json_response = await response.json()
+                image_url = json_response.get("bgRemoved", "").strip()
+                if image_url and image_url.startswith("http"):
+                    async with session.get(image_url) as img_response:
+                        if img_response.status == 200:
+                            img_bytes = await img_response.read()
+                            return base64.b64encode(img_bytes).decode("utf-8"), None
+                return None, "No valid image URL returned"
+            else:
+                return None, f"API request failed with status {response.status}"
     except Exception as e:
         LOGGER.error(f"Upscale error: {str(e)}")
         return None, f"Upscale error: {str(e)}"
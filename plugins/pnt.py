@@ -7,7 +7,7 @@ from bs4 import BeautifulSoup
 import urllib.parse
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from utils import LOGGER
+from utils import LOGGER, run_blocking
 
 router = APIRouter(prefix="/pnt")
 
@@ -43,7 +43,7 @@ async def download_pinterest_media(url: str = ""):
     }
     
     try:
-        response = session.get(base_url, params=params, headers=headers, timeout=15)
+        response = await run_blocking("pnt", session.get, base_url, params=params, headers=headers, timeout=15)
         response.raise_for_status()
         
         content_type = response.headers.get('content-type', '').lower()
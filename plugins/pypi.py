@@ -3,11 +3,13 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import requests
-from utils import LOGGER
+from utils import LOGGER, run_blocking, cached
 
 router = APIRouter(prefix="/pypi")
+CACHE_TTL = 600
 
 @router.get("")
+@cached(CACHE_TTL, ignore_case=("query",))
 async def get_pypi_info(query: str = ""):
     if not query:
         return JSONResponse(
@@ -20,7 +22,7 @@ async def get_pypi_info(query: str = ""):
         )
     
     try:
-        response = requests.get(f"https://pypi.org/pypi/{query}/json")
+        response = await run_blocking("pypi", requests.get, f"https://pypi.org/pypi/{query}/json", timeout=10)
         if response.status_code != 200:
             LOGGER.error(f"PyPI API returned status {response.status_code} for package {query}")
             return JSONResponse(
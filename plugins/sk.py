@@ -1,7 +1,6 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-import aiohttp
-from utils import LOGGER
+from utils import LOGGER, get_session
 import pytz
 import pycountry
 from datetime import datetime
@@ -13,9 +12,9 @@ BALANCE_URL = "https://api.stripe.com/v1/balance"
 async def verify_stripe_key(stripe_key: str):
     headers = {"Authorization": f"Bearer {stripe_key}"}
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(STRIPE_URL, timeout=10) as response:
-                return response.status == 200
+        session = get_session("default")
+        async with session.get(STRIPE_URL, headers=headers, timeout=10) as response:
+            return response.status == 200
     except Exception as e:
         LOGGER.error(f"Error verifying Stripe key: {str(e)}")
         return False
@@ -23,46 +22,45 @@ async def verify_stripe_key(stripe_key: str):
 async def get_stripe_key_info(stripe_key: str):
     headers = {"Authorization": f"Bearer {stripe_key}"}
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(STRIPE_URL, timeout=10) as response:
-                if response.status != 200:
-                    return None
-                data = await response.json()
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.get(BALANCE_URL, timeout=10) as balance_response:
-                    balance_data = await balance_response.json() if balance_response.status == 200 else {}
-            available_balance = balance_data.get("available", [{}])[0].get("amount", 0) / 100 if balance_data else 0
-            pending_balance = balance_data.get("pending", [{}])[0].get("amount", 0) / 100 if balance_data else 0
-            currency = balance_data.get("available", [{}])[0].get("currency", "N/A").upper() if balance_data else "N/A"
-            capabilities = data.get("capabilities", {})
-            pk_live = stripe_key.replace("sk_live_", "pk_live_") if stripe_key.startswith("sk_live_") else "N/A"
-            return {
-                "account_info": {
-                    "status": "✅ Live" if data.get("charges_enabled") else "❌ Restricted",
-                    "account_id": data.get("id", "N/A"),
-                    "business_name": data.get("business_profile", {}).get("name", "N/A"),
-                    "email": data.get("email", "N/A"),
-                    "phone": data.get("business_profile", {}).get("support_phone", "N/A"),
-                    "website": data.get("business_profile", {}).get("url", "N/A"),
-                    "country": data.get("country", "N/A"),
-                    "currency": data.get("default_currency", "N/A").upper(),
-                    "business_type": data.get("business_type", "N/A").capitalize(),
-                    "charges_enabled": "✅ Yes" if data.get("charges_enabled") else "❌ No",
-                    "payouts_enabled": "✅ Yes" if data.get("payouts_enabled") else "❌ No",
-                    "account_type": data.get("type", "N/A").capitalize(),
-                    "pk_live": pk_live
-                },
-                "capabilities": {
-                    "card_payments": "✅ Enabled" if capabilities.get("card_payments") == "active" else "❌ Disabled",
-                    "india_intl_payments": "✅ Enabled" if capabilities.get("india_international_payments") == "active" else "❌ Disabled",
-                    "transfers": "✅ Enabled" if capabilities.get("transfers") == "active" else "❌ Disabled"
-                },
-                "balance": {
-                    "available": f"{available_balance} {currency}",
-                    "pending": f"{pending_balance} {currency}",
-                    "live_mode": "✅ Yes" if balance_data.get("livemode") else "❌ No"
-                }
+        session = get_session("default")
+        async with session.get(STRIPE_URL, headers=headers, timeout=10) as response:
+            if response.status != 200:
+                return None
+            data = await response.json()
+        async with session.get(BALANCE_URL, headers=headers, timeout=10) as balance_response:
+            balance_data = await balance_response.json() if balance_response.status == 200 else {}
+        available_balance = balance_data.get("available", [{}])[0].get("amount", 0) / 100 if balance_data else 0
+        pending_balance = balance_data.get("pending", [{}])[0].get("amount", 0) / 100 if balance_data else 0
+        currency = balance_data.get("available", [{}])[0].get("currency", "N/A").upper() if balance_data else "N/A"
+        capabilities = data.get("capabilities", {})
+        pk_live = stripe_key.replace("sk_live_", "pk_live_") if stripe_key.startswith("sk_live_") else "N/A"
+        return {
+            "account_info": {
+                "status": "✅ Live" if data.get("charges_enabled") else "❌ Restricted",
+                "account_id": data.get("id", "N/A"),
+                "business_name": data.get("business_profile", {}).get("name", "N/A"),
+                "email": data.get("email", "N/A"),
+                "phone": data.get("business_profile", {}).get("support_phone", "N/A"),
+                "website": data.get("business_profile", {}).get("url", "N/A"),
+                "country": data.get("country", "N/A"),
+                "currency": data.get("default_currency", "N/A").upper(),
+                "business_type": data.get("business_type", "N/A").capitalize(),
+                "charges_enabled": "✅ Yes" if data.get("charges_enabled") else "❌ No",
+                "payouts_enabled": "✅ Yes" if data.get("payouts_enabled") else "❌ No",
+                "account_type": data.get("type", "N/A").capitalize(),
+                "pk_live": pk_live
+            },
+            "capabilities": {
+                "card_payments": "✅ Enabled" if capabilities.get("card_payments") == "active" else "❌ Disabled",
+                "india_intl_payments": "✅ Enabled" if capabilities.get("india_international_payments") == "active" else "❌ Disabled",
+                "transfers": "✅ Enabled" if capabilities.get("transfers") == "active" else "❌ Disabled"
+            },
+            "balance": {
+                "available": f"{available_balance} {currency}",
+                "pending": f"{pending_balance} {currency}",
+                "live_mode": "✅ Yes" if balance_data.get("livemode") else "❌ No"
             }
+        }
     except Exception as e:
         LOGGER.error(f"Error fetching Stripe key info: {str(e)}")
         return None
@@ -4,7 +4,7 @@ import requests
 import re
 import base64
 from config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET
-from utils import LOGGER
+from utils import LOGGER, run_blocking
 from urllib.parse import quote
 
 router = APIRouter(prefix="/sp")
@@ -22,7 +22,7 @@ def get_spotify_token():
     }
     data = {'grant_type': 'client_credentials'}
     try:
-        response = requests.post(SPOTIFY_AUTH_URL, headers=headers, data=data)
+        response = requests.post(SPOTIFY_AUTH_URL, headers=headers, data=data, timeout=15)
         response.raise_for_status()
         return response.json()['access_token']
     except requests.exceptions.RequestException as e:
@@ -48,7 +48,7 @@ def get_track_metadata(track_id):
     token = get_spotify_token()
     headers = {'Authorization': f'Bearer {token}'}
     try:
-        response = requests.get(f"{SPOTIFY_API_BASE}/tracks/{track_id}", headers=headers)
+        response = requests.get(f"{SPOTIFY_API_BASE}/tracks/{track_id}", headers=headers, timeout=15)
         response.raise_for_status()
         track = response.json()
         return {
@@ -75,11 +75,11 @@ async def download(url: str = Query(..., description="Spotify track URL")):
         validated_url = validate_spotify_url(url)
         track_id = extract_track_id(validated_url)
         LOGGER.info(f"Processing track ID: {track_id}")
-        track_data = get_track_metadata(track_id)
+        track_data = await run_blocking("sp", get_track_metadata, track_id)
         LOGGER.info(f"Retrieved metadata for track: {track_data['title']}")
         check_endpoint = f"https://spotmp3.app/api/check-direct-download?url={quote(validated_url)}"
         LOGGER.info(f"Checking download availability: {check_endpoint}")
-        check_response = requests.get(check_endpoint)
+        check_response = await run_blocking("sp", requests.get, check_endpoint, timeout=15)
         check_response.raise_for_status()
         check_result = check_response.json()
         LOGGER.info(f"Download check result: {check_result}")
@@ -113,10 +113,10 @@ async def search(q: str = Query(..., description="Search query for Spotify track
         LOGGER.error('Search query missing')
         raise HTTPException(status_code=400, detail={'status': 'error', 'message': 'Query required', 'example': '/sp/search?q=Song+Name', 'api_owner': '@ISmartCoder', 'api_updates': 't.me/TheSmartDev'})
     try:
-        token = get_spotify_token()
+        token = await run_blocking("sp", get_spotify_token)
         headers = {'Authorization': f'Bearer {token}'}
         params = {'q': q, 'type': 'track', 'limit': 5}
-        response = requests.get(f"{SPOTIFY_API_BASE}/search", headers=headers, params=params)
+        response = await run_blocking("sp", requests.get, f"{SPOTIFY_API_BASE}/search", headers=headers, params=params, timeout=15)
         response.raise_for_status()
         tracks = response.json()['tracks']['items']
         if not tracks:
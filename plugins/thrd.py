@@ -7,6 +7,7 @@ import time
 import traceback
 from collections import OrderedDict
 from io import BytesIO
+from utils import run_blocking
 
 try:
     import zstandard as zstd
@@ -320,7 +321,7 @@ def get_twitter_info(url: str):
 @router.get("/thd")
 async def threads_dl(url: str = Query(...)):
     start = time.time()
-    data = get_threads_info(url)
+    data = await run_blocking("thrd", get_threads_info, url)
     if not data or "error" in data:
         return JSONResponse(status_code=404, content={"error": "Failed to fetch Threads data"})
     res = OrderedDict()
@@ -335,7 +336,7 @@ async def threads_dl(url: str = Query(...)):
 @router.get("/twit")
 async def twitter_dl(url: str = Query(...)):
     start = time.time()
-    data = get_twitter_info(url)
+    data = await run_blocking("thrd", get_twitter_info, url)
     if not data or "error" in data:
         return JSONResponse(status_code=404, content={"error": "Failed to fetch Twitter data"})
     res = OrderedDict()
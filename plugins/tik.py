@@ -7,7 +7,7 @@ import re
 import base64
 import json
 from urllib.parse import parse_qs, urlparse
-from utils import LOGGER
+from utils import LOGGER, get_session
 
 router = APIRouter(prefix="/tik")
 API_URL = "https://tikdownloader.io/api/ajaxSearch"
@@ -35,18 +35,18 @@ def sanitize_filename(filename):
 async def fetch_tiktok_data(url: str):
     payload = {"q": url, "lang": "en"}
     try:
-        async with aiohttp.ClientSession(headers=HEADERS) as session:
-            async with session.post(API_URL, data=payload, timeout=10) as response:
-                response.raise_for_status()
-                data = await response.json()
-                if data.get("status") != "ok":
-                    LOGGER.error("API returned invalid status")
-                    return None, "API returned invalid status"
-                html_content = data.get("data", "")
-                if not html_content:
-                    LOGGER.error("No data found in API response")
-                    return None, "No data found in API response"
-                return html_content, None
+        session = get_session("media")
+        async with session.post(API_URL, data=payload, headers=HEADERS, timeout=10) as response:
+            response.raise_for_status()
+            data = await response.json()
+            if data.get("status") != "ok":
+                LOGGER.error("API returned invalid status")
+                return None, "API returned invalid status"
+            html_content = data.get("data", "")
+            if not html_content:
+                LOGGER.error("No data found in API response")
+                return None, "No data found in API response"
+            return html_content, None
     except aiohttp.ClientConnectionError as e:
         LOGGER.error(f"Connection error: {str(e)}")
         return None, f"Connection error: {str(e)}"
@@ -2,13 +2,12 @@
 #Updates Channel @TheSmartDev 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-import aiohttp
 import random
 import string
 import hashlib
 import time
 from bs4 import BeautifulSoup
-from utils import LOGGER
+from utils import LOGGER, get_session
 
 router = APIRouter(prefix="/tmail")
 BASE_URL = "https://api.mail.tm"
@@ -31,15 +30,15 @@ def short_id_generator(email):
 
 async def get_domain():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{BASE_URL}/domains", headers=HEADERS, timeout=10) as response:
-                response.raise_for_status()
-                data = await response.json()
-                if isinstance(data, list) and data:
-                    return data[0]['domain']
-                elif 'hydra:member' in data and data['hydra:member']:
-                    return data['hydra:member'][0]['domain']
-                return None
+        session = get_session("tmail")
+        async with session.get(f"{BASE_URL}/domains", headers=HEADERS) as response:
+            response.raise_for_status()
+            data = await response.json()
+            if isinstance(data, list) and data:
+                return data[0]['domain']
+            elif 'hydra:member' in data and data['hydra:member']:
+                return data['hydra:member'][0]['domain']
+            return None
     except Exception as e:
         LOGGER.error(f"Error fetching domain: {str(e)}")
         return None
@@ -50,12 +49,12 @@ async def create_account(email, password):
         "password": password
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{BASE_URL}/accounts", headers=HEADERS, json=data, timeout=10) as response:
-                if response.status in [200, 201]:
-                    return await response.json()
-                LOGGER.error(f"Error creating account: {response.status} - {await response.text()}")
-                return None
+        session = get_session("tmail")
+        async with session.post(f"{BASE_URL}/accounts", headers=HEADERS, json=data) as response:
+            if response.status in [200, 201]:
+                return await response.json()
+            LOGGER.error(f"Error creating account: {response.status} - {await response.text()}")
+            return None
     except Exception as e:
         LOGGER.error(f"Error in create_account: {str(e)}")
         return None
@@ -66,12 +65,12 @@ async def get_token(email, password):
         "password": password
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{BASE_URL}/token", headers=HEADERS, json=data, timeout=10) as response:
-                if response.status == 200:
-                    return (await response.json()).get('token')
-                LOGGER.error(f"Error fetching token: {response.status} - {await response.text()}")
-                return None
+        session = get_session("tmail")
+        async with session.post(f"{BASE_URL}/token", headers=HEADERS, json=data) as response:
+            if response.status == 200:
+                return (await response.json()).get('token')
+            LOGGER.error(f"Error fetching token: {response.status} - {await response.text()}")
+            return None
     except Exception as e:
         LOGGER.error(f"Error in get_token: {str(e)}")
         return None
@@ -83,14 +82,14 @@ async def list_messages(token):
         "Authorization": f"Bearer {token}"
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{BASE_URL}/messages", headers=headers, timeout=10) as response:
-                data = await response.json()
-                if isinstance(data, list):
-                    return data
-                elif 'hydra:member' in data:
-                    return data['hydra:member']
-                return []
+        session = get_session("tmail")
+        async with session.get(f"{BASE_URL}/messages", headers=headers) as response:
+            data = await response.json()
+            if isinstance(data, list):
+                return data
+            elif 'hydra:member' in data:
+                return data['hydra:member']
+            return []
     except Exception as e:
         LOGGER.error(f"Error in list_messages: {str(e)}")
         return []
@@ -102,12 +101,12 @@ async def get_message_details(token, message_id):
         "Authorization": f"Bearer {token}"
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{BASE_URL}/messages/{message_id}", headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    return await response.json()
-                LOGGER.error(f"Error fetching message details: {response.status} - {await response.text()}")
-                return None
+        session = get_session("tmail")
+        async with session.get(f"{BASE_URL}/messages/{message_id}", headers=headers) as response:
+            if response.status == 200:
+                return await response.json()
+            LOGGER.error(f"Error fetching message details: {response.status} - {await response.text()}")
+            return None
     except Exception as e:
         LOGGER.error(f"Error in get_message_details: {str(e)}")
         return None
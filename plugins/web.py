@@ -7,19 +7,381 @@ import zipfile
 import tempfile
 import time
 import uuid
-import shutil
+import hashlib
+import json
+import posixpath
+from collections import OrderedDict
 from urllib.parse import urljoin, urlparse, unquote
 from typing import Dict, Set
 import aiohttp
-import aiofiles
 from bs4 import BeautifulSoup
+from utils import LOGGER, METRICS, SHARED_STATE, SINGLE_FLIGHT, get_session, run_blocking, run_cpu
+from utils.metrics import metric_lines
 
 router = APIRouter(prefix="/web", tags=["Web Source Downloader"])
 
-STORE: Dict[str, Dict] = {}
+STORE_NAMESPACE = "web"
+STORE_TTL = 300
 BASE_DIR = "/tmp/websource_files"
+ARCHIVE_SIZE_LIMIT = 19 * 1024 * 1024
+STORED_EXTENSIONS = {
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'ico', 'woff', 'woff2',
+    'mp4', 'webm', 'mov', 'ogg', 'mp3', 'pdf', 'zip', 'gz', 'br'
+}
+ASSET_CACHE_DIR = os.getenv("WEB_ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "a360_web_assets"))
+ASSET_CACHE_MAX_BYTES = int(float(os.getenv("WEB_ASSET_CACHE_MAX_MB", 512)) * 1024 * 1024)
+ASSET_CACHE_FRESH = float(os.getenv("WEB_ASSET_CACHE_FRESH", 600))
+CACHE_MAX_AGE_PATTERN = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+CSS_OFFLOAD_BYTES = 64 * 1024
+CSS_MAX_DEPTH = int(os.getenv("WEB_CSS_MAX_DEPTH", 3))
+LINK_RESOURCE_RELS = ['icon', 'shortcut icon', 'apple-touch-icon', 'manifest', 'alternate', 'canonical', 'preload', 'prefetch']
+CSS_URL_PATTERN = re.compile(r'url\s*\(\s*["\']?([^"\'()]+)["\']?\s*\)', re.IGNORECASE)
+CSS_IMPORT_PATTERN = re.compile(r'@import\s+["\']([^"\']+)["\']', re.IGNORECASE)
+SCRIPT_URL_PATTERN = re.compile(r'["\']([^"\']*\.(js|css|png|jpg|jpeg|gif|svg|woff2?|ttf|eot|json|xml))["\']', re.IGNORECASE)
 os.makedirs(BASE_DIR, exist_ok=True)
 
+def cache_max_age(cache_control, default):
+    cache_control = (cache_control or "").lower()
+    if "no-cache" in cache_control:
+        return 0
+    match = CACHE_MAX_AGE_PATTERN.search(cache_control)
+    return int(match.group(1)) if match else default
+
+class AssetCache:
+    def __init__(self, directory=ASSET_CACHE_DIR, max_bytes=ASSET_CACHE_MAX_BYTES, fresh_seconds=ASSET_CACHE_FRESH):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.meta_dir = os.path.join(directory, "meta")
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.entries = OrderedDict()
+        self.refs = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self.bytes_fetched = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _meta_path(self, url):
+        return os.path.join(self.meta_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _scan(self):
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.meta_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.meta_dir):
+            path = os.path.join(self.meta_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if os.path.exists(self._blob_path(entry["digest"])):
+                entries.append(entry)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return sorted(entries, key=lambda entry: entry["checked"])
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            for entry in await run_blocking("web", self._scan):
+                orphan = self._index(entry)
+                if orphan is not None:
+                    await run_blocking("web", self._remove_blob, orphan)
+            self._loaded = True
+            LOGGER.info(f"Web asset cache loaded {len(self.entries)} entries ({self.total_bytes} bytes)")
+
+    def _index(self, entry):
+        previous = self.entries.pop(entry["url"], None)
+        self.entries[entry["url"]] = entry
+        if self.refs.get(entry["digest"], 0) == 0:
+            self.total_bytes += entry["size"]
+        self.refs[entry["digest"]] = self.refs.get(entry["digest"], 0) + 1
+        if previous is not None and self._release(previous["digest"], previous["size"]):
+            return previous["digest"]
+        return None
+
+    def _release(self, digest, size):
+        remaining = self.refs.get(digest, 0) - 1
+        if remaining > 0:
+            self.refs[digest] = remaining
+            return False
+        self.refs.pop(digest, None)
+        self.total_bytes -= size
+        return True
+
+    def _read_blob(self, digest):
+        try:
+            with open(self._blob_path(digest), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write_blob(self, digest, content, entry):
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.blob_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, blob_path)
+        self._write_meta(entry)
+
+    def _write_meta(self, entry):
+        fd, temp_path = tempfile.mkstemp(dir=self.meta_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        os.replace(temp_path, self._meta_path(entry["url"]))
+
+    def _remove(self, url, digest, remove_blob):
+        for path in [self._meta_path(url)] + ([self._blob_path(digest)] if remove_blob else []):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remove_blob(self, digest):
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+
+    async def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            url, entry = self.entries.popitem(last=False)
+            remove_blob = self._release(entry["digest"], entry["size"])
+            self.evictions += 1
+            await run_blocking("web", self._remove, url, entry["digest"], remove_blob)
+
+    async def _local(self, entry):
+        content = await run_blocking("web", self._read_blob, entry["digest"])
+        indexed = self.entries.get(entry["url"]) is entry
+        if content is None:
+            if indexed:
+                del self.entries[entry["url"]]
+                remove_blob = self._release(entry["digest"], entry["size"])
+                await run_blocking("web", self._remove, entry["url"], entry["digest"], remove_blob)
+            return None
+        if indexed:
+            self.entries.move_to_end(entry["url"])
+        self.bytes_served += len(content)
+        return content
+
+    def _is_fresh(self, entry):
+        return time.time() - entry["checked"] < entry.get("max_age", self.fresh_seconds)
+
+    async def _store(self, url, content, etag, last_modified, max_age):
+        digest = hashlib.sha256(content).hexdigest()
+        entry = {
+            "url": url,
+            "digest": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "max_age": max_age,
+            "size": len(content),
+            "checked": time.time()
+        }
+        await run_blocking("web", self._write_blob, digest, content, entry)
+        orphan = self._index(entry)
+        if orphan is not None:
+            await run_blocking("web", self._remove_blob, orphan)
+        await self._evict()
+
+    async def _download(self, url, headers, size_limit):
+        async with get_session("web").get(url, timeout=15, headers=headers, allow_redirects=True) as response:
+            cache_control = response.headers.get("Cache-Control", "")
+            max_age = cache_max_age(cache_control, self.fresh_seconds)
+            if response.status not in [200, 206]:
+                return response.status, None, max_age
+            content = await response.read()
+            if len(content) > size_limit or len(content) == 0:
+                return response.status, None, max_age
+            self.misses += 1
+            self.bytes_fetched += len(content)
+            if response.status == 200 and "no-store" not in cache_control.lower():
+                await self._store(url, content, response.headers.get("ETag"), response.headers.get("Last-Modified"), max_age)
+            return response.status, content, max_age
+
+    async def _fetch(self, url, headers, size_limit):
+        await self._ensure_loaded()
+        entry = self.entries.get(url)
+        if entry is not None and self._is_fresh(entry):
+            content = await self._local(entry)
+            if content is not None:
+                self.hits += 1
+                return content
+            entry = None
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        status, content, max_age = await self._download(url, request_headers, size_limit)
+        if status == 304 and entry is not None:
+            content = await self._local(entry)
+            if content is not None:
+                entry["checked"] = time.time()
+                entry["max_age"] = max_age
+                self.revalidated += 1
+                await run_blocking("web", self._write_meta, entry)
+                return content
+            _, content, _ = await self._download(url, headers, size_limit)
+        return content
+
+    async def fetch(self, url, headers, size_limit):
+        _, content = await SINGLE_FLIGHT.do(f"web-asset:{url}", lambda: self._fetch(url, headers, size_limit))
+        return content
+
+    def stats(self):
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "directory": self.directory,
+            "entries": len(self.entries),
+            "blobs": len(self.refs),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "fresh_seconds": self.fresh_seconds,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "bytes_served": self.bytes_served,
+            "bytes_fetched": self.bytes_fetched
+        }
+
+ASSET_CACHE = AssetCache()
+
+def collect_asset_cache_metrics():
+    stats = ASSET_CACHE.stats()
+    lines = []
+    lines += metric_lines("a360_web_asset_cache_requests_total", "Web source asset lookups by result", "counter", [
+        ({"result": "hit"}, stats["hits"]),
+        ({"result": "revalidated"}, stats["revalidated"]),
+        ({"result": "miss"}, stats["misses"])
+    ])
+    lines += metric_lines("a360_web_asset_cache_bytes", "Bytes held in the web source asset cache", "gauge", [({}, stats["bytes"])])
+    lines += metric_lines("a360_web_asset_cache_evictions_total", "Web source asset cache LRU evictions", "counter", [({}, stats["evictions"])])
+    return lines
+
+METRICS.add_collector(collect_asset_cache_metrics)
+
+def parse_html(content):
+    try:
+        return BeautifulSoup(content, features="lxml")
+    except:
+        return BeautifulSoup(content, features="html.parser")
+
+def render_page(content, url, imgFlg, linkFlg, scriptFlg):
+    downloader = UrlDownloader(imgFlg, linkFlg, scriptFlg)
+    downloader.soup = parse_html(content)
+    resource_urls = [u for u in downloader._collect_resources(url) if u and downloader._is_valid_url(u)]
+    downloader._update_html_paths()
+    return resource_urls, downloader.soup.prettify('utf-8')
+
+def css_references(content):
+    text = content.decode('utf-8', errors='ignore')
+    references = [url.strip('\'"').strip() for url in CSS_URL_PATTERN.findall(text)]
+    references += [url.strip() for url in CSS_IMPORT_PATTERN.findall(text)]
+    return [url for url in references if not url.startswith(('data:', 'blob:', 'javascript:', '#'))]
+
+def rewrite_css(content, base_url, css_path, local_paths):
+    css_folder = posixpath.dirname(css_path) or '.'
+
+    def localize(reference):
+        absolute = urljoin(base_url, reference)
+        local_path = local_paths.get(absolute)
+        if local_path:
+            return posixpath.relpath(local_path, css_folder)
+        return absolute
+
+    def replace_url(match):
+        url = match.group(1).strip('\'"').strip()
+        if url.startswith(('data:', 'blob:', 'javascript:', '#')):
+            return match.group(0)
+        return f'url("{localize(url)}")'
+
+    def replace_import(match):
+        return f'@import "{localize(match.group(1).strip())}"'
+
+    text = CSS_URL_PATTERN.sub(replace_url, content.decode('utf-8', errors='ignore'))
+    text = CSS_IMPORT_PATTERN.sub(replace_import, text)
+    return text.encode('utf-8')
+
+class ArchiveWriter:
+    def __init__(self, directory=BASE_DIR, size_limit=ARCHIVE_SIZE_LIMIT):
+        fd, self.path = tempfile.mkstemp(suffix='.zip', dir=directory)
+        os.close(fd)
+        self.size_limit = size_limit
+        self.zip_file = zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6)
+        self.names: Set[str] = set()
+        self.file_count = 0
+        self.total_size = 0
+        self.stored = 0
+        self._lock = asyncio.Lock()
+
+    def reserve(self, arc_name):
+        name, ext = os.path.splitext(arc_name)
+        candidate = arc_name
+        counter = 1
+        while candidate in self.names:
+            candidate = f"{name}_{counter}{ext}"
+            counter += 1
+        self.names.add(candidate)
+        return candidate
+
+    def _write(self, arc_name, content):
+        ext = arc_name.rsplit('.', 1)[-1].lower() if '.' in arc_name else ''
+        info = zipfile.ZipInfo(arc_name, date_time=time.localtime()[:6])
+        if ext in STORED_EXTENSIONS:
+            info.compress_type = zipfile.ZIP_STORED
+            self.stored += 1
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        self.zip_file.writestr(info, content, compresslevel=6)
+
+    async def add(self, arc_name, content):
+        async with self._lock:
+            if self.total_size + len(content) > self.size_limit:
+                return False
+            self.total_size += len(content)
+            await run_blocking("web", self._write, arc_name, content)
+            self.file_count += 1
+            return True
+
+    async def close(self):
+        async with self._lock:
+            await run_blocking("web", self.zip_file.close)
+        if self.file_count == 0:
+            self.discard()
+            return None
+        return self.path
+
+    def discard(self):
+        try:
+            self.zip_file.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
 class UrlDownloader:
     def __init__(self, imgFlg=True, linkFlg=True, scriptFlg=True):
         self.soup = None
@@ -40,8 +402,17 @@ class UrlDownloader:
         self.semaphore = asyncio.Semaphore(25)
         self.downloaded_files: Set[str] = set()
         self.failed_urls: Set[str] = set()
+        self.css_max_depth = CSS_MAX_DEPTH
+        self.css_assets = 0
+        self.pending: Set[asyncio.Task] = set()
+        self.file_paths = []
+        self.saved: Dict[str, str] = {}
+        self.stylesheets = []
+        self.archive = None
+        self.rewrites = []
+        self._joined: Dict[tuple, str] = {}
 
-    async def savePage(self, url, pagefolder='page', session=None):
+    async def savePage(self, url, archive, session=None):
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -60,35 +431,19 @@ class UrlDownloader:
                 content_type = response.headers.get('content-type', '').lower()
                 if not any(ct in content_type for ct in ['text/html', 'application/xhtml', 'text/xml']):
                     return False, f"Invalid content type: {content_type}", []
-                try:
-                    self.soup = BeautifulSoup(content, features="lxml")
-                except:
-                    try:
-                        self.soup = BeautifulSoup(content, features="html.parser")
-                    except Exception as e:
-                        return False, f"Failed to parse HTML: {str(e)}", []
-            os.makedirs(pagefolder, exist_ok=True)
+            try:
+                all_resource_urls, html_content = await run_cpu(
+                    "web", render_page, content, url, self.imgFlg, self.linkFlg, self.scriptFlg
+                )
+            except Exception as e:
+                return False, f"Failed to parse HTML: {str(e)}", []
+            self.archive = archive
             file_paths = []
-            all_resource_urls = set()
-            if self.linkFlg:
-                all_resource_urls.update(self._extract_css_resources(url))
-            if self.scriptFlg:
-                all_resource_urls.update(self._extract_js_resources(url))
-            if self.imgFlg:
-                all_resource_urls.update(self._extract_image_resources(url))
-            all_resource_urls.update(self._extract_other_resources(url))
-            all_resource_urls.update(self._extract_inline_urls(str(self.soup), url))
-            all_resource_urls.update(self._extract_meta_resources(url))
-            all_resource_urls = [u for u in all_resource_urls if u and self._is_valid_url(u)]
             if all_resource_urls:
-                downloaded_resources = await self._download_all_resources(list(all_resource_urls), pagefolder, session)
+                downloaded_resources = await self._download_all_resources(all_resource_urls)
                 file_paths.extend(downloaded_resources)
-            await self._update_html_paths(url, pagefolder)
-            html_path = os.path.join(pagefolder, 'index.html')
-            html_content = self.soup.prettify('utf-8')
-            async with aiofiles.open(html_path, 'wb') as file:
-                await file.write(html_content)
-            file_paths.append(html_path)
+            await archive.add(archive.reserve('index.html'), html_content)
+            file_paths.append('index.html')
             return True, None, file_paths
         except asyncio.TimeoutError:
             return False, "Request timed out", []
@@ -100,80 +455,76 @@ class UrlDownloader:
             return False
         return not url.startswith(('data:', 'blob:', 'javascript:', 'mailto:', 'tel:', '#', 'about:'))
 
-    def _extract_css_resources(self, base_url):
-        urls = set()
-        if self.soup is None:
-            return urls
-        for link in self.soup.find_all('link', href=True):
-            rel = link.get('rel', [])
-            if isinstance(rel, str):
-                rel = [rel]
-            if 'stylesheet' in rel or link.get('type') == 'text/css':
-                href = link.get('href')
-                if href:
-                    urls.add(urljoin(base_url, href.strip()))
-        for style in self.soup.find_all('style'):
-            if style.string:
-                urls.update(self._extract_css_urls(style.string, base_url))
-        return urls
-
-    def _extract_js_resources(self, base_url):
-        urls = set()
-        if self.soup is None:
-            return urls
-        for script in self.soup.find_all('script', src=True):
-            src = script.get('src')
-            if src:
-                urls.add(urljoin(base_url, src.strip()))
-        return urls
-
-    def _extract_image_resources(self, base_url):
-        urls = set()
-        if self.soup is None:
-            return urls
-        for img in self.soup.find_all('img'):
-            if img.get('src'):
-                urls.add(urljoin(base_url, img.get('src').strip()))
-            if img.get('data-src'):
-                urls.add(urljoin(base_url, img.get('data-src').strip()))
-            if img.get('srcset'):
-                urls.update(self._parse_srcset(img.get('srcset'), base_url))
-        for source in self.soup.find_all('source'):
-            if source.get('src'):
-                urls.add(urljoin(base_url, source.get('src').strip()))
-            if source.get('srcset'):
-                urls.update(self._parse_srcset(source.get('srcset'), base_url))
-        return urls
+    def _absolute(self, base_url, reference):
+        key = (base_url, reference)
+        absolute = self._joined.get(key)
+        if absolute is None:
+            absolute = self._joined[key] = urljoin(base_url, reference)
+        return absolute
 
-    def _extract_other_resources(self, base_url):
+    def _collect_resources(self, base_url):
         urls = set()
+        self.rewrites = []
         if self.soup is None:
             return urls
-        for link in self.soup.find_all('link', href=True):
-            rel = link.get('rel', [])
-            if isinstance(rel, str):
-                rel = [rel]
-            if any(r in rel for r in ['icon', 'shortcut icon', 'apple-touch-icon', 'manifest', 'alternate', 'canonical', 'preload', 'prefetch']):
-                href = link.get('href')
+        for tag in self.soup.find_all(True):
+            name = tag.name
+            if name == 'link':
+                href = tag.get('href')
                 if href:
-                    urls.add(urljoin(base_url, href.strip()))
-        for tag in self.soup.find_all(['audio', 'video', 'embed'], src=True):
-            urls.add(urljoin(base_url, tag.get('src').strip()))
-        for obj in self.soup.find_all('object', data=True):
-            urls.add(urljoin(base_url, obj.get('data').strip()))
-        return urls
-
-    def _extract_meta_resources(self, base_url):
-        urls = set()
-        if self.soup is None:
-            return urls
-        for meta in self.soup.find_all('meta'):
-            content = meta.get('content', '')
-            if content and (content.startswith(('http://', 'https://', '/')) or '.' in content):
+                    absolute = self._absolute(base_url, href.strip())
+                    self.rewrites.append((tag, 'href', absolute))
+                    rel = tag.get('rel', [])
+                    if isinstance(rel, str):
+                        rel = [rel]
+                    is_css = 'stylesheet' in rel or tag.get('type') == 'text/css'
+                    if (is_css and self.linkFlg) or any(r in rel for r in LINK_RESOURCE_RELS):
+                        urls.add(absolute)
+            elif name == 'script':
+                src = tag.get('src')
+                if src:
+                    absolute = self._absolute(base_url, src.strip())
+                    self.rewrites.append((tag, 'src', absolute))
+                    if self.scriptFlg:
+                        urls.add(absolute)
+                if tag.string:
+                    urls.update(self._extract_script_urls(tag.string, base_url))
+            elif name == 'style':
+                if tag.string:
+                    urls.update(self._extract_css_urls(tag.string, base_url))
+            elif name == 'img':
+                src = tag.get('src')
+                if src:
+                    absolute = self._absolute(base_url, src.strip())
+                    self.rewrites.append((tag, 'src', absolute))
+                    if self.imgFlg:
+                        urls.add(absolute)
+                if self.imgFlg:
+                    if tag.get('data-src'):
+                        urls.add(self._absolute(base_url, tag.get('data-src').strip()))
+                    if tag.get('srcset'):
+                        urls.update(self._parse_srcset(tag.get('srcset'), base_url))
+            elif name == 'source':
+                if self.imgFlg:
+                    if tag.get('src'):
+                        urls.add(self._absolute(base_url, tag.get('src').strip()))
+                    if tag.get('srcset'):
+                        urls.update(self._parse_srcset(tag.get('srcset'), base_url))
+            elif name in ('audio', 'video', 'embed'):
+                if tag.get('src'):
+                    urls.add(self._absolute(base_url, tag.get('src').strip()))
+            elif name == 'object':
+                if tag.get('data'):
+                    urls.add(self._absolute(base_url, tag.get('data').strip()))
+            elif name == 'meta':
+                content = tag.get('content', '')
                 if content.startswith('/'):
-                    urls.add(urljoin(base_url, content))
+                    urls.add(self._absolute(base_url, content))
                 elif content.startswith(('http://', 'https://')):
                     urls.add(content)
+            style = tag.get('style')
+            if style and 'url' in style:
+                urls.update(self._extract_css_urls(style, base_url))
         return urls
 
     def _parse_srcset(self, srcset, base_url):
@@ -185,52 +536,57 @@ class UrlDownloader:
             if entry:
                 parts = entry.split()
                 if parts:
-                    urls.add(urljoin(base_url, parts[0].strip()))
+                    urls.add(self._absolute(base_url, parts[0].strip()))
         return urls
 
     def _extract_css_urls(self, css_content, base_url):
         urls = set()
-        url_pattern = r'url\s*\(\s*["\']?([^"\'()]+)["\']?\s*\)'
-        for css_url in re.findall(url_pattern, css_content, re.IGNORECASE):
+        for css_url in CSS_URL_PATTERN.findall(css_content):
             if not css_url.startswith(('data:', 'blob:', 'javascript:')):
-                urls.add(urljoin(base_url, css_url.strip()))
-        import_pattern = r'@import\s+["\']([^"\']+)["\']'
-        for import_url in re.findall(import_pattern, css_content, re.IGNORECASE):
-            urls.add(urljoin(base_url, import_url.strip()))
+                urls.add(self._absolute(base_url, css_url.strip()))
+        for import_url in CSS_IMPORT_PATTERN.findall(css_content):
+            urls.add(self._absolute(base_url, import_url.strip()))
         return urls
 
-    def _extract_inline_urls(self, html_content, base_url):
+    def _extract_script_urls(self, script_content, base_url):
         urls = set()
-        style_blocks = re.findall(r'<style[^>]*>(.*?)</style>', html_content, re.DOTALL | re.IGNORECASE)
-        for style_block in style_blocks:
-            urls.update(self._extract_css_urls(style_block, base_url))
-        script_blocks = re.findall(r'<script[^>]*>(.*?)</script>', html_content, re.DOTALL | re.IGNORECASE)
-        for script_block in script_blocks:
-            js_urls = re.findall(r'["\']([^"\']*\.(js|css|png|jpg|jpeg|gif|svg|woff2?|ttf|eot|json|xml))["\']', script_block, re.IGNORECASE)
-            for js_url_match in js_urls:
-                js_url = js_url_match[0]
-                if js_url and not js_url.startswith(('data:', 'blob:', 'javascript:')):
-                    urls.add(urljoin(base_url, js_url.strip()))
+        for js_url, _ in SCRIPT_URL_PATTERN.findall(script_content):
+            if js_url and not js_url.startswith(('data:', 'blob:', 'javascript:')):
+                urls.add(self._absolute(base_url, js_url.strip()))
         return urls
 
-    async def _download_all_resources(self, resource_urls, pagefolder, session):
-        tasks = []
-        file_paths = []
+    def _schedule(self, resource_url, depth=0):
+        if resource_url in self.downloaded_files or resource_url in self.failed_urls:
+            return False
+        self.downloaded_files.add(resource_url)
+        file_path = self._get_resource_path(resource_url)
+        if not file_path:
+            return False
+        self.file_paths.append(file_path)
+        task = asyncio.ensure_future(self._download_single_resource(resource_url, file_path, depth))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return True
+
+    async def _download_all_resources(self, resource_urls):
         for resource_url in resource_urls:
-            if resource_url not in self.downloaded_files and resource_url not in self.failed_urls:
-                self.downloaded_files.add(resource_url)
-                file_path = self._get_resource_path(resource_url, pagefolder)
-                if file_path:
-                    file_paths.append(file_path)
-                    tasks.append(self._download_single_resource(resource_url, file_path, session))
-        if tasks:
-            batch_size = 25
-            for i in range(0, len(tasks), batch_size):
-                await asyncio.gather(*tasks[i:i+batch_size], return_exceptions=True)
-                await asyncio.sleep(0.2)
-        return file_paths
-
-    def _get_resource_path(self, resource_url, pagefolder):
+            self._schedule(resource_url)
+        while self.pending:
+            await asyncio.gather(*list(self.pending), return_exceptions=True)
+        local_paths = dict(self.saved)
+        local_paths.update((resource_url, file_path) for resource_url, file_path, _ in self.stylesheets)
+        for resource_url, file_path, content in self.stylesheets:
+            try:
+                if len(content) > CSS_OFFLOAD_BYTES:
+                    content = await run_cpu("web", rewrite_css, content, resource_url, file_path, local_paths)
+                else:
+                    content = rewrite_css(content, resource_url, file_path, local_paths)
+            except:
+                pass
+            await self._save(resource_url, file_path, content)
+        return self.file_paths
+
+    def _get_resource_path(self, resource_url):
         try:
             parsed_url = urlparse(resource_url)
             path = unquote(parsed_url.path)
@@ -257,20 +613,10 @@ class UrlDownloader:
             folder_name = self.extensions.get(file_ext, 'assets')
             if len(path_parts) > 1:
                 subfolder_path = '/'.join(path_parts[:-1])
-                target_folder = os.path.join(pagefolder, folder_name, subfolder_path)
+                arc_name = f"{folder_name}/{subfolder_path}/{filename}"
             else:
-                target_folder = os.path.join(pagefolder, folder_name)
-            os.makedirs(target_folder, exist_ok=True)
-            counter = 1
-            base_filename = filename
-            while True:
-                full_path = os.path.join(target_folder, filename)
-                if not os.path.exists(full_path):
-                    break
-                name, ext = os.path.splitext(base_filename)
-                filename = f"{name}_{counter}{ext}"
-                counter += 1
-            return full_path
+                arc_name = f"{folder_name}/{filename}"
+            return self.archive.reserve(arc_name)
         except:
             return None
 
@@ -294,7 +640,7 @@ class UrlDownloader:
             return 'xml'
         return None
 
-    async def _download_single_resource(self, resource_url, file_path, session):
+    async def _download_single_resource(self, resource_url, file_path, depth=0):
         async with self.semaphore:
             try:
                 headers = {
@@ -304,57 +650,44 @@ class UrlDownloader:
                     'Cache-Control': 'no-cache',
                     'Referer': resource_url
                 }
-                async with session.get(resource_url, timeout=15, headers=headers, allow_redirects=True) as response:
-                    if response.status not in [200, 206]:
-                        self.failed_urls.add(resource_url)
-                        return False
-                    content = await response.read()
-                    if len(content) > self.size_limit or len(content) == 0:
-                        self.failed_urls.add(resource_url)
-                        return False
-                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                    if file_path.endswith('.css'):
-                        try:
-                            decoded_content = content.decode('utf-8', errors='ignore')
-                            processed_content = await self._process_css_content(decoded_content, resource_url, session)
-                            content = processed_content.encode('utf-8')
-                        except:
-                            pass
-                    async with aiofiles.open(file_path, 'wb') as file:
-                        await file.write(content)
-                    return True
+                content = await ASSET_CACHE.fetch(resource_url, headers, self.size_limit)
+                if content is None:
+                    self.failed_urls.add(resource_url)
+                    return False
+                if file_path.endswith('.css'):
+                    try:
+                        if depth < self.css_max_depth:
+                            if len(content) > CSS_OFFLOAD_BYTES:
+                                references = await run_cpu("web", css_references, content)
+                            else:
+                                references = css_references(content)
+                            for reference in references:
+                                css_url = self._absolute(resource_url, reference)
+                                if css_url.startswith(('http://', 'https://')) and self._schedule(css_url, depth + 1):
+                                    self.css_assets += 1
+                        self.stylesheets.append((resource_url, file_path, content))
+                        return True
+                    except:
+                        pass
+                return await self._save(resource_url, file_path, content)
             except:
                 self.failed_urls.add(resource_url)
                 return False
 
-    async def _process_css_content(self, css_content, base_url, session):
-        def replace_url(match):
-            url = match.group(1).strip('\'"')
-            if not url.startswith(('data:', 'http://', 'https://')):
-                return f'url("{urljoin(base_url, url)}")'
-            return match.group(0)
-        return re.sub(r'url\s*\(\s*["\']?([^"\'()]+)["\']?\s*\)', replace_url, css_content)
+    async def _save(self, resource_url, file_path, content):
+        if not await self.archive.add(file_path, content):
+            self.failed_urls.add(resource_url)
+            return False
+        self.saved[resource_url] = file_path
+        return True
 
-    async def _update_html_paths(self, base_url, pagefolder):
-        if self.soup is None:
-            return
-        for img_tag in self.soup.find_all('img'):
-            if img_tag.get('src'):
-                local_path = self._get_local_path(urljoin(base_url, img_tag.get('src')), pagefolder)
-                if local_path:
-                    img_tag['src'] = local_path
-        for link_tag in self.soup.find_all('link'):
-            if link_tag.get('href'):
-                local_path = self._get_local_path(urljoin(base_url, link_tag.get('href')), pagefolder)
-                if local_path:
-                    link_tag['href'] = local_path
-        for script_tag in self.soup.find_all('script'):
-            if script_tag.get('src'):
-                local_path = self._get_local_path(urljoin(base_url, script_tag.get('src')), pagefolder)
-                if local_path:
-                    script_tag['src'] = local_path
-
-    def _get_local_path(self, resource_url, pagefolder):
+    def _update_html_paths(self):
+        for tag, attribute, resource_url in self.rewrites:
+            local_path = self._get_local_path(resource_url)
+            if local_path:
+                tag[attribute] = local_path
+
+    def _get_local_path(self, resource_url):
         try:
             parsed_url = urlparse(resource_url)
             path = unquote(parsed_url.path)
@@ -376,57 +709,22 @@ class UrlDownloader:
         except:
             return None
 
-def create_zip(folder_path):
-    try:
-        if not os.path.exists(folder_path):
-            return None
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip', dir=BASE_DIR)
-        temp_file.close()
-        with zipfile.ZipFile(temp_file.name, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zip_file:
-            file_count = 0
-            total_size = 0
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        if os.path.exists(file_path):
-                            file_size = os.path.getsize(file_path)
-                            if total_size + file_size > 19 * 1024 * 1024:
-                                continue
-                            arc_name = os.path.relpath(file_path, folder_path)
-                            zip_file.write(file_path, arc_name)
-                            file_count += 1
-                            total_size += file_size
-                    except:
-                        continue
-            if file_count == 0:
-                os.unlink(temp_file.name)
-                return None
-        return temp_file.name
-    except:
-        return None
-
 @router.get("/source")
 async def download_website_source(request: Request, url: str = Query(..., description="Website URL to download")):
     start_time = time.time()
     if not url.startswith(('http://', 'https://')):
         url = f"https://{url}"
     fid = uuid.uuid4().hex
-    pagefolder = os.path.join(BASE_DIR, f"page_{fid}")
     base_url = str(request.base_url).rstrip('/')
+    archive = ArchiveWriter()
     try:
         connector = aiohttp.TCPConnector(limit=150, limit_per_host=50, ttl_dns_cache=300)
         timeout = aiohttp.ClientTimeout(total=120, connect=20, sock_read=15)
         async with aiohttp.ClientSession(connector=connector, timeout=timeout, auto_decompress=False) as session:
             downloader = UrlDownloader()
-            success, error, file_paths = await downloader.savePage(url, pagefolder, session)
+            success, error, file_paths = await downloader.savePage(url, archive, session)
             if not success:
-                if file_paths:
-                    for fp in file_paths:
-                        try:
-                            os.remove(fp)
-                        except:
-                            pass
+                archive.discard()
                 return JSONResponse(
                     status_code=400,
                     content={
@@ -436,16 +734,7 @@ async def download_website_source(request: Request, url: str = Query(..., descri
                         "api_updates": "@abirxdhackz"
                     }
                 )
-            zip_file_path = create_zip(pagefolder)
-            for fp in file_paths:
-                try:
-                    os.remove(fp)
-                except:
-                    pass
-            try:
-                shutil.rmtree(pagefolder, ignore_errors=True)
-            except:
-                pass
+            zip_file_path = await archive.close()
             if not zip_file_path:
                 return JSONResponse(
                     status_code=500,
@@ -456,12 +745,11 @@ async def download_website_source(request: Request, url: str = Query(..., descri
                         "api_updates": "@abirxdhackz"
                     }
                 )
-            expiry = time.time() + 300
-            STORE[fid] = {
+            expiry = time.time() + STORE_TTL
+            await SHARED_STATE.set(STORE_NAMESPACE, fid, {
                 "path": zip_file_path,
-                "exp": expiry,
-                "folder": pagefolder
-            }
+                "exp": expiry
+            }, STORE_TTL)
             zip_size = os.path.getsize(zip_file_path)
             domain = urlparse(url).netloc.replace('www.', '')
             time_taken = time.time() - start_time
@@ -472,18 +760,16 @@ async def download_website_source(request: Request, url: str = Query(..., descri
                 "download_url": download_url,
                 "domain": domain,
                 "file_size_mb": round(zip_size / (1024 * 1024), 2),
-                "file_count": len(file_paths),
+                "file_count": archive.file_count,
+                "css_assets": downloader.css_assets,
+                "stored_uncompressed": archive.stored,
                 "time_taken_seconds": round(time_taken, 2),
-                "expires_in_seconds": 300,
+                "expires_in_seconds": STORE_TTL,
                 "api_dev": "@ISmartCoder",
                 "api_updates": "@abirxdhackz"
             })
     except Exception as e:
-        try:
-            if os.path.exists(pagefolder):
-                shutil.rmtree(pagefolder, ignore_errors=True)
-        except:
-            pass
+        archive.discard()
         return JSONResponse(
             status_code=500,
             content={
@@ -496,21 +782,29 @@ async def download_website_source(request: Request, url: str = Query(..., descri
 
 @router.get("/download/{file_id}")
 async def download_file(file_id: str):
-    if file_id not in STORE:
+    data = await SHARED_STATE.get(STORE_NAMESPACE, file_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="File not found or expired")
-    data = STORE[file_id]
     if time.time() > data["exp"]:
         try:
             os.remove(data["path"])
         except:
             pass
-        STORE.pop(file_id, None)
+        await SHARED_STATE.delete(STORE_NAMESPACE, file_id)
         raise HTTPException(status_code=404, detail="File expired")
     if not os.path.exists(data["path"]):
-        STORE.pop(file_id, None)
+        await SHARED_STATE.delete(STORE_NAMESPACE, file_id)
         raise HTTPException(status_code=404, detail="File not found")
     return FileResponse(
         data["path"],
         media_type="application/zip",
         filename=f"website_source_{file_id}.zip"
-    )
\ No newline at end of file
+    )
+@router.get("/cache")
+async def asset_cache_stats():
+    return JSONResponse(content={
+        "success": True,
+        "data": ASSET_CACHE.stats(),
+        "api_dev": "@ISmartCoder",
+        "api_updates": "@abirxdhackz"
+    })
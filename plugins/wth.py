@@ -1,6 +1,5 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-import aiohttp
 import asyncio
 from datetime import datetime, timedelta
 from PIL import Image, ImageDraw, ImageFont
@@ -9,22 +8,48 @@ import pytz
 import pycountry
 import requests
 import tempfile
+import hashlib
 import io
-from utils import LOGGER
+from utils import LOGGER, get_session, coalesce
 
 router = APIRouter(prefix="/wth")
 
 FONT_CACHE = {}
+FONT_DIR = os.path.join(tempfile.gettempdir(), "a360_fonts")
+
+def font_file_path(url):
+    return os.path.join(FONT_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".ttf")
+
+def read_font_file(url):
+    try:
+        with open(font_file_path(url), "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+def write_font_file(url, content):
+    os.makedirs(FONT_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=FONT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as file:
+        file.write(content)
+    os.replace(temp_path, font_file_path(url))
 
 def download_font(url, size):
     cache_key = f"{url}_{size}"
     if cache_key in FONT_CACHE:
         return FONT_CACHE[cache_key]
     
+    content = read_font_file(url)
+    if content is not None:
+        font = ImageFont.truetype(io.BytesIO(content), size)
+        FONT_CACHE[cache_key] = font
+        return font
+    
     try:
         response = requests.get(url, timeout=15)
         if response.status_code == 200:
             font = ImageFont.truetype(io.BytesIO(response.content), size)
+            write_font_file(url, response.content)
             FONT_CACHE[cache_key] = font
             LOGGER.info(f"Font cached successfully: {cache_key}")
             return font
@@ -226,159 +251,160 @@ def upload_to_tmpfiles(file_path):
     return None
 
 async def get_weather_data(city):
-    async with aiohttp.ClientSession() as session:
-        geocode_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1&language=en&format=json"
-        geocode_data = await fetch_data(session, geocode_url)
-        
-        if not geocode_data or "results" not in geocode_data or not geocode_data["results"]:
-            LOGGER.warning(f"No geocode results for city: {city}")
-            return None
-        
-        result = geocode_data["results"][0]
-        lat, lon = result["latitude"], result["longitude"]
-        country_code = result.get("country_code", "").upper()
-        
-        LOGGER.info(f"Fetching weather for {city} at coordinates: {lat}, {lon}")
-        
-        weather_url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}&"
-            f"current=temperature_2m,relative_humidity_2m,apparent_temperature,weathercode,"
-            f"wind_speed_10m,wind_direction_10m&"
-            f"hourly=temperature_2m,apparent_temperature,relative_humidity_2m,weathercode,"
-            f"precipitation_probability&"
-            f"daily=temperature_2m_max,temperature_2m_min,sunrise,sunset,weathercode&"
-            f"timezone=auto"
-        )
-        
-        aqi_url = (
-            f"https://air-quality-api.open-meteo.com/v1/air-quality?"
-            f"latitude={lat}&longitude={lon}&"
-            f"hourly=pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,ozone&"
-            f"timezone=auto"
-        )
-        
-        weather_data, aqi_data = await asyncio.gather(
-            fetch_data(session, weather_url),
-            fetch_data(session, aqi_url)
-        )
-        
-        if not weather_data or not aqi_data:
-            LOGGER.error(f"Failed to fetch weather or AQI data for {city}")
-            return None
-        
-        current = weather_data["current"]
-        hourly = weather_data["hourly"]
-        daily = weather_data["daily"]
-        aqi = aqi_data["hourly"]
-        
-        weather_code = {
-            0: "Clear", 1: "Scattered Clouds", 2: "Scattered Clouds", 3: "Overcast Clouds",
-            45: "Fog", 48: "Haze", 51: "Light Drizzle", 53: "Drizzle",
-            55: "Heavy Drizzle", 61: "Light Rain", 63: "Moderate Rain", 65: "Heavy Rain",
-            66: "Freezing Rain", 67: "Heavy Freezing Rain", 71: "Light Snow",
-            73: "Snow", 75: "Heavy Snow", 77: "Snow Grains", 80: "Showers",
-            81: "Heavy Showers", 82: "Violent Showers", 95: "Thunderstorm",
-            96: "Thunderstorm", 99: "Heavy Thunderstorm"
-        }
-        
-        hourly_forecast = []
-        for i in range(min(12, len(hourly["time"]))):
-            time_str = hourly["time"][i].split("T")[1][:5]
-            hour = int(time_str[:2])
-            time_format = f"{hour % 12 or 12} {'AM' if hour < 12 else 'PM'}"
-            
-            hourly_forecast.append({
-                "time": time_format,
-                "temperature": round(hourly["temperature_2m"][i], 1),
-                "weather": weather_code.get(hourly["weathercode"][i], "Unknown"),
-                "humidity": hourly["relative_humidity_2m"][i],
-                "precipitation_probability": hourly["precipitation_probability"][i]
-            })
-        
-        current_date = datetime.now()
-        daily_forecast = []
-        for i in range(min(7, len(daily["temperature_2m_max"]))):
-            day_date = (current_date + timedelta(days=i))
-            daily_forecast.append({
-                "date": day_date.strftime('%Y-%m-%d'),
-                "day": day_date.strftime('%a, %b %d'),
-                "min_temp": round(daily["temperature_2m_min"][i], 1),
-                "max_temp": round(daily["temperature_2m_max"][i], 1),
-                "weather": weather_code.get(daily["weathercode"][i], "Unknown"),
-                "sunrise": daily["sunrise"][i].split("T")[1][:5],
-                "sunset": daily["sunset"][i].split("T")[1][:5]
-            })
-        
-        pm25 = aqi["pm2_5"][0]
-        if pm25 <= 12:
-            aqi_level = "Good"
-        elif pm25 <= 35:
-            aqi_level = "Fair"
-        elif pm25 <= 55:
-            aqi_level = "Moderate"
-        else:
-            aqi_level = "Poor"
-        
-        try:
-            timezone = get_timezone_from_country_code(country_code)
-            local_time = datetime.now(timezone)
-            current_time = local_time.strftime("%I:%M %p")
-            current_date_str = local_time.strftime("%Y-%m-%d")
-        except Exception:
-            current_time = datetime.now().strftime("%I:%M %p")
-            current_date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        LOGGER.info(f"Successfully fetched weather data for {city}")
+    session = get_session("weather")
+    geocode_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1&language=en&format=json"
+    geocode_data = await fetch_data(session, geocode_url)
+    
+    if not geocode_data or "results" not in geocode_data or not geocode_data["results"]:
+        LOGGER.warning(f"No geocode results for city: {city}")
+        return None
+    
+    result = geocode_data["results"][0]
+    lat, lon = result["latitude"], result["longitude"]
+    country_code = result.get("country_code", "").upper()
+    
+    LOGGER.info(f"Fetching weather for {city} at coordinates: {lat}, {lon}")
+    
+    weather_url = (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={lat}&longitude={lon}&"
+        f"current=temperature_2m,relative_humidity_2m,apparent_temperature,weathercode,"
+        f"wind_speed_10m,wind_direction_10m&"
+        f"hourly=temperature_2m,apparent_temperature,relative_humidity_2m,weathercode,"
+        f"precipitation_probability&"
+        f"daily=temperature_2m_max,temperature_2m_min,sunrise,sunset,weathercode&"
+        f"timezone=auto"
+    )
+    
+    aqi_url = (
+        f"https://air-quality-api.open-meteo.com/v1/air-quality?"
+        f"latitude={lat}&longitude={lon}&"
+        f"hourly=pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,ozone&"
+        f"timezone=auto"
+    )
+    
+    weather_data, aqi_data = await asyncio.gather(
+        fetch_data(session, weather_url),
+        fetch_data(session, aqi_url)
+    )
+    
+    if not weather_data or not aqi_data:
+        LOGGER.error(f"Failed to fetch weather or AQI data for {city}")
+        return None
+    
+    current = weather_data["current"]
+    hourly = weather_data["hourly"]
+    daily = weather_data["daily"]
+    aqi = aqi_data["hourly"]
+    
+    weather_code = {
+        0: "Clear", 1: "Scattered Clouds", 2: "Scattered Clouds", 3: "Overcast Clouds",
+        45: "Fog", 48: "Haze", 51: "Light Drizzle", 53: "Drizzle",
+        55: "Heavy Drizzle", 61: "Light Rain", 63: "Moderate Rain", 65: "Heavy Rain",
+        66: "Freezing Rain", 67: "Heavy Freezing Rain", 71: "Light Snow",
+        73: "Snow", 75: "Heavy Snow", 77: "Snow Grains", 80: "Showers",
+        81: "Heavy Showers", 82: "Violent Showers", 95: "Thunderstorm",
+        96: "Thunderstorm", 99: "Heavy Thunderstorm"
+    }
+    
+    hourly_forecast = []
+    for i in range(min(12, len(hourly["time"]))):
+        time_str = hourly["time"][i].split("T")[1][:5]
+        hour = int(time_str[:2])
+        time_format = f"{hour % 12 or 12} {'AM' if hour < 12 else 'PM'}"
         
-        return {
-            "status": "success",
-            "location": {
-                "city": city.capitalize(),
-                "country": get_country_name(country_code),
-                "country_code": country_code,
-                "coordinates": {
-                    "latitude": lat,
-                    "longitude": lon
-                }
-            },
-            "current": {
-                "time": current_time,
-                "date": current_date_str,
-                "temperature": round(current["temperature_2m"], 1),
-                "feels_like": round(current["apparent_temperature"], 1),
-                "humidity": current["relative_humidity_2m"],
-                "wind_speed": round(current["wind_speed_10m"], 1),
-                "wind_direction": current["wind_direction_10m"],
-                "weather": weather_code.get(current["weathercode"], "Unknown"),
-                "weather_code": current["weathercode"],
-                "sunrise": daily["sunrise"][0].split("T")[1][:5],
-                "sunset": daily["sunset"][0].split("T")[1][:5]
-            },
-            "hourly_forecast": hourly_forecast,
-            "daily_forecast": daily_forecast,
-            "air_quality": {
-                "level": aqi_level,
-                "pm2_5": round(aqi["pm2_5"][0], 2),
-                "pm10": round(aqi["pm10"][0], 2),
-                "carbon_monoxide": round(aqi["carbon_monoxide"][0], 2),
-                "nitrogen_dioxide": round(aqi["nitrogen_dioxide"][0], 2),
-                "ozone": round(aqi["ozone"][0], 2)
-            },
-            "maps": {
-                "temperature": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=temperature&lat={lat}&lon={lon}&zoom=8",
-                "clouds": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=clouds&lat={lat}&lon={lon}&zoom=8",
-                "precipitation": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=precipitation&lat={lat}&lon={lon}&zoom=8",
-                "wind": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=wind&lat={lat}&lon={lon}&zoom=8",
-                "pressure": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=pressure&lat={lat}&lon={lon}&zoom=8"
-            },
-            "lat": lat,
-            "lon": lon,
+        hourly_forecast.append({
+            "time": time_format,
+            "temperature": round(hourly["temperature_2m"][i], 1),
+            "weather": weather_code.get(hourly["weathercode"][i], "Unknown"),
+            "humidity": hourly["relative_humidity_2m"][i],
+            "precipitation_probability": hourly["precipitation_probability"][i]
+        })
+    
+    current_date = datetime.now()
+    daily_forecast = []
+    for i in range(min(7, len(daily["temperature_2m_max"]))):
+        day_date = (current_date + timedelta(days=i))
+        daily_forecast.append({
+            "date": day_date.strftime('%Y-%m-%d'),
+            "day": day_date.strftime('%a, %b %d'),
+            "min_temp": round(daily["temperature_2m_min"][i], 1),
+            "max_temp": round(daily["temperature_2m_max"][i], 1),
+            "weather": weather_code.get(daily["weathercode"][i], "Unknown"),
+            "sunrise": daily["sunrise"][i].split("T")[1][:5],
+            "sunset": daily["sunset"][i].split("T")[1][:5]
+        })
+    
+    pm25 = aqi["pm2_5"][0]
+    if pm25 <= 12:
+        aqi_level = "Good"
+    elif pm25 <= 35:
+        aqi_level = "Fair"
+    elif pm25 <= 55:
+        aqi_level = "Moderate"
+    else:
+        aqi_level = "Poor"
+    
+    try:
+        timezone = get_timezone_from_country_code(country_code)
+        local_time = datetime.now(timezone)
+        current_time = local_time.strftime("%I:%M %p")
+        current_date_str = local_time.strftime("%Y-%m-%d")
+    except Exception:
+        current_time = datetime.now().strftime("%I:%M %p")
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+    
+    LOGGER.info(f"Successfully fetched weather data for {city}")
+    
+    return {
+        "status": "success",
+        "location": {
+            "city": city.capitalize(),
+            "country": get_country_name(country_code),
             "country_code": country_code,
-            "city": city.capitalize()
-        }
+            "coordinates": {
+                "latitude": lat,
+                "longitude": lon
+            }
+        },
+        "current": {
+            "time": current_time,
+            "date": current_date_str,
+            "temperature": round(current["temperature_2m"], 1),
+            "feels_like": round(current["apparent_temperature"], 1),
+            "humidity": current["relative_humidity_2m"],
+            "wind_speed": round(current["wind_speed_10m"], 1),
+            "wind_direction": current["wind_direction_10m"],
+            "weather": weather_code.get(current["weathercode"], "Unknown"),
+            "weather_code": current["weathercode"],
+            "sunrise": daily["sunrise"][0].split("T")[1][:5],
+            "sunset": daily["sunset"][0].split("T")[1][:5]
+        },
+        "hourly_forecast": hourly_forecast,
+        "daily_forecast": daily_forecast,
+        "air_quality": {
+            "level": aqi_level,
+            "pm2_5": round(aqi["pm2_5"][0], 2),
+            "pm10": round(aqi["pm10"][0], 2),
+            "carbon_monoxide": round(aqi["carbon_monoxide"][0], 2),
+            "nitrogen_dioxide": round(aqi["nitrogen_dioxide"][0], 2),
+            "ozone": round(aqi["ozone"][0], 2)
+        },
+        "maps": {
+            "temperature": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=temperature&lat={lat}&lon={lon}&zoom=8",
+            "clouds": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=clouds&lat={lat}&lon={lon}&zoom=8",
+            "precipitation": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=precipitation&lat={lat}&lon={lon}&zoom=8",
+            "wind": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=wind&lat={lat}&lon={lon}&zoom=8",
+            "pressure": f"https://openweathermap.org/weathermap?basemap=map&cities=true&layer=pressure&lat={lat}&lon={lon}&zoom=8"
+        },
+        "lat": lat,
+        "lon": lon,
+        "country_code": country_code,
+        "city": city.capitalize()
+    }
 
 @router.get("")
+@coalesce(key_func=lambda area=None: (area or "").strip().lower())
 async def get_weather(area: str = None):
     area = area.strip() if area else ""
     
@@ -4,7 +4,7 @@ import requests
 import re
 import html
 from collections import OrderedDict
-from utils import LOGGER
+from utils import LOGGER, run_blocking
 from py_yt import VideosSearch, Search
 
 router = APIRouter(prefix="/yt")
@@ -135,7 +135,7 @@ async def download(url: str = ""):
             "comments": "N/A"
         }
     try:
-        response = requests.post("https://www.clipto.com/api/youtube", json={"url": standard_url})
+        response = await run_blocking("yt", requests.post, "https://www.clipto.com/api/youtube", json={"url": standard_url}, timeout=30)
         ordered = OrderedDict()
         ordered["api_owner"] = "@ISmartCoder"
         ordered["api_updates"] = "t.me/abirxdhackzs"
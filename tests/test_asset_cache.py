@@ -0,0 +1,97 @@
+import asyncio
+import os
+from plugins.web import AssetCache
+
+def blob_files(cache):
+    return sorted(name for _, _, names in os.walk(cache.blob_dir) for name in names)
+
+def test_replaced_versions_leave_one_blob_on_disk(tmp_path):
+    cache = AssetCache(directory=str(tmp_path), max_bytes=1024, fresh_seconds=60)
+    async def main():
+        await cache._ensure_loaded()
+        for version in [b"v1", b"version2", b"v3!"]:
+            await cache._store("https://example.com/app.css", version, None, None, 60)
+    asyncio.run(main())
+    entry = cache.entries["https://example.com/app.css"]
+    assert blob_files(cache) == [entry["digest"]]
+    assert cache.refs == {entry["digest"]: 1}
+    assert cache.total_bytes == len(b"v3!")
+
+def test_shared_blob_survives_until_last_reference_is_replaced(tmp_path):
+    cache = AssetCache(directory=str(tmp_path), max_bytes=1024, fresh_seconds=60)
+    async def main():
+        await cache._ensure_loaded()
+        await cache._store("https://a.example/logo.png", b"same", None, None, 60)
+        await cache._store("https://b.example/logo.png", b"same", None, None, 60)
+        await cache._store("https://a.example/logo.png", b"new", None, None, 60)
+        assert len(blob_files(cache)) == 2
+        await cache._store("https://b.example/logo.png", b"new", None, None, 60)
+    asyncio.run(main())
+    assert len(blob_files(cache)) == 1
+    assert cache.total_bytes == len(b"new")
+
+def test_missing_blob_drops_entry_and_accounting(tmp_path):
+    cache = AssetCache(directory=str(tmp_path), max_bytes=1024, fresh_seconds=60)
+    url = "https://example.com/font.woff2"
+    async def main():
+        await cache._ensure_loaded()
+        await cache._store(url, b"font-bytes", None, None, 60)
+        entry = cache.entries[url]
+        os.remove(cache._blob_path(entry["digest"]))
+        assert await cache._local(entry) is None
+        assert await cache._local(entry) is None
+    asyncio.run(main())
+    assert cache.entries == {} and cache.refs == {}
+    assert cache.total_bytes == 0
+    assert not os.path.exists(cache._meta_path(url))
+
+class FakeResponse:
+    def __init__(self, status, body, headers):
+        self.status = status
+        self.body = body
+        self.headers = headers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self.body
+
+class FakeSession:
+    def __init__(self, cache_control):
+        self.cache_control = cache_control
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None, allow_redirects=True):
+        self.requests.append(dict(headers))
+        if "If-None-Match" in headers:
+            return FakeResponse(304, b"", {"Cache-Control": self.cache_control})
+        return FakeResponse(200, b"body", {"Cache-Control": self.cache_control, "ETag": '"v1"'})
+
+def test_freshness_follows_cache_control_max_age(tmp_path, monkeypatch):
+    import plugins.web as web
+    session = FakeSession("public, max-age=300")
+    monkeypatch.setattr(web, "get_session", lambda profile: session)
+    cache = AssetCache(directory=str(tmp_path), max_bytes=1024, fresh_seconds=0)
+    url = "https://example.com/app.js"
+    async def main():
+        assert await cache.fetch(url, {}, 1024) == b"body"
+        assert await cache.fetch(url, {}, 1024) == b"body"
+        session.cache_control = "no-cache"
+        cache.entries[url]["max_age"] = 0
+        assert await cache.fetch(url, {}, 1024) == b"body"
+    asyncio.run(main())
+    assert len(session.requests) == 2
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert (cache.misses, cache.hits, cache.revalidated) == (1, 1, 1)
+    assert cache.entries[url]["max_age"] == 0
+
+def test_cache_max_age_parsing():
+    from plugins.web import cache_max_age
+    assert cache_max_age("public, max-age=120", 600) == 120
+    assert cache_max_age("s-maxage=30", 600) == 600
+    assert cache_max_age("no-cache, max-age=120", 600) == 0
+    assert cache_max_age(None, 600) == 600
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import plugins.binance as binance
+
+def ticker(symbol, price):
+    return {"symbol": symbol, "lastPrice": str(price), "priceChangePercent": "0", "quoteVolume": "0"}
+
+def exchange_info(*pairs, halted=()):
+    return {"symbols": [
+        {"symbol": base + quote, "baseAsset": base, "quoteAsset": quote, "status": "BREAK" if base + quote in halted else "TRADING"}
+        for base, quote in pairs
+    ]}
+
+def make_market(prices, pairs, halted=()):
+    market = binance.MarketSnapshot(interval=0)
+    market.store_pairs(exchange_info(*pairs, halted=halted))
+    market.store([ticker(base + quote, prices[base + quote]) for base, quote in pairs])
+    return market
+
+def test_snapshot_polls_from_start_not_from_requests(monkeypatch):
+    fetches = []
+    async def fake_fetch():
+        fetches.append(1)
+        return [ticker("BTCUSDT", 50000)]
+    async def fake_exchange_info():
+        return exchange_info(("BTC", "USDT"))
+    monkeypatch.setattr(binance, "fetch_crypto_data", fake_fetch)
+    monkeypatch.setattr(binance, "fetch_exchange_info", fake_exchange_info)
+    assert binance.BACKGROUND_SERVICES.services["binance_snapshot"] is binance.MARKET
+    market = binance.MarketSnapshot(interval=60)
+    async def main():
+        await market.get()
+        assert market._task is None
+        assert len(fetches) == 1
+        market.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(fetches) == 2
+        await market.stop()
+    asyncio.run(main())
+
+def test_graph_uses_exchange_info_assets_and_skips_halted_pairs():
+    market = make_market(
+        {"ETHAEUR": 3000, "ETHUSDT": 3300, "LUNAUSDT": 1},
+        [("ETH", "AEUR"), ("ETH", "USDT"), ("LUNA", "USDT")],
+        halted={"LUNAUSDT"}
+    )
+    assert "ETHA" not in market.graph
+    assert market.graph["AEUR"]["ETH"] == ("ETHAEUR", True)
+    rate, legs = market.convert("AEUR", "ETH")
+    assert [leg["symbol"] for leg in legs] == ["ETHAEUR"]
+    assert rate == 1 / 3000
+    assert market.convert("LUNA", "USDT") == (None, None)
+    assert market.rankings["AEUR"] == [market.index["ETHAEUR"]]
+
+def test_convert_prefers_the_direct_pair_over_triangular_routes(monkeypatch):
+    market = make_market(
+        {"XYZUSDT": 2.0, "XYZBTC": 0.0001, "BTCUSDT": 25000, "XYZBNB": 0.005, "BNBUSDT": 300},
+        [("XYZ", "USDT"), ("XYZ", "BTC"), ("BTC", "USDT"), ("XYZ", "BNB"), ("BNB", "USDT")]
+    )
+    assert len(market.route("XYZ", "USDT")) == 3
+    rate, legs = market.convert("XYZ", "USDT")
+    assert [leg["symbol"] for leg in legs] == ["XYZUSDT"]
+    assert rate == 2.0
+    monkeypatch.setattr(binance, "MARKET", market)
+    response = asyncio.run(binance.convert_currency(base="xyz", target="btc", amount=10))
+    data = json.loads(response.body)["data"]
+    assert data["route"] == ["XYZ", "BTC"]
+    assert data["base_usdt_price"] == 2.0
+    assert data["target_usdt_price"] == 25000
+    assert data["total_in_usdt"] == 20.0
+
+def test_multi_hop_routes_use_fewest_hops_then_liquidity():
+    market = binance.MarketSnapshot(interval=0)
+    pairs = [("XYZ", "BTC"), ("BTC", "USDT"), ("XYZ", "BNB"), ("BNB", "USDT"), ("BNB", "BTC"), ("ABC", "BNB")]
+    counts = {"XYZBTC": 50, "BTCUSDT": 9000, "XYZBNB": 400, "BNBUSDT": 5000, "BNBBTC": 100, "ABCBNB": 10}
+    market.store_pairs(exchange_info(*pairs))
+    market.store([dict(ticker(base + quote, 1.5), count=counts[base + quote]) for base, quote in pairs])
+    rate, legs = market.convert("XYZ", "USDT")
+    assert [leg["symbol"] for leg in legs] == ["XYZBNB", "BNBUSDT"]
+    rate, legs = market.convert("ABC", "USDT")
+    assert [leg["symbol"] for leg in legs] == ["ABCBNB", "BNBUSDT"]
+
+def test_suffix_pairs_are_used_until_exchange_info_loads():
+    market = binance.MarketSnapshot(interval=0)
+    market.store([ticker("ETHUSDT", 3000), ticker("BTCUSDT", 60000)])
+    rate, legs = market.convert("ETH", "BTC")
+    assert [leg["symbol"] for leg in legs] == ["ETHUSDT", "BTCUSDT"]
+    assert rate == 3000 / 60000
+    market.store_pairs(exchange_info(("ETH", "USDT")))
+    assert market.convert("ETH", "BTC") == (None, None)
+
+def ranked_tickers():
+    import random
+    rng = random.Random(7)
+    symbols = [f"C{i}{quote}" for i in range(60) for quote in ("USDT", "BTC", "TRY")]
+    changes = rng.sample(range(-5000, 5000), len(symbols))
+    return [
+        {"symbol": symbol, "lastPrice": "1", "priceChangePercent": str(change / 100), "quoteVolume": str(rng.randint(0, 1000))}
+        for symbol, change in zip(symbols, changes)
+    ]
+
+def test_presorted_rankings_match_a_full_sort_per_request():
+    tickers = ranked_tickers()
+    market = binance.MarketSnapshot(interval=0).store(tickers)
+    for quote in ("", "USDT", "TRY"):
+        for min_volume in (0, 500):
+            pool = [t for t in tickers if t["symbol"].endswith(quote) and float(t["quoteVolume"]) >= min_volume]
+            by_change = sorted(pool, key=lambda t: float(t["priceChangePercent"]))
+            assert market.top(10, gainers=True, quote=quote, min_volume=min_volume) == by_change[::-1][:10]
+            assert market.top(10, gainers=False, quote=quote, min_volume=min_volume) == by_change[:10]
+    assert market.top(5, quote="EUR") == []
+
+def test_ranking_endpoint_validates_filters(monkeypatch):
+    monkeypatch.setattr(binance, "MARKET", binance.MarketSnapshot(interval=0).store(ranked_tickers()))
+    assert asyncio.run(binance.get_top_gainers_endpoint(amount=0)).status_code == 400
+    assert asyncio.run(binance.get_top_losers_endpoint(amount=5, quote="XYZ")).status_code == 400
+    assert asyncio.run(binance.get_top_gainers_endpoint(amount=5, min_volume=-1)).status_code == 400
+    body = json.loads(asyncio.run(binance.get_top_losers_endpoint(amount=3, quote="btc", min_volume=0)).body)
+    assert body["quote"] == "BTC" and body["count"] == 3
+    assert all(row["symbol"].endswith("BTC") for row in body["data"])
+
+def test_batch_prices_report_unknown_symbols_alongside_found_ones(monkeypatch):
+    monkeypatch.setattr(binance, "MARKET", make_market(
+        {"BTCUSDT": 60000, "ETHUSDT": 3000, "ETHBTC": 0.05},
+        [("BTC", "USDT"), ("ETH", "USDT"), ("ETH", "BTC")]
+    ))
+    body = json.loads(asyncio.run(binance.get_prices(tokens="btc, eth,NOPE,,btc", quote="usdt")).body)
+    assert body["success"] is True
+    assert [row["symbol"] for row in body["data"]] == ["BTCUSDT", "ETHUSDT"]
+    assert body["errors"] == [{"token": "NOPE", "symbol": "NOPEUSDT", "error": "Invalid symbol"}]
+    assert (body["count"], body["failed"]) == (2, 1)
+    compact = json.loads(asyncio.run(binance.post_prices(binance.PriceBatchRequest(tokens=["ETH", "DOGE"], quote="BTC", compact=True))).body)
+    assert compact["fields"] == binance.COMPACT_FIELDS
+    assert compact["data"] == [["ETH", "ETHBTC", 0.05, 0.0, 0.0]]
+    assert compact["errors"][0]["symbol"] == "DOGEBTC"
+
+def test_batch_prices_fail_cleanly(monkeypatch):
+    assert asyncio.run(binance.get_prices(tokens="", quote="USDT")).status_code == 400
+    assert asyncio.run(binance.get_prices(tokens="BTC", quote="XYZ")).status_code == 400
+    assert asyncio.run(binance.get_prices(tokens=",".join(f"T{i}" for i in range(binance.MAX_BATCH_SYMBOLS + 1)), quote="USDT")).status_code == 400
+    async def failing_get():
+        raise RuntimeError("snapshot unavailable")
+    market = binance.MarketSnapshot(interval=0)
+    monkeypatch.setattr(market, "get", failing_get)
+    monkeypatch.setattr(binance, "MARKET", market)
+    response = asyncio.run(binance.get_prices(tokens="BTC", quote="USDT"))
+    assert response.status_code == 500
+    all_unknown = make_market({"BTCUSDT": 1}, [("BTC", "USDT")])
+    monkeypatch.setattr(binance, "MARKET", all_unknown)
+    body = json.loads(asyncio.run(binance.get_prices(tokens="AAA,BBB", quote="USDT")).body)
+    assert body["success"] is False and body["failed"] == 2
@@ -0,0 +1,68 @@
+import time
+from utils.cache import MemoryCache
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = MemoryCache(max_entries=2, max_bytes=1024)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=60)
+    assert cache.get("a") == (True, "1")
+    cache.set("c", "3", ttl=60)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "1")
+    assert cache.get("c") == (True, "3")
+    assert cache.evictions == 1
+
+def test_byte_budget_is_enforced_and_accounted():
+    cache = MemoryCache(max_entries=100, max_bytes=10)
+    cache.set("a", "xxxx", ttl=60)
+    cache.set("b", "yyyy", ttl=60)
+    cache.set("c", "zzzz", ttl=60)
+    assert cache._bytes == 8
+    assert cache.get("a") == (False, None)
+    assert cache.set("big", "x" * 11, ttl=60) is False
+    cache.set("b", "yy", ttl=60)
+    assert cache._bytes == 6
+
+def test_expired_entries_miss_and_release_bytes(monkeypatch):
+    cache = MemoryCache(max_entries=10, max_bytes=1024)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", "value", ttl=5)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") == (False, None)
+    assert cache.expirations == 1
+    assert cache._bytes == 0
+
+def test_coalesced_waiters_get_their_own_uncacheable_responses():
+    import asyncio
+    from starlette.responses import JSONResponse, StreamingResponse
+    from utils.cache import cached
+    calls = []
+
+    @cached(60, namespace="test-error-response")
+    async def failing(name=""):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return JSONResponse(status_code=404, content={"error": "missing"})
+
+    @cached(60, namespace="test-stream-response")
+    async def streaming(name=""):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return StreamingResponse(iter([b"chunk"]))
+
+    async def main():
+        errors = await asyncio.gather(*(failing(name="x") for _ in range(3)))
+        streams = await asyncio.gather(*(streaming(name="y") for _ in range(3)))
+        return errors, streams
+    errors, streams = asyncio.run(main())
+    assert len({id(response) for response in errors}) == 3
+    assert all(response.status_code == 404 and response.body == b'{"error":"missing"}' for response in errors)
+    assert calls.count("x") == 1
+    assert len({id(response) for response in streams}) == 3
+    assert calls.count("y") == 3
+
+def test_ignore_case_parameters_share_a_cache_key():
+    from utils.singleflight import request_key
+    assert request_key("p", {"username": " Octocat "}, ignore_case=("username",)) == request_key("p", {"username": "octocat"}, ignore_case=("username",))
+    assert request_key("p", {"word": "Polish"}) != request_key("p", {"word": "polish"})
@@ -0,0 +1,21 @@
+import asyncio
+import pytest
+from utils.executor import BlockingExecutor
+
+def fail():
+    raise ValueError("boom")
+
+def test_failed_calls_are_not_counted_as_completed():
+    executor = BlockingExecutor(max_workers=2, limits={})
+
+    async def scenario():
+        assert await executor.run("demo", sum, [1, 2]) == 3
+        with pytest.raises(ValueError):
+            await executor.run("demo", fail)
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    stats = executor.snapshot()["plugins"]["demo"]
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["queued"] == 0 and stats["running"] == 0
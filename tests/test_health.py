@@ -0,0 +1,25 @@
+import asyncio
+import json
+import main
+
+def ready(monkeypatch, results, strict=False):
+    monkeypatch.setattr(main.app.state, "started", True, raising=False)
+    monkeypatch.setattr(main.UPSTREAM_PROBER, "rounds", 1)
+    monkeypatch.setattr(main.UPSTREAM_PROBER, "results", results)
+    response = asyncio.run(main.health_ready(strict=strict))
+    return response.status_code, json.loads(response.body)["down"]
+
+def test_readiness_fails_when_a_critical_upstream_is_down(monkeypatch):
+    results = {
+        "binance": {"state": "down", "critical": True, "plugins": ["binance"]},
+        "pypi": {"state": "down", "critical": False, "plugins": ["pypi"]}
+    }
+    assert ready(monkeypatch, results) == (503, ["binance"])
+
+def test_non_critical_outages_only_fail_strict_readiness(monkeypatch):
+    results = {
+        "binance": {"state": "up", "critical": True, "plugins": ["binance"]},
+        "pypi": {"state": "down", "critical": False, "plugins": ["pypi"]}
+    }
+    assert ready(monkeypatch, results) == (200, [])
+    assert ready(monkeypatch, results, strict=True) == (503, ["pypi"])
@@ -0,0 +1,116 @@
+import asyncio
+import plugins.p2p as p2p
+
+def make_refresher(monkeypatch, calls):
+    async def fake_fetch(asset, fiat, trade_type, pay_method, max_results=1000, failures=None):
+        calls.append(((asset, fiat, trade_type, pay_method), max_results))
+        return []
+    monkeypatch.setattr(p2p, "fetch_all_sellers_async", fake_fetch)
+    return p2p.OrderBookRefresher(interval=10, min_demand=2, full_demand=8)
+
+def test_single_deep_request_is_not_refreshed_in_background(monkeypatch):
+    calls = []
+    books = make_refresher(monkeypatch, calls)
+    books.peek("USDT", "BDT", "SELL", None, 1000)
+    asyncio.run(books.refresh_hot())
+    assert calls == []
+
+def test_refresh_depth_and_frequency_follow_demand(monkeypatch):
+    calls = []
+    books = make_refresher(monkeypatch, calls)
+    for _ in range(8):
+        books.peek("USDT", "BDT", "SELL", None, 200)
+    for _ in range(4):
+        books.peek("BTC", "INR", "BUY", None, 200)
+    asyncio.run(books.refresh_hot())
+    assert sorted(calls) == [
+        (("BTC", "INR", "BUY", "ALL"), 5 * p2p.ROWS_PER_PAGE),
+        (("USDT", "BDT", "SELL", "ALL"), 10 * p2p.ROWS_PER_PAGE),
+    ]
+    pages, interval = books._plan(books.demand[("BTC", "INR", "BUY", "ALL")], books.demand[("BTC", "INR", "BUY", "ALL")]["seen"])
+    assert pages == 5
+    assert interval > books.interval
+
+def test_refresher_is_registered_and_not_started_by_requests():
+    assert p2p.BACKGROUND_SERVICES.services["p2p_order_books"] is p2p.ORDER_BOOKS
+    books = p2p.OrderBookRefresher(interval=10)
+    books.peek("USDT", "BDT", "SELL", None, 20)
+    assert books._task is None
+
+def fake_pages(monkeypatch, calls, available, failing=()):
+    async def fake_page(session, asset, fiat, trade_type, pay_method, page, rows=p2p.ROWS_PER_PAGE):
+        calls.append(page)
+        if page in failing:
+            return None
+        start = (page - 1) * rows
+        return [
+            {"adv": {"advNo": str(i), "price": str(100 + i), "surplusAmount": "10", "tradeMethods": []},
+             "advertiser": {"nickName": "seller", "monthFinishRate": 0.9, "monthOrderCount": 10}}
+            for i in range(start, min(start + rows, available))
+        ]
+    monkeypatch.setattr(p2p, "fetch_page_async", fake_page)
+    monkeypatch.setattr(p2p, "get_session", lambda name: None)
+
+def test_shallow_cold_stream_does_not_mark_book_complete(monkeypatch):
+    calls = []
+    fake_pages(monkeypatch, calls, available=1000)
+    books = p2p.OrderBookRefresher(interval=0)
+    monkeypatch.setattr(p2p, "ORDER_BOOKS", books)
+    async def main():
+        key, pages, book = books.peek("USDT", "BDT", "SELL", None, 50)
+        lines = []
+        async for chunk in p2p.stream_sellers(key, pages, book, 50, {}, "price", False, {"trade_type": "SELL"}, 0):
+            lines.extend(chunk.strip().split("\n"))
+        return lines
+    lines = asyncio.run(main())
+    assert len(lines) == 51
+    stored = books.books[("USDT", "BDT", "SELL", "ALL")]
+    assert len(stored["sellers"]) == 3 * p2p.ROWS_PER_PAGE
+    assert stored["complete"] is False
+    assert books.peek("USDT", "BDT", "SELL", None, 400)[2] is None
+    assert books.peek("USDT", "BDT", "SELL", None, 60)[2] is stored
+
+def test_short_last_page_marks_book_complete(monkeypatch):
+    calls = []
+    fake_pages(monkeypatch, calls, available=30)
+    books = p2p.OrderBookRefresher(interval=0)
+    sellers, _ = asyncio.run(books.get("USDT", "BDT", "SELL", None, 100))
+    assert len(sellers) == 30
+    assert books.peek("USDT", "BDT", "SELL", None, 1000)[2] is not None
+
+def test_failed_page_keeps_book_incomplete(monkeypatch):
+    calls = []
+    fake_pages(monkeypatch, calls, available=1000, failing={2})
+    books = p2p.OrderBookRefresher(interval=0)
+    sellers, _ = asyncio.run(books.get("USDT", "BDT", "SELL", None, 60))
+    assert len(sellers) == 2 * p2p.ROWS_PER_PAGE
+    assert books.books[("USDT", "BDT", "SELL", "ALL")]["complete"] is False
+    assert books.peek("USDT", "BDT", "SELL", None, 1000)[2] is None
+
+def test_fresh_deep_book_is_not_replaced_by_shallow_refresh(monkeypatch):
+    calls = []
+    books = make_refresher(monkeypatch, calls)
+    key = ("USDT", "BDT", "SELL", "ALL")
+    deep = books.store(key, [], 50)
+    for _ in range(3):
+        books.peek("USDT", "BDT", "SELL", None, 1000)
+    deep["updated"] -= books.max_age - 1
+    asyncio.run(books.refresh_hot())
+    assert calls == []
+    assert books.store(key, [], 5) is deep
+    assert books.books[key] is deep
+    deep["updated"] -= 2
+    asyncio.run(books.refresh_hot())
+    assert calls == [(key, 19 * p2p.ROWS_PER_PAGE)]
+
+def test_requested_depth_decays_with_demand(monkeypatch):
+    books = p2p.OrderBookRefresher(interval=10, min_demand=0.1, full_demand=1)
+    now = [1000.0]
+    monkeypatch.setattr(p2p.time, "monotonic", lambda: now[0])
+    books.peek("USDT", "BDT", "SELL", None, 1000)
+    entry = books.demand[("USDT", "BDT", "SELL", "ALL")]
+    assert books._plan(entry, now[0])[0] == 50
+    now[0] += 3 * p2p.DEMAND_HALF_LIFE
+    books.peek("USDT", "BDT", "SELL", None, 20)
+    assert entry["pages"] == 50 / 8
+    assert books._plan(entry, now[0])[0] == 7
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import plugins.p2p as p2p
+
+def ad(number, price, amount=10.0, rate=0.9, orders=10, user_type="user"):
+    return {
+        "adv": {"advNo": str(number), "price": str(price), "surplusAmount": str(amount), "tradeMethods": [{"tradeMethodName": "Bank"}]},
+        "advertiser": {"nickName": f"seller{number}", "monthFinishRate": rate, "monthOrderCount": orders, "userType": user_type}
+    }
+
+def make_book():
+    return p2p.SellerBook.from_ads([
+        ad(0, 101, rate=0.99, orders=500, user_type="merchant"),
+        ad(1, 99, rate=0.80, orders=50),
+        ad(2, 100, rate=0.95, orders=5, user_type="merchant"),
+        ad(3, 98, rate=0.97, orders=300),
+        ad(4, 97, rate=0.99, orders=900, user_type="merchant")
+    ])
+
+def test_select_applies_each_filter_within_the_limit():
+    book = make_book()
+    assert book.select({}, None) == [0, 1, 2, 3, 4]
+    assert book.select({"min_completion_rate": 95}, None) == [0, 2, 3, 4]
+    assert book.select({"min_orders": 100}, None) == [0, 3, 4]
+    assert book.select({"online_only": True}, None) == [0, 2, 4]
+    assert book.select({"min_completion_rate": 95, "min_orders": 100, "online_only": True}, None) == [0, 4]
+    assert book.select({"online_only": True}, None, limit=3) == [0, 2]
+
+def test_select_sorts_by_column_and_direction():
+    book = make_book()
+    assert book.select({}, "price") == [4, 3, 1, 2, 0]
+    assert book.select({}, "monthly_orders", reverse=True) == [4, 0, 3, 1, 2]
+    assert book.select({"min_orders": 100}, "price", reverse=True, limit=4) == [0, 3]
+    assert [row["id"] for row in book.rows(book.select({}, "price", limit=2))] == ["1", "0"]
+
+def test_request_variants_share_one_canonical_book(monkeypatch):
+    pages = []
+    async def fake_page(session, asset, fiat, trade_type, pay_method, page, rows=p2p.ROWS_PER_PAGE):
+        pages.append((asset, fiat, trade_type, pay_method, page))
+        return [ad(i, 100 + i, rate=0.9 + i / 1000, orders=i) for i in range(10)] if page == 1 else []
+    monkeypatch.setattr(p2p, "fetch_page_async", fake_page)
+    monkeypatch.setattr(p2p, "get_session", lambda name: None)
+    monkeypatch.setattr(p2p, "ORDER_BOOKS", p2p.OrderBookRefresher(interval=0))
+    base = dict(pay_type="BDT", pay_method="ALL", trade_type="SELL", min_completion_rate=None, min_orders=None, online_only=False)
+    async def main():
+        return await asyncio.gather(
+            p2p.get_p2p_data(asset="usdt", limit=20, sort_by="price", order="asc", **base),
+            p2p.get_p2p_data(asset=" USDT ", limit=20, sort_by="price", order="desc", **dict(base, trade_type=" sell")),
+            p2p.get_p2p_data(asset="USDT", limit=20, sort_by="completion_rate", order="asc", **dict(base, min_orders=5))
+        )
+    ascending, descending, filtered = [json.loads(response.body) for response in asyncio.run(main())]
+    assert pages == [("USDT", "BDT", "SELL", "ALL", 1)]
+    assert [row["price"] for row in ascending["data"]] == [100 + i for i in range(10)]
+    assert [row["price"] for row in descending["data"]] == [109 - i for i in range(10)]
+    assert [row["monthly_orders"] for row in filtered["data"]] == [5, 6, 7, 8, 9]
+
+def test_stats_percentiles_and_vwap():
+    book = p2p.SellerBook.from_ads([ad(i, price, amount) for i, (price, amount) in enumerate([(104, 1), (100, 3), (102, 2), (101, 4), (103, 10)])])
+    stats = book.stats(book.select({}, None))
+    assert stats["min_price"] == 100 and stats["max_price"] == 104
+    assert stats["avg_price"] == 102
+    assert stats["median_price"] == 102
+    assert stats["p10_price"] == 100.4
+    assert stats["p25_price"] == 101
+    assert stats["p75_price"] == 103
+    assert stats["p90_price"] == 103.6
+    assert stats["total_available"] == 20
+    assert stats["vwap"] == round((104 * 1 + 100 * 3 + 102 * 2 + 101 * 4 + 103 * 10) / 20, 4)
+    assert stats["spread"] == 4
+    subset = book.stats([1, 3])
+    assert (subset["min_price"], subset["max_price"], subset["vwap"]) == (100, 101, round((300 + 404) / 7, 4))
+    assert book.stats([]) == {"avg_price": 0, "min_price": 0, "max_price": 0, "total_available": 0}
+
+def test_rows_round_trip_columnar_values():
+    book = p2p.SellerBook.from_ads([ad(7, "12.5", 3.25, rate=0.987, orders=42, user_type="merchant"), {"adv": {}}])
+    assert len(book) == 1
+    assert book.rows([0]) == [{
+        "id": "7",
+        "seller_name": "seller7",
+        "price": 12.5,
+        "fiat_unit": "",
+        "available_amount": 3.25,
+        "min_order_amount": 0.0,
+        "max_order_amount": 0.0,
+        "completion_rate": 98.7,
+        "monthly_orders": 42,
+        "payment_methods": ["Bank"],
+        "user_type": "merchant",
+        "online_status": "online"
+    }]
+
+class FakeBooks:
+    def __init__(self, books):
+        self.books = books
+        self.requests = []
+
+    async def get(self, asset, fiat, trade_type, pay_method, limit):
+        self.requests.append((asset, fiat, trade_type, limit))
+        book = self.books[(asset, fiat, trade_type)]
+        if isinstance(book, Exception):
+            raise book
+        return book, 0.5
+
+def test_spread_reports_best_prices_and_depth_per_market(monkeypatch):
+    asks = p2p.SellerBook.from_ads([ad(0, 110, 5), ad(1, 111, 7), ad(2, 120, 100)])
+    bids = p2p.SellerBook.from_ads([ad(3, 108, 2), ad(4, 107.5, 3), ad(5, 90, 50)])
+    books = FakeBooks({
+        ("USDT", "BDT", "BUY"): asks,
+        ("USDT", "BDT", "SELL"): bids,
+        ("USDT", "INR", "BUY"): RuntimeError("upstream down"),
+        ("USDT", "INR", "SELL"): bids
+    })
+    monkeypatch.setattr(p2p, "ORDER_BOOKS", books)
+    response = asyncio.run(p2p.get_p2p_spread(assets="usdt", fiats="bdt, inr", pay_method="ALL", limit=50, band_pct=1.0))
+    body = json.loads(response.body)
+    assert body["success"] is True
+    bdt, inr = body["data"]
+    assert (bdt["best_ask"], bdt["best_bid"], bdt["spread"], bdt["mid_price"]) == (110, 108, 2, 109)
+    assert bdt["spread_pct"] == round(2 / 109 * 100, 4)
+    assert bdt["ask_depth"] == {"best_price": 110, "sellers": 3, "total_available": 112, "depth_in_band": 12, "sellers_in_band": 2}
+    assert bdt["bid_depth"]["depth_in_band"] == 5 and bdt["bid_depth"]["sellers_in_band"] == 2
+    assert inr == {"asset": "USDT", "fiat": "INR", "error": "Failed to fetch order books"}
+    assert sorted(books.requests) == sorted([("USDT", fiat, side, 50) for fiat in ("BDT", "INR") for side in ("BUY", "SELL")])
+
+def test_spread_rejects_unknown_markets():
+    response = asyncio.run(p2p.get_p2p_spread(assets="USDT", fiats="XXX", pay_method="ALL", limit=50, band_pct=1.0))
+    assert response.status_code == 400
@@ -0,0 +1,46 @@
+import gzip
+import os
+from starlette.requests import Request
+from utils.pages import StaticPage
+
+def make_request(headers):
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+def test_etag_revalidation_returns_304(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_text("<html>" + "hello " * 200 + "</html>")
+    page = StaticPage(str(path), "fallback")
+    first = page.response(make_request({}))
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = page.response(make_request({"If-None-Match": etag}))
+    assert again.status_code == 304
+    assert again.body == b""
+    assert page.response(make_request({"If-None-Match": '"other"'})).status_code == 200
+
+def test_negotiates_precompressed_variant(tmp_path):
+    path = tmp_path / "index.html"
+    body = "<html>" + "hello " * 200 + "</html>"
+    path.write_text(body)
+    page = StaticPage(str(path), "fallback")
+    response = page.response(make_request({"Accept-Encoding": "gzip"}))
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body).decode() == body
+    assert "content-encoding" not in page.response(make_request({"Accept-Encoding": "identity"})).headers
+
+def test_file_change_produces_new_etag(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_text("one")
+    stamp = os.stat(path).st_mtime
+    page = StaticPage(str(path), "fallback")
+    old = page.response(make_request({})).headers["etag"]
+    path.write_text("two")
+    os.utime(path, (stamp, stamp + 5))
+    page.refresh()
+    assert page.reloads == 2
+    assert page.variants["identity"] == b"two"
+    assert page.etag != old
+    new = page.response(make_request({"If-None-Match": old}))
+    assert new.status_code == 200
+    assert new.body == b"two"
+    assert new.headers["etag"] == page.etag
@@ -0,0 +1,31 @@
+import asyncio
+import time
+from utils.prober import UpstreamProber
+
+def test_hanging_custom_check_is_bounded_by_probe_timeout():
+    async def hang():
+        await asyncio.sleep(30)
+
+    async def ok():
+        return None
+
+    prober = UpstreamProber(upstreams={"slow": {"check": hang, "critical": True}, "fast": {"check": ok}}, timeout=0.05)
+    started = time.perf_counter()
+    asyncio.run(prober.run_round())
+    assert time.perf_counter() - started < 1
+    assert prober.rounds == 1
+    assert prober.results["slow"]["state"] == "down"
+    assert "TimeoutError" in prober.results["slow"]["error"]
+    assert prober.results["fast"]["state"] == "up"
+    assert prober.overall() == "Degraded"
+
+def test_mongodb_probe_is_declared_without_importing_the_plugin():
+    from utils.prober import UPSTREAMS, HAS_MOTOR
+    assert not HAS_MOTOR or UPSTREAMS["mongodb"]["plugins"] == ["shortner"]
+
+def test_importing_utils_does_not_load_motor():
+    import subprocess
+    import sys
+    code = "import sys, utils; print('motor' in sys.modules or 'pymongo' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
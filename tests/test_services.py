@@ -0,0 +1,35 @@
+import asyncio
+from utils.services import BackgroundServices
+
+class FakeService:
+    def __init__(self, fail_start=False, fail_stop=False):
+        self.fail_start = fail_start
+        self.fail_stop = fail_stop
+        self.events = []
+
+    def start(self):
+        self.events.append("start")
+        if self.fail_start:
+            raise RuntimeError("start failed")
+
+    async def stop(self):
+        self.events.append("stop")
+        if self.fail_stop:
+            raise RuntimeError("stop failed")
+
+def test_services_run_only_between_start_and_stop():
+    services = BackgroundServices()
+    early = FakeService()
+    broken = FakeService(fail_start=True, fail_stop=True)
+    services.register("early", early)
+    services.register("broken", broken)
+    assert early.events == []
+    services.start()
+    late = FakeService()
+    services.register("late", late)
+    assert early.events == ["start"] and late.events == ["start"]
+    asyncio.run(services.stop())
+    assert early.events == ["start", "stop"]
+    assert broken.events == ["start", "stop"]
+    assert late.events == ["start", "stop"]
+    assert services.snapshot() == {"running": False, "services": ["broken", "early", "late"]}
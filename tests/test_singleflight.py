@@ -0,0 +1,37 @@
+import asyncio
+from utils.singleflight import SingleFlight, request_key
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(shared for shared, _ in results) == [False, True, True, True, True]
+    assert all(value == "value" for _, value in results)
+    assert flight.stats()["inflight"] == 0
+
+def test_errors_propagate_to_every_waiter_and_key_is_released():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await flight.do("key", lambda: asyncio.sleep(0, result="ok")) == (False, "ok")
+
+    asyncio.run(scenario())
+
+def test_request_key_ignores_argument_order_and_whitespace():
+    assert request_key("p", {"b": " x ", "a": 1}) == request_key("p", {"a": 1, "b": "x"})
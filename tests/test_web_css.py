@@ -0,0 +1,38 @@
+import asyncio
+import zipfile
+import plugins.web as web
+
+class FakeAssets:
+    def __init__(self, files):
+        self.files = files
+
+    async def fetch(self, url, headers, size_limit):
+        return self.files.get(url)
+
+def test_css_points_at_assigned_paths_and_keeps_failed_references_absolute(tmp_path, monkeypatch):
+    monkeypatch.setattr(web, "ASSET_CACHE", FakeAssets({
+        "https://a.example/logo.png": b"a-logo",
+        "https://b.example/logo.png": b"b-logo",
+        "https://a.example/css/site.css": b'.x{background:url("https://b.example/logo.png")} .y{background:url(../missing.png)} .z{background:url(data:image/png;base64,AA==)}',
+    }))
+    archive = web.ArchiveWriter(directory=str(tmp_path))
+    downloader = web.UrlDownloader()
+    downloader.archive = archive
+    async def main():
+        await downloader._download_all_resources(["https://a.example/logo.png", "https://a.example/css/site.css"])
+        return await archive.close()
+    with zipfile.ZipFile(asyncio.run(main())) as archive_file:
+        names = sorted(archive_file.namelist())
+        css = archive_file.read("css/css/site.css").decode()
+    assert names == ["css/css/site.css", "images/logo.png", "images/logo_1.png"]
+    assert 'url("../../images/logo_1.png")' in css
+    assert 'url("https://a.example/missing.png")' in css
+    assert "url(data:image/png;base64,AA==)" in css
+    assert downloader.failed_urls == {"https://a.example/missing.png"}
+
+def test_rewrite_css_only_localizes_known_paths():
+    content = b'@import "theme.css"; .a{background:url(img/a.png)}'
+    rewritten = web.rewrite_css(content, "https://site.example/static/main.css", "css/static/main.css", {
+        "https://site.example/static/theme.css": "css/static/theme_1.css"
+    })
+    assert rewritten == b'@import "theme_1.css"; .a{background:url("https://site.example/static/img/a.png")}'
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import zipfile
+import plugins.web as web
+
+def test_archive_stores_compressed_types_and_enforces_the_size_cap(tmp_path):
+    archive = web.ArchiveWriter(directory=str(tmp_path), size_limit=5000)
+    css = b"body{color:red}" * 100
+    async def main():
+        assert await archive.add(archive.reserve("images/logo.png"), b"\x89PNG" + b"\x00" * 1000)
+        assert await archive.add(archive.reserve("css/site.css"), css)
+        assert archive.reserve("images/logo.png") == "images/logo_1.png"
+        assert not await archive.add("media/big.mp4", b"x" * 4000)
+        return await archive.close()
+    path = asyncio.run(main())
+    with zipfile.ZipFile(path) as archive_file:
+        infos = {info.filename: info for info in archive_file.infolist()}
+        assert archive_file.read("css/site.css") == css
+    assert sorted(infos) == ["css/site.css", "images/logo.png"]
+    assert infos["images/logo.png"].compress_type == zipfile.ZIP_STORED
+    assert infos["css/site.css"].compress_type == zipfile.ZIP_DEFLATED
+    assert (archive.file_count, archive.stored, archive.total_size) == (2, 1, 1004 + len(css))
+
+def test_empty_archive_is_discarded(tmp_path):
+    archive = web.ArchiveWriter(directory=str(tmp_path))
+    assert asyncio.run(archive.close()) is None
+    assert not os.path.exists(archive.path)
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="/css/site.css"><link rel="icon" href="favicon.ico"><link rel="preload" href="/fonts/a.woff2">
+<link rel="author" href="/humans.txt"><link type="text/css" href="legacy.css">
+<meta property="og:image" content="https://cdn.example/og.png"><meta name="x" content="/assets/manifest.json"><meta name="y" content="plain text.">
+<style>body{background:url('img/bg.png')} @import "print.css";</style>
+<script src="js/app.js"></script><script>load("chunks/a.js"); icon = 'img/icon.svg';</script>
+</head><body>
+<img src="img/a.png" data-src="img/lazy.png" srcset="img/a-1x.png 1x, img/a-2x.png 2x"><img src="data:image/png;base64,AA==">
+<picture><source srcset="img/b.webp 1x"><source src="img/c.avif"></picture>
+<video src="media/v.mp4"></video><object data="docs/d.pdf"></object><embed src="media/e.swf">
+<div style="background:url(/img/attr.png)">x</div><a href="mailto:x@example.com">m</a>
+</body></html>"""
+
+def legacy_resources(html, base_url, imgFlg=True, linkFlg=True, scriptFlg=True):
+    import re
+    from urllib.parse import urljoin
+    soup = web.parse_html(html)
+    downloader = web.UrlDownloader()
+    urls = set()
+    def css_urls(text):
+        found = {urljoin(base_url, u.strip()) for u in re.findall(r'url\s*\(\s*["\']?([^"\'()]+)["\']?\s*\)', text, re.I) if not u.startswith(('data:', 'blob:', 'javascript:'))}
+        return found | {urljoin(base_url, u.strip()) for u in re.findall(r'@import\s+["\']([^"\']+)["\']', text, re.I)}
+    for link in soup.find_all('link', href=True):
+        rel = link.get('rel', [])
+        rel = [rel] if isinstance(rel, str) else rel
+        if linkFlg and ('stylesheet' in rel or link.get('type') == 'text/css'):
+            urls.add(urljoin(base_url, link['href'].strip()))
+        if any(r in rel for r in ['icon', 'shortcut icon', 'apple-touch-icon', 'manifest', 'alternate', 'canonical', 'preload', 'prefetch']):
+            urls.add(urljoin(base_url, link['href'].strip()))
+    if scriptFlg:
+        urls.update(urljoin(base_url, s['src'].strip()) for s in soup.find_all('script', src=True))
+    if imgFlg:
+        for tag in soup.find_all(['img', 'source']):
+            for attribute in ('src', 'data-src') if tag.name == 'img' else ('src',):
+                if tag.get(attribute):
+                    urls.add(urljoin(base_url, tag[attribute].strip()))
+            if tag.get('srcset'):
+                urls.update(downloader._parse_srcset(tag['srcset'], base_url))
+    urls.update(urljoin(base_url, t['src'].strip()) for t in soup.find_all(['audio', 'video', 'embed'], src=True))
+    urls.update(urljoin(base_url, t['data'].strip()) for t in soup.find_all('object', data=True))
+    for meta in soup.find_all('meta'):
+        content = meta.get('content', '')
+        if content.startswith('/'):
+            urls.add(urljoin(base_url, content))
+        elif content.startswith(('http://', 'https://')):
+            urls.add(content)
+    text = str(soup)
+    for block in re.findall(r'<style[^>]*>(.*?)</style>', text, re.S | re.I):
+        urls.update(css_urls(block))
+    for block in re.findall(r'<script[^>]*>(.*?)</script>', text, re.S | re.I):
+        for match, _ in re.findall(r'["\']([^"\']*\.(js|css|png|jpg|jpeg|gif|svg|woff2?|ttf|eot|json|xml))["\']', block, re.I):
+            if not match.startswith(('data:', 'blob:', 'javascript:')):
+                urls.add(urljoin(base_url, match.strip()))
+    return {u for u in urls if downloader._is_valid_url(u)}
+
+def test_single_pass_extraction_matches_the_multi_pass_crawl():
+    base_url = "https://site.example/page/"
+    for flags in [(True, True, True), (False, True, True), (True, False, True), (True, True, False), (False, False, False)]:
+        urls, _ = web.render_page(PAGE.encode(), base_url, *flags)
+        expected = legacy_resources(PAGE, base_url, *flags) | {"https://site.example/img/attr.png"}
+        assert set(urls) == expected, flags
+
+def test_process_pool_rendering_matches_in_process_rendering():
+    from utils.executor import CPU_EXECUTOR, run_cpu
+    base_url = "https://site.example/page/"
+    css = b'@import "theme.css"; .a{background:url(img/a.png)} .b{background:url(img/gone.png)}'
+    local_paths = {"https://site.example/page/theme.css": "css/page/theme_1.css", "https://site.example/page/img/a.png": "images/page/img/a.png"}
+    async def main():
+        rendered = await run_cpu("web", web.render_page, PAGE.encode(), base_url, True, False, True)
+        rewritten = await run_cpu("web", web.rewrite_css, css, base_url + "site.css", "css/page/site.css", local_paths)
+        references = await run_cpu("web", web.css_references, css)
+        return rendered, rewritten, references
+    try:
+        (urls, html), rewritten, references = asyncio.run(main())
+    finally:
+        CPU_EXECUTOR.shutdown()
+    local_urls, local_html = web.render_page(PAGE.encode(), base_url, True, False, True)
+    assert sorted(urls) == sorted(local_urls)
+    assert html == local_html
+    assert b'src="js/page/js/app.js"' in html
+    assert rewritten == web.rewrite_css(css, base_url + "site.css", "css/page/site.css", local_paths)
+    assert references == web.css_references(css) == ["img/a.png", "img/gone.png", "theme.css"]
@@ -1,3 +1,12 @@
 #Copyright @ISmartCoder
 #Updates Channel @abirxdhackz 
 from .logger import LOGGER
+from .http import HTTP_CLIENTS, get_session
+from .executor import BLOCKING_EXECUTOR, CPU_EXECUTOR, run_blocking, run_cpu
+from .state import SHARED_STATE
+from .singleflight import SINGLE_FLIGHT, coalesce
+from .cache import RESPONSE_CACHE, cached
+from .metrics import METRICS
+from .watchdog import LOOP_WATCHDOG
+from .prober import UPSTREAM_PROBER
+from .services import BACKGROUND_SERVICES
@@ -0,0 +1,273 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import base64
+import json
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from starlette.responses import Response
+from .logger import LOGGER
+from .singleflight import SINGLE_FLIGHT, request_key
+from .state import SHARED_STATE, create_state
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 4096))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+
+class CachedResponse:
+    __slots__ = ("status_code", "body", "media_type", "headers")
+
+    def __init__(self, status_code, body, media_type, headers):
+        self.status_code = status_code
+        self.body = body
+        self.media_type = media_type
+        self.headers = headers
+
+    @classmethod
+    def from_response(cls, response):
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in ("content-length", "content-type")
+        }
+        return cls(response.status_code, bytes(response.body), response.media_type, headers)
+
+    def to_response(self, cache_status):
+        headers = dict(self.headers)
+        headers["X-Cache"] = cache_status
+        return Response(content=self.body, status_code=self.status_code, media_type=self.media_type, headers=headers)
+
+    def size(self):
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def dumps(self):
+        return json.dumps({
+            "status_code": self.status_code,
+            "body": base64.b64encode(self.body).decode("ascii"),
+            "media_type": self.media_type,
+            "headers": self.headers
+        })
+
+    @classmethod
+    def loads(cls, raw):
+        data = json.loads(raw)
+        return cls(data["status_code"], base64.b64decode(data["body"]), data["media_type"], data["headers"])
+
+def estimate_size(value):
+    if isinstance(value, CachedResponse):
+        return value.size()
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 1024
+
+class MemoryCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        expires_at, value, size = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key, value, ttl, size=None):
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return False
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (time.monotonic() + ttl, value, size)
+        self._bytes += size
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def delete(self, key):
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self, prefix=None):
+        for key in [k for k in self._data if prefix is None or k.startswith(prefix)]:
+            self._remove(key)
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+class SharedCache:
+    def __init__(self, state):
+        self.state = state
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key):
+        try:
+            data = await self.state.get("cache", key)
+        except Exception as e:
+            self.errors += 1
+            LOGGER.error(f"Shared cache get failed for {key}: {str(e)}")
+            return False, None, 0
+        if data is None:
+            self.misses += 1
+            return False, None, 0
+        self.hits += 1
+        remaining = max(data.get("expires_at", 0) - time.time(), 0)
+        if data["kind"] == "response":
+            return True, CachedResponse.loads(data["value"]), remaining
+        return True, data["value"], remaining
+
+    async def set(self, key, value, ttl):
+        if isinstance(value, CachedResponse):
+            payload = {"kind": "response", "value": value.dumps()}
+        else:
+            payload = {"kind": "value", "value": value}
+        payload["expires_at"] = time.time() + ttl
+        try:
+            await self.state.set("cache", key, payload, ttl)
+            return True
+        except (TypeError, ValueError):
+            return False
+        except Exception as e:
+            self.errors += 1
+            LOGGER.error(f"Shared cache set failed for {key}: {str(e)}")
+            return False
+
+    async def close(self):
+        await self.state.close()
+
+    def stats(self):
+        return dict(self.state.stats(), hits=self.hits, misses=self.misses, errors=self.errors)
+
+class ResponseCache:
+    def __init__(self, backend=CACHE_BACKEND):
+        self.memory = MemoryCache()
+        self.remote = None
+        if backend == "shared":
+            self.remote = SharedCache(SHARED_STATE)
+        elif backend != "memory":
+            self.remote = SharedCache(create_state(backend))
+        if self.remote is not None:
+            LOGGER.info(f"Response cache using {self.remote.state.name} backend behind the in-memory tier")
+
+    async def get(self, key):
+        hit, value = self.memory.get(key)
+        if hit or self.remote is None:
+            return hit, value
+        hit, value, remaining = await self.remote.get(key)
+        if hit and remaining > 0:
+            self.memory.set(key, value, remaining)
+        return hit, value
+
+    async def set(self, key, value, ttl):
+        self.memory.set(key, value, ttl)
+        if self.remote is not None:
+            await self.remote.set(key, value, ttl)
+
+    async def get_or_load(self, key, ttl, loader, cacheable=None):
+        hit, value = await self.get(key)
+        if hit:
+            return "HIT", value
+        shared, value = await SINGLE_FLIGHT.do(key, lambda: self._load(key, ttl, loader, cacheable))
+        return ("COALESCED" if shared else "MISS"), value
+
+    async def _load(self, key, ttl, loader, cacheable):
+        value = await loader()
+        if cacheable is None or cacheable(value):
+            await self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, prefix=None):
+        self.memory.clear(prefix)
+
+    async def close(self):
+        if self.remote is not None:
+            await self.remote.close()
+
+    def stats(self):
+        return {
+            "memory": self.memory.stats(),
+            "remote": self.remote.stats() if self.remote is not None else None,
+            "singleflight": SINGLE_FLIGHT.stats()
+        }
+
+RESPONSE_CACHE = ResponseCache()
+
+def cached(ttl, namespace=None, key_func=None, ignore_case=()):
+    def decorator(func):
+        prefix = namespace or f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = request_key(prefix, kwargs, key_func, ignore_case)
+
+            async def loader():
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    if not hasattr(result, "body") or not 200 <= result.status_code < 300:
+                        return _Passthrough(result)
+                    return CachedResponse.from_response(result)
+                return result
+
+            status, value = await RESPONSE_CACHE.get_or_load(key, ttl, loader, _is_cacheable)
+            if isinstance(value, _Passthrough):
+                response = value.take()
+                if response is None:
+                    return await func(*args, **kwargs)
+                return response
+            if isinstance(value, CachedResponse):
+                return value.to_response(status)
+            return value
+        return wrapper
+    return decorator
+
+class _Passthrough:
+    __slots__ = ("response", "copy")
+
+    def __init__(self, response):
+        self.response = response
+        self.copy = CachedResponse.from_response(response) if hasattr(response, "body") else None
+
+    def take(self):
+        response, self.response = self.response, None
+        if response is None and self.copy is not None:
+            return self.copy.to_response("BYPASS")
+        return response
+
+def _is_cacheable(value):
+    return not isinstance(value, _Passthrough)
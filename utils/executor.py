@@ -0,0 +1,138 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from .logger import LOGGER
+
+MAX_WORKERS = int(os.getenv("BLOCKING_WORKERS", 32))
+DEFAULT_PLUGIN_LIMIT = int(os.getenv("BLOCKING_PLUGIN_LIMIT", 8))
+PLUGIN_LIMITS = {
+    "ai": 4,
+    "thrd": 4,
+    "pfp": 4,
+    "fb": 4,
+    "yt": 6,
+    "sp": 6,
+    "pnt": 6,
+    "cpn": 6
+}
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.cpu_count() or 1))
+CPU_PLUGIN_LIMIT = int(os.getenv("CPU_PLUGIN_LIMIT", CPU_WORKERS * 2))
+CPU_START_METHOD = os.getenv("CPU_START_METHOD", "forkserver")
+
+class BlockingExecutor:
+    def __init__(self, max_workers=MAX_WORKERS, limits=None, default_limit=DEFAULT_PLUGIN_LIMIT):
+        self.max_workers = max_workers
+        self.limits = dict(PLUGIN_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self._pool = None
+        self._semaphores = {}
+        self._stats = {}
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="a360-blocking")
+        return self._pool
+
+    def _plugin_state(self, plugin):
+        semaphore = self._semaphores.get(plugin)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limits.get(plugin, self.default_limit))
+            self._semaphores[plugin] = semaphore
+            self._stats[plugin] = {
+                "queued": 0,
+                "running": 0,
+                "peak_queued": 0,
+                "completed": 0,
+                "failed": 0,
+                "wait_seconds": 0.0,
+                "run_seconds": 0.0
+            }
+        return semaphore, self._stats[plugin]
+
+    async def run(self, plugin, func, *args, **kwargs):
+        semaphore, stats = self._plugin_state(plugin)
+        queued_at = time.perf_counter()
+        stats["queued"] += 1
+        stats["peak_queued"] = max(stats["peak_queued"], stats["queued"])
+        waiting = True
+        try:
+            async with semaphore:
+                waiting = False
+                stats["queued"] -= 1
+                started_at = time.perf_counter()
+                stats["wait_seconds"] += started_at - queued_at
+                stats["running"] += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self._ensure_pool(), partial(func, *args, **kwargs))
+                except Exception:
+                    stats["failed"] += 1
+                    raise
+                finally:
+                    stats["running"] -= 1
+                    stats["run_seconds"] += time.perf_counter() - started_at
+                stats["completed"] += 1
+                return result
+        finally:
+            if waiting:
+                stats["queued"] -= 1
+
+    def snapshot(self):
+        plugins = {}
+        for plugin, stats in self._stats.items():
+            completed = stats["completed"]
+            finished = completed + stats["failed"]
+            plugins[plugin] = {
+                "limit": self.limits.get(plugin, self.default_limit),
+                "queued": stats["queued"],
+                "running": stats["running"],
+                "peak_queued": stats["peak_queued"],
+                "completed": completed,
+                "failed": stats["failed"],
+                "avg_wait_ms": round(stats["wait_seconds"] / finished * 1000, 2) if finished else 0,
+                "avg_run_ms": round(stats["run_seconds"] / finished * 1000, 2) if finished else 0
+            }
+        return {
+            "max_workers": self.max_workers,
+            "queued": sum(s["queued"] for s in self._stats.values()),
+            "running": sum(s["running"] for s in self._stats.values()),
+            "plugins": plugins
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            LOGGER.info("Blocking executor shut down")
+
+class ProcessExecutor(BlockingExecutor):
+    def __init__(self, max_workers=CPU_WORKERS, default_limit=CPU_PLUGIN_LIMIT, start_method=CPU_START_METHOD):
+        super().__init__(max_workers=max_workers, limits={}, default_limit=default_limit)
+        self.start_method = start_method
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            LOGGER.info(f"CPU process pool started with {self.max_workers} {self.start_method} workers")
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            LOGGER.info("CPU process pool shut down")
+
+BLOCKING_EXECUTOR = BlockingExecutor()
+CPU_EXECUTOR = ProcessExecutor()
+
+async def run_blocking(plugin, func, *args, **kwargs):
+    return await BLOCKING_EXECUTOR.run(plugin, func, *args, **kwargs)
+
+async def run_cpu(plugin, func, *args, **kwargs):
+    return await CPU_EXECUTOR.run(plugin, func, *args, **kwargs)
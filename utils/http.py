@@ -0,0 +1,83 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+import aiohttp
+from .logger import LOGGER
+
+TIMEOUT_PROFILES = {
+    "default": aiohttp.ClientTimeout(total=30, connect=10),
+    "binance": aiohttp.ClientTimeout(total=10, connect=5),
+    "p2p": aiohttp.ClientTimeout(total=45, connect=10, sock_read=15),
+    "net": aiohttp.ClientTimeout(total=10, connect=5),
+    "tmail": aiohttp.ClientTimeout(total=10, connect=5),
+    "weather": aiohttp.ClientTimeout(total=15, connect=5),
+    "media": aiohttp.ClientTimeout(total=30, connect=10),
+    "imgai": aiohttp.ClientTimeout(total=60, connect=10),
+    "probe": aiohttp.ClientTimeout(total=5, connect=3),
+    "web": aiohttp.ClientTimeout(total=60, connect=20, sock_read=15)
+}
+CONNECTOR_LIMIT = 200
+CONNECTOR_LIMIT_PER_HOST = 30
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+
+class HttpClientRegistry:
+    def __init__(self, profiles=None):
+        self.profiles = dict(profiles or TIMEOUT_PROFILES)
+        self._connector = None
+        self._sessions = {}
+        self._trace_configs = []
+        self._lock = asyncio.Lock()
+
+    def add_trace_config(self, trace_config):
+        self._trace_configs.append(trace_config)
+
+    def _ensure_connector(self):
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                use_dns_cache=True,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True
+            )
+        return self._connector
+
+    async def start(self):
+        async with self._lock:
+            self._ensure_connector()
+            LOGGER.info(f"Shared HTTP client pool started with profiles: {', '.join(self.profiles)}")
+
+    def get(self, profile="default"):
+        session = self._sessions.get(profile)
+        if session is not None and not session.closed:
+            return session
+        if profile not in self.profiles:
+            LOGGER.warning(f"Unknown HTTP timeout profile {profile}, falling back to default")
+        session = aiohttp.ClientSession(
+            connector=self._ensure_connector(),
+            connector_owner=False,
+            timeout=self.profiles.get(profile, self.profiles["default"]),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=self._trace_configs or None
+        )
+        self._sessions[profile] = session
+        return session
+
+    async def close(self):
+        async with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            for session in sessions:
+                if not session.closed:
+                    await session.close()
+            if self._connector is not None and not self._connector.closed:
+                await self._connector.close()
+            self._connector = None
+            LOGGER.info("Shared HTTP client pool closed")
+
+HTTP_CLIENTS = HttpClientRegistry()
+
+def get_session(profile="default"):
+    return HTTP_CLIENTS.get(profile)
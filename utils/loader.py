@@ -0,0 +1,168 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import importlib
+import os
+import re
+import sys
+import time
+from .logger import LOGGER
+
+PLUGINS_DIR = "plugins"
+ROUTER_PATTERN = re.compile(r'^router\s*=\s*APIRouter\(\s*prefix\s*=\s*["\']([^"\']*)["\']', re.MULTILINE)
+ROUTE_PATTERN = re.compile(r'^@router\.(get|post|put|delete|patch|head|options)\(\s*["\']([^"\']*)["\']', re.MULTILINE)
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            return 0
+
+def top_packages(modules, limit=5):
+    counts = {}
+    for module in modules:
+        root = module.split(".", 1)[0]
+        counts[root] = counts.get(root, 0) + 1
+    return [name for name, _ in sorted(counts.items(), key=lambda item: -item[1])[:limit]]
+
+def scan_plugin(path):
+    with open(path, "r", encoding="utf-8") as file:
+        source = file.read()
+    match = ROUTER_PATTERN.search(source)
+    prefix = match.group(1) if match else ""
+    return {
+        "prefix": prefix,
+        "routes": [
+            {"method": method.upper(), "path": prefix + route}
+            for method, route in ROUTE_PATTERN.findall(source)
+        ]
+    }
+
+def build_manifest(plugins_dir=PLUGINS_DIR):
+    manifest = {}
+    for filename in os.listdir(plugins_dir):
+        if filename.endswith(".py") and filename != "__init__.py":
+            name = filename[:-3]
+            try:
+                manifest[name] = scan_plugin(os.path.join(plugins_dir, filename))
+            except OSError as e:
+                LOGGER.error(f"Failed to scan plugin {name}: {str(e)}")
+    return manifest
+
+class PluginLoader:
+    def __init__(self, app, plugins_dir=PLUGINS_DIR):
+        self.app = app
+        self.plugins_dir = plugins_dir
+        self.manifest = {}
+        self.loaded = {}
+        self.failed = {}
+        self.lazy = False
+        self.baseline_rss_kb = current_rss_kb()
+        self.baseline_modules = len(sys.modules)
+        self.scan_ms = 0
+
+    def discover(self):
+        started = time.perf_counter()
+        self.manifest = build_manifest(self.plugins_dir)
+        self.scan_ms = round((time.perf_counter() - started) * 1000, 2)
+        LOGGER.info(f"Scanned {len(self.manifest)} plugin manifests in {self.scan_ms} ms")
+        return self.manifest
+
+    def load(self, name):
+        if name in self.loaded or name in self.failed:
+            return name in self.loaded
+        modules_before = set(sys.modules)
+        rss_before = current_rss_kb()
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(f"{self.plugins_dir}.{name}")
+        except Exception as e:
+            self.failed[name] = str(e)
+            LOGGER.error(f"Failed to load plugin {name}: {str(e)}")
+            return False
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        if not hasattr(module, "router"):
+            self.failed[name] = "missing router"
+            LOGGER.warning(f"Plugin {name} does not have a router")
+            return False
+        self.app.include_router(module.router)
+        self.app.openapi_schema = None
+        new_modules = set(sys.modules) - modules_before
+        self.loaded[name] = {
+            "load_ms": elapsed_ms,
+            "rss_delta_kb": current_rss_kb() - rss_before,
+            "modules": len(new_modules),
+            "top_packages": top_packages(new_modules),
+            "lazy": self.lazy,
+            "loaded_at": round(time.time(), 3)
+        }
+        LOGGER.info(f"Successfully loaded plugin: {name} in {elapsed_ms} ms (+{self.loaded[name]['rss_delta_kb']} KB RSS, {len(new_modules)} modules)")
+        return True
+
+    def load_all(self):
+        if not self.manifest:
+            self.discover()
+        started = time.perf_counter()
+        for name in self.manifest:
+            self.load(name)
+        LOGGER.info(f"Loaded {len(self.loaded)}/{len(self.manifest)} plugins in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def enable_lazy(self):
+        if not self.manifest:
+            self.discover()
+        self.lazy = True
+        self.app.add_middleware(LazyPluginMiddleware, loader=self)
+        LOGGER.info(f"Lazy plugin loading enabled for {len(self.manifest)} plugins")
+
+    def plugin_for_path(self, path):
+        best = None
+        for name, entry in self.manifest.items():
+            prefix = entry["prefix"]
+            if prefix and (path == prefix or path.startswith(prefix + "/")):
+                if best is None or len(prefix) > len(self.manifest[best]["prefix"]):
+                    best = name
+        return best
+
+    def report(self):
+        plugins = sorted(self.loaded.items(), key=lambda item: -item[1]["load_ms"])
+        return {
+            "lazy": self.lazy,
+            "scan_ms": self.scan_ms,
+            "total": len(self.manifest),
+            "loaded": len(self.loaded),
+            "failed": self.failed,
+            "pending": [name for name in self.manifest if name not in self.loaded and name not in self.failed],
+            "total_load_ms": round(sum(entry["load_ms"] for entry in self.loaded.values()), 2),
+            "total_rss_delta_kb": sum(entry["rss_delta_kb"] for entry in self.loaded.values()),
+            "baseline_rss_kb": self.baseline_rss_kb,
+            "current_rss_kb": current_rss_kb(),
+            "baseline_modules": self.baseline_modules,
+            "current_modules": len(sys.modules),
+            "plugins": [dict(entry, name=name) for name, entry in plugins]
+        }
+
+    def pending_route_count(self):
+        return sum(
+            len(entry["routes"]) for name, entry in self.manifest.items()
+            if name not in self.loaded and name not in self.failed
+        )
+
+class LazyPluginMiddleware:
+    def __init__(self, app, loader):
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path in (self.loader.app.openapi_url, self.loader.app.docs_url, self.loader.app.redoc_url):
+                self.loader.load_all()
+            else:
+                name = self.loader.plugin_for_path(path)
+                if name is not None:
+                    self.loader.load(name)
+        await self.app(scope, receive, send)
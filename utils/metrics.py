@@ -0,0 +1,207 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+import os
+import time
+import aiohttp
+from .logger import LOGGER
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", 0.5))
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+class Gauge:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def set(self, value, *labels):
+        self.values[labels] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, value, *labels):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, ('le', bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.requests = Counter("a360_http_requests_total", "HTTP requests handled by route and status code", ("method", "route", "status"))
+        self.latency = Histogram("a360_http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+        self.in_progress = Gauge("a360_http_requests_in_progress", "HTTP requests currently being handled")
+        self.upstream_requests = Counter("a360_upstream_requests_total", "Outgoing requests by upstream host and status code", ("host", "status"))
+        self.upstream_latency = Histogram("a360_upstream_request_duration_seconds", "Outgoing request latency by upstream host", ("host",))
+        self.upstream_errors = Counter("a360_upstream_errors_total", "Outgoing requests that failed before a response by host and error type", ("host", "error"))
+        self.loop_lag = Histogram("a360_event_loop_lag_seconds", "Event loop scheduling delay", buckets=LOOP_LAG_BUCKETS)
+        self.loop_lag_current = Gauge("a360_event_loop_lag_current_seconds", "Most recent event loop scheduling delay")
+        self.collectors = []
+        self._active = 0
+        self._lag_task = None
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def track_request(self, method, route, status, elapsed):
+        self.requests.inc(method, route, str(status))
+        self.latency.observe(elapsed, method, route)
+
+    def request_started(self):
+        self._active += 1
+        self.in_progress.set(self._active)
+
+    def request_finished(self):
+        self._active -= 1
+        self.in_progress.set(self._active)
+
+    def trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            host = params.url.host or "unknown"
+            self.upstream_requests.inc(host, str(params.response.status))
+            self.upstream_latency.observe(time.perf_counter() - ctx.started, host)
+
+        async def on_request_exception(session, ctx, params):
+            host = params.url.host or "unknown"
+            self.upstream_errors.inc(host, type(params.exception).__name__)
+            self.upstream_latency.observe(time.perf_counter() - ctx.started, host)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    async def _monitor_loop_lag(self, interval):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(time.perf_counter() - started - interval, 0)
+            self.loop_lag.observe(lag)
+            self.loop_lag_current.set(round(lag, 6))
+
+    def start(self, interval=LOOP_LAG_INTERVAL):
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.ensure_future(self._monitor_loop_lag(interval))
+            LOGGER.info(f"Event loop lag monitor started with {interval}s interval")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+
+    def render(self):
+        lines = []
+        for metric in (self.requests, self.latency, self.in_progress, self.upstream_requests,
+                       self.upstream_latency, self.upstream_errors, self.loop_lag, self.loop_lag_current):
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                LOGGER.error(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {str(e)}")
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+
+class MetricsMiddleware:
+    def __init__(self, app, registry=METRICS, exclude=("/metrics",)):
+        self.app = app
+        self.registry = registry
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.request_finished()
+            route = scope.get("route")
+            self.registry.track_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+                time.perf_counter() - started
+            )
+
+def metric_lines(name, help_text, kind, samples):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {value}")
+    return lines
@@ -0,0 +1,130 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import gzip
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from starlette.responses import Response
+from .logger import LOGGER
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+PAGE_CACHE_CONTROL = os.getenv("PAGE_CACHE_CONTROL", "public, max-age=300")
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
+def compress_variants(content):
+    variants = {"identity": content}
+    if HAS_BROTLI:
+        variants["br"] = brotli.compress(content, quality=11)
+    if HAS_ZSTD:
+        variants["zstd"] = zstandard.ZstdCompressor(level=19).compress(content)
+    variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    return {k: v for k, v in variants.items() if k == "identity" or len(v) < len(content)}
+
+def accepted_encodings(header):
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    return accepted
+
+class StaticPage:
+    def __init__(self, path, fallback):
+        self.path = path
+        self.fallback = fallback
+        self.mtime = None
+        self.variants = {}
+        self.etag = None
+        self.last_modified = None
+        self.reloads = 0
+        self.not_modified = 0
+        self.served = {}
+
+    def _load(self, mtime):
+        try:
+            with open(self.path, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            LOGGER.error(f"{os.path.basename(self.path)} not found in templates directory")
+            content = self.fallback.encode("utf-8")
+        self.variants = compress_variants(content)
+        self.etag = '"' + hashlib.sha1(content).hexdigest()[:20] + '"'
+        self.last_modified = formatdate(mtime or 0, usegmt=True)
+        self.mtime = mtime
+        self.reloads += 1
+        sizes = ", ".join(f"{k} {len(v)}" for k, v in self.variants.items())
+        LOGGER.info(f"Loaded page {self.path} ({sizes} bytes)")
+
+    def refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = 0
+        if mtime != self.mtime:
+            self._load(mtime)
+
+    def _is_fresh(self, request):
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.mtime:
+            try:
+                return int(self.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _pick_encoding(self, request):
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request):
+        self.refresh()
+        headers = {
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Cache-Control": PAGE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding"
+        }
+        if self._is_fresh(request):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        encoding = self._pick_encoding(request)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self.served[encoding] = self.served.get(encoding, 0) + 1
+        return Response(content=self.variants[encoding], media_type="text/html", headers=headers)
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "sizes": {k: len(v) for k, v in self.variants.items()},
+            "reloads": self.reloads,
+            "not_modified": self.not_modified,
+            "served": self.served
+        }
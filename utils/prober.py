@@ -0,0 +1,139 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+import importlib.util
+import os
+import time
+from datetime import datetime
+from .logger import LOGGER
+from .http import TIMEOUT_PROFILES, get_session
+
+HAS_MOTOR = importlib.util.find_spec("motor") is not None
+
+PROBE_INTERVAL = float(os.getenv("PROBE_INTERVAL", 60))
+PROBE_SLOW_MS = float(os.getenv("PROBE_SLOW_MS", 2000))
+PROBE_TIMEOUT = TIMEOUT_PROFILES["probe"].total
+PROBE_CLIENTS = {}
+
+async def check_mongodb():
+    client = PROBE_CLIENTS.get("mongodb")
+    if client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from config import MONGO_URL
+        client = PROBE_CLIENTS["mongodb"] = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=int(PROBE_TIMEOUT * 1000))
+    await client.admin.command("ping")
+
+UPSTREAMS = {
+    "binance": {"url": "https://api.binance.com/api/v3/ping", "plugins": ["binance"], "critical": True},
+    "binance_p2p": {"url": "https://p2p.binance.com", "method": "HEAD", "plugins": ["p2p"], "critical": True},
+    "open_meteo": {"url": "https://api.open-meteo.com/v1/forecast?latitude=0&longitude=0&current=temperature_2m", "plugins": ["wth"]},
+    "mail_tm": {"url": "https://api.mail.tm/domains", "plugins": ["tmail"]},
+    "whois": {"url": "https://www.whois.com/", "method": "HEAD", "plugins": ["dmn"]},
+    "ipinfo": {"url": "https://ipinfo.io/", "method": "HEAD", "plugins": ["net"]},
+    "spotify": {"url": "https://accounts.spotify.com/", "method": "HEAD", "plugins": ["sp"]},
+    "github": {"url": "https://api.github.com/", "method": "HEAD", "plugins": ["git"]},
+    "pypi": {"url": "https://pypi.org/", "method": "HEAD", "plugins": ["pypi"]}
+}
+if HAS_MOTOR:
+    UPSTREAMS["mongodb"] = {"check": check_mongodb, "plugins": ["shortner"]}
+
+class UpstreamProber:
+    def __init__(self, upstreams=None, interval=PROBE_INTERVAL, slow_ms=PROBE_SLOW_MS, timeout=PROBE_TIMEOUT):
+        self.upstreams = dict(upstreams or UPSTREAMS)
+        self.interval = interval
+        self.slow_ms = slow_ms
+        self.timeout = timeout
+        self.results = {}
+        self.rounds = 0
+        self.last_round = None
+        self.listeners = []
+        self._task = None
+
+    def register(self, name, check, plugins=(), critical=False):
+        self.upstreams[name] = {"check": check, "plugins": list(plugins), "critical": critical}
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    async def _check_http(self, spec):
+        async with get_session("probe").request(spec.get("method", "GET"), spec["url"], allow_redirects=False) as response:
+            return response.status
+
+    async def probe(self, name, spec):
+        started = time.perf_counter()
+        result = {"plugins": spec.get("plugins", []), "critical": spec.get("critical", False)}
+        try:
+            if "check" in spec:
+                await asyncio.wait_for(spec["check"](), self.timeout)
+                status = None
+            else:
+                status = await self._check_http(spec)
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            if status is not None and status >= 500:
+                result.update(state="down", status=status, error=f"HTTP {status}")
+            else:
+                result.update(state="degraded" if latency_ms > self.slow_ms else "up", status=status)
+        except Exception as e:
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            message = str(e) or f"no answer within {self.timeout}s"
+            result.update(state="down", status=None, error=f"{type(e).__name__}: {message}"[:200])
+        result["latency_ms"] = latency_ms
+        result["checked_at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        previous = self.results.get(name)
+        if previous is not None and previous["state"] != result["state"]:
+            LOGGER.warning(f"Upstream {name} changed from {previous['state']} to {result['state']}")
+        self.results[name] = result
+        return result
+
+    async def run_round(self):
+        await asyncio.gather(*(self.probe(name, spec) for name, spec in self.upstreams.items()))
+        self.rounds += 1
+        self.last_round = time.time()
+        for listener in self.listeners:
+            try:
+                listener()
+            except Exception as e:
+                LOGGER.error(f"Health probe listener failed: {str(e)}")
+
+    async def _run(self):
+        while True:
+            await self.run_round()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.interval <= 0:
+            LOGGER.info("Upstream prober disabled with PROBE_INTERVAL=0")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+            LOGGER.info(f"Upstream prober started for {len(self.upstreams)} upstreams every {self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def overall(self):
+        if not self.results:
+            return "Operational"
+        states = [r["state"] for r in self.results.values()]
+        if any(r["state"] == "down" and r["critical"] for r in self.results.values()):
+            return "Degraded"
+        if "down" in states or "degraded" in states:
+            return "Partially Degraded"
+        return "Operational"
+
+    def snapshot(self):
+        return {
+            "status": self.overall(),
+            "rounds": self.rounds,
+            "interval_seconds": self.interval,
+            "last_round": datetime.utcfromtimestamp(self.last_round).strftime("%Y-%m-%d %H:%M:%S UTC") if self.last_round else None,
+            "upstreams": self.results
+        }
+
+UPSTREAM_PROBER = UpstreamProber()
@@ -0,0 +1,34 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+from .logger import LOGGER
+
+class BackgroundServices:
+    def __init__(self):
+        self.services = {}
+        self.running = False
+
+    def register(self, name, service):
+        self.services[name] = service
+        if self.running:
+            service.start()
+
+    def start(self):
+        self.running = True
+        for name, service in self.services.items():
+            try:
+                service.start()
+            except Exception as e:
+                LOGGER.error(f"Background service {name} failed to start: {str(e)}")
+
+    async def stop(self):
+        self.running = False
+        for name, service in self.services.items():
+            try:
+                await service.stop()
+            except Exception as e:
+                LOGGER.error(f"Background service {name} failed to stop: {str(e)}")
+
+    def snapshot(self):
+        return {"running": self.running, "services": sorted(self.services)}
+
+BACKGROUND_SERVICES = BackgroundServices()
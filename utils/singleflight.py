@@ -0,0 +1,77 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+from functools import wraps
+from .logger import LOGGER
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}
+        self.leaders = 0
+        self.joined = 0
+        self.max_waiters = 0
+
+    async def do(self, key, fn):
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            self.joined += 1
+            return True, await asyncio.shield(flight.task)
+        flight = _Flight(asyncio.ensure_future(fn()))
+        self._flights[key] = flight
+        self.leaders += 1
+        flight.task.add_done_callback(lambda done: self._finish(key, flight))
+        return False, await asyncio.shield(flight.task)
+
+    def _finish(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.waiters:
+            self.max_waiters = max(self.max_waiters, flight.waiters)
+            LOGGER.info(f"Single-flight {key} shared with {flight.waiters} waiters")
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def stats(self):
+        return {
+            "inflight": len(self._flights),
+            "waiting": sum(f.waiters for f in self._flights.values()),
+            "leaders": self.leaders,
+            "joined": self.joined,
+            "max_waiters": self.max_waiters,
+            "saved_ratio": round(self.joined / (self.leaders + self.joined), 4) if self.leaders else 0
+        }
+
+SINGLE_FLIGHT = SingleFlight()
+
+def request_key(prefix, kwargs, key_func=None, ignore_case=()):
+    if key_func:
+        return f"{prefix}:{key_func(**kwargs)}"
+    parts = []
+    for name in sorted(kwargs):
+        value = kwargs[name]
+        if isinstance(value, str):
+            value = value.strip()
+            if name in ignore_case:
+                value = value.lower()
+        parts.append(f"{name}={value}")
+    return f"{prefix}?{'&'.join(parts)}"
+
+def coalesce(namespace=None, key_func=None):
+    def decorator(func):
+        prefix = namespace or f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = request_key(prefix, kwargs, key_func)
+            _, value = await SINGLE_FLIGHT.do(key, lambda: func(*args, **kwargs))
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,215 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from .logger import LOGGER
+from .executor import run_blocking
+
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory").lower()
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(tempfile.gettempdir(), "a360_state"))
+STATE_SQLITE_PATH = os.getenv("STATE_SQLITE_PATH", os.path.join(STATE_DIR, "state.sqlite3"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+class MemoryState:
+    name = "memory"
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, namespace, key):
+        entry = self._data.get((namespace, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop((namespace, key), None)
+            return None
+        return value
+
+    async def set(self, namespace, key, value, ttl=None):
+        self._data[(namespace, key)] = (time.time() + ttl if ttl else None, value)
+
+    async def delete(self, namespace, key):
+        self._data.pop((namespace, key), None)
+
+    async def close(self):
+        pass
+
+    def stats(self):
+        return {"backend": self.name, "entries": len(self._data)}
+
+class FileState:
+    name = "file"
+
+    def __init__(self, directory=STATE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, namespace, key):
+        digest = hashlib.sha1(f"{namespace}:{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{namespace}_{digest}.json")
+
+    def _read(self, namespace, key):
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] is not None and entry["expires_at"] <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry["value"]
+
+    def _write(self, namespace, key, value, ttl):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"expires_at": time.time() + ttl if ttl else None, "value": value}, file)
+        os.replace(temp_path, self._path(namespace, key))
+
+    def _remove(self, namespace, key):
+        try:
+            os.remove(self._path(namespace, key))
+        except OSError:
+            pass
+
+    async def get(self, namespace, key):
+        return await run_blocking("state", self._read, namespace, key)
+
+    async def set(self, namespace, key, value, ttl=None):
+        await run_blocking("state", self._write, namespace, key, value, ttl)
+
+    async def delete(self, namespace, key):
+        await run_blocking("state", self._remove, namespace, key)
+
+    async def close(self):
+        pass
+
+    def stats(self):
+        return {"backend": self.name, "directory": self.directory}
+
+class SqliteState:
+    name = "sqlite"
+
+    def __init__(self, path=STATE_SQLITE_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS state (namespace TEXT, key TEXT, value TEXT, expires_at REAL, PRIMARY KEY (namespace, key))"
+            )
+        return self._conn
+
+    def _read(self, namespace, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+                return None
+        return json.loads(row[0])
+
+    def _write(self, namespace, key, value, ttl):
+        raw = json.dumps(value)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, raw, time.time() + ttl if ttl else None)
+            )
+            conn.execute("DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+
+    def _remove(self, namespace, key):
+        with self._lock:
+            self._connection().execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    async def get(self, namespace, key):
+        return await run_blocking("state", self._read, namespace, key)
+
+    async def set(self, namespace, key, value, ttl=None):
+        await run_blocking("state", self._write, namespace, key, value, ttl)
+
+    async def delete(self, namespace, key):
+        await run_blocking("state", self._remove, namespace, key)
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        return {"backend": self.name, "path": self.path}
+
+class RedisState:
+    name = "redis"
+
+    def __init__(self, url=REDIS_URL, prefix="a360:"):
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+
+    def _ensure_client(self):
+        if self._client is None:
+            self._client = aioredis.from_url(self.url)
+        return self._client
+
+    async def get(self, namespace, key):
+        raw = await self._ensure_client().get(f"{self.prefix}{namespace}:{key}")
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, namespace, key, value, ttl=None):
+        await self._ensure_client().set(
+            f"{self.prefix}{namespace}:{key}", json.dumps(value), px=max(int(ttl * 1000), 1) if ttl else None
+        )
+
+    async def delete(self, namespace, key):
+        await self._ensure_client().delete(f"{self.prefix}{namespace}:{key}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self):
+        return {"backend": self.name, "url": self.url.rsplit("@", 1)[-1]}
+
+def create_state(backend=STATE_BACKEND):
+    if backend == "redis":
+        if HAS_REDIS:
+            return RedisState()
+        LOGGER.warning("STATE_BACKEND=redis but the redis package is not installed, falling back to sqlite")
+        return SqliteState()
+    if backend == "sqlite":
+        return SqliteState()
+    if backend == "file":
+        return FileState()
+    if backend != "memory":
+        LOGGER.warning(f"Unknown state backend {backend}, using memory")
+    return MemoryState()
+
+SHARED_STATE = create_state()
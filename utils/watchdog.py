@@ -0,0 +1,128 @@
+#Copyright @ISmartCoder
+#Updates Channel @abirxdhackz
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from .logger import LOGGER
+
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", 0.25))
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", 0.05))
+LOOP_STALL_HISTORY = int(os.getenv("LOOP_STALL_HISTORY", 50))
+STACK_DEPTH = 20
+
+class LoopWatchdog:
+    def __init__(self, threshold=LOOP_STALL_THRESHOLD, interval=LOOP_WATCHDOG_INTERVAL, history=LOOP_STALL_HISTORY):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = deque(maxlen=history)
+        self.total_stalls = 0
+        self.enabled = False
+        self._requests = {}
+        self._loop = None
+        self._loop_thread = None
+        self._last_beat = time.monotonic()
+        self._current = None
+        self._heartbeat_task = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            lag = time.monotonic() - self._last_beat
+            if self._current is None and lag > self.threshold:
+                self._capture(lag)
+            elif self._current is not None and lag <= self.threshold:
+                self._finish()
+
+    def _current_route(self):
+        try:
+            task = asyncio.tasks._current_tasks.get(self._loop)
+        except AttributeError:
+            return "unknown"
+        scope = self._requests.get(task)
+        if scope is None:
+            return "background" if task is not None else "loop callback"
+        route = scope.get("route")
+        return f"{scope['method']} {route.path if route is not None else scope['path']}"
+
+    def _capture(self, lag):
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = traceback.format_stack(frame, limit=STACK_DEPTH) if frame is not None else []
+        self._current = {
+            "detected_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "route": self._current_route(),
+            "started": self._last_beat,
+            "duration_ms": round(lag * 1000, 2),
+            "stack": [line.rstrip() for line in stack]
+        }
+        self.total_stalls += 1
+        LOGGER.warning(f"Event loop blocked for {self._current['duration_ms']} ms in {self._current['route']}\n{''.join(stack)}")
+
+    def _finish(self):
+        stall = self._current
+        self._current = None
+        stall["duration_ms"] = round((self._last_beat - stall.pop("started")) * 1000, 2)
+        self.stalls.append(stall)
+        LOGGER.warning(f"Event loop stall in {stall['route']} lasted {stall['duration_ms']} ms")
+
+    def start(self):
+        if self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.ensure_future(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        self.enabled = True
+        LOGGER.info(f"Event loop watchdog started with {self.threshold * 1000:.0f} ms threshold")
+
+    async def stop(self):
+        if not self.enabled:
+            return
+        self._stopped.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._thread.join(timeout=1)
+        self.enabled = False
+
+    def snapshot(self):
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": round(self.threshold * 1000, 2),
+            "total_stalls": self.total_stalls,
+            "stalled_now": self._current is not None,
+            "stalls": list(reversed(self.stalls))
+        }
+
+LOOP_WATCHDOG = LoopWatchdog()
+
+class WatchdogMiddleware:
+    def __init__(self, app, watchdog=LOOP_WATCHDOG):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.watchdog._requests[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.watchdog._requests.pop(task, None)